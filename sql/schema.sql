@@ -35,12 +35,13 @@ CREATE TABLE FileRecord (
 -- DuplicateGroup table
 CREATE TABLE DuplicateGroup (
     id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
-    checksum VARCHAR(64) NOT NULL UNIQUE,
+    checksum VARCHAR(64) NOT NULL,
     hash_algorithm VARCHAR(10) NOT NULL,
     file_count INTEGER DEFAULT 0 CHECK (file_count >= 0),
     first_seen_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
     last_seen_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
-    total_size_saved BIGINT DEFAULT 0 CHECK (total_size_saved >= 0)
+    total_size_saved BIGINT DEFAULT 0 CHECK (total_size_saved >= 0),
+    UNIQUE (checksum, hash_algorithm)
 );
 
 -- ProcessingLog table
@@ -5,46 +5,69 @@ It supports processing tarballs and querying for duplicates.
 """
 
 import argparse
+import csv
+import functools
 import sys
-import json
 import os
 import logging
-from typing import List, Optional, Dict, Any
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import TYPE_CHECKING, Iterable, List, NamedTuple, Optional, Dict, Any
 from datetime import datetime, timezone
 
-from ..services.tarball_service import TarballService
-from ..services.duplicate_service import DuplicateService
-from ..services.database_service import DatabaseService
-from ..services.hash_service import HashService
+from ..utils.batching import chunked
+from ..utils.json_output import dumps as json_dumps
 
-# Global service instances - these persist across CLI calls in tests
-_tarball_service = None
-_duplicate_service = None  
-_database_service = None
-_hash_service = None
+if TYPE_CHECKING:
+    from ..services.tarball_service import TarballService
+    from ..services.duplicate_service import DuplicateService
+    from ..services.database_service import DatabaseService
+    from ..services.hash_service import HashService
 
-def get_services():
-    """Get or initialize service instances."""
-    global _tarball_service, _duplicate_service, _database_service, _hash_service
+# Number of file records saved and checked for duplicates at a time
+FILE_RECORD_BATCH_SIZE = 10000
+
+# Column order for --format json/csv output
+DUPLICATE_GROUP_FIELDS = ['checksum', 'file_count', 'total_size_saved', 'hash_algorithm']
+FILE_RECORD_FIELDS = ['filename', 'size', 'checksum', 'tarball_id']
+
+# Number of table rows joined into a single stdout write
+OUTPUT_LINE_BATCH_SIZE = 1000
+
+
+class Services(NamedTuple):
+    """Service instances shared by the CLI commands."""
+    tarball_service: 'TarballService'
+    duplicate_service: 'DuplicateService'
+    database_service: 'DatabaseService'
+    hash_service: 'HashService'
+
+
+@functools.cache
+def get_services() -> Services:
+    """Get the shared service instances, creating them on first use.
     
-    if _hash_service is None:
-        _hash_service = HashService()
-    if _tarball_service is None:
-        _tarball_service = TarballService(_hash_service)
-    if _duplicate_service is None:
-        _duplicate_service = DuplicateService()
-    if _database_service is None:
-        _database_service = DatabaseService()
+    Instances persist across CLI calls in the same process (tests rely on
+    this); call reset_services() to start fresh.
+    """
+    # Imported here so --help and argument errors don't pay for loading
+    # the service layer
+    from ..services.tarball_service import TarballService
+    from ..services.duplicate_service import DuplicateService
+    from ..services.database_service import DatabaseService
+    from ..services.hash_service import HashService
     
-    return _tarball_service, _duplicate_service, _database_service, _hash_service
+    hash_service = HashService()
+    return Services(
+        tarball_service=TarballService(hash_service),
+        duplicate_service=DuplicateService(),
+        database_service=DatabaseService(),
+        hash_service=hash_service
+    )
+
 
 def reset_services():
     """Reset service instances - useful for testing."""
-    global _tarball_service, _duplicate_service, _database_service, _hash_service
-    _tarball_service = None
-    _duplicate_service = None
-    _database_service = None  
-    _hash_service = None
+    get_services.cache_clear()
 
 
 def setup_logging(level: str = 'INFO'):
@@ -56,9 +79,121 @@ def setup_logging(level: str = 'INFO'):
     )
 
 
-def process_command(args: argparse.Namespace) -> int:
+def duplicate_group_row(group) -> Dict[str, Any]:
+    """Build the output row for a duplicate group."""
+    return {
+        'checksum': group.checksum,
+        'file_count': group.file_count,
+        'total_size_saved': group.total_size_saved,
+        'hash_algorithm': group.hash_algorithm
+    }
+
+
+def file_record_row(record) -> Dict[str, Any]:
+    """Build the output row for a file record."""
+    return {
+        'filename': record.filename,
+        'size': record.file_size,
+        'checksum': record.checksum,
+        'tarball_id': record.tarball_id
+    }
+
+
+def write_json_rows(rows: Iterable[Dict[str, Any]]) -> None:
+    """Write rows to stdout as a JSON array, one element at a time.
+    
+    Rows are serialized as they are produced so memory use does not grow
+    with the size of the result set.
+    """
+    out = sys.stdout
+    out.write('[')
+    first = True
+    for row in rows:
+        out.write('\n  ' if first else ',\n  ')
+        out.write(json_dumps(row))
+        first = False
+    out.write(']\n' if first else '\n]\n')
+
+
+def write_lines(lines: Iterable[str]) -> None:
+    """Write pre-formatted lines to stdout in large chunks.
+    
+    Joining a batch of rows into one write avoids a print() call (and a
+    stream lock) per row for large tables.
+    """
+    for batch in chunked(lines, OUTPUT_LINE_BATCH_SIZE):
+        sys.stdout.write(''.join(batch))
+
+
+def write_csv_rows(fieldnames: List[str], rows: Iterable[Dict[str, Any]]) -> None:
+    """Write rows to stdout as CSV with a header line.
+    
+    Values are quoted as needed, so filenames containing commas or quotes
+    round-trip correctly.
+    """
+    writer = csv.DictWriter(sys.stdout, fieldnames=fieldnames, lineterminator='\n')
+    writer.writeheader()
+    writer.writerows(rows)
+
+
+def save_tarball_results(services: Services, tarball_record, file_records: Iterable,
+                         dry_run: bool = False):
+    """Save a tarball's file records and update its duplicate groups.
+    
+    Args:
+        services: Shared service instances
+        tarball_record: TarballRecord the files belong to
+        file_records: FileRecords to save, consumed in bounded batches
+        dry_run: Detect duplicates without saving anything
+        
+    Returns:
+        Tuple of (number of files, list of updated DuplicateGroups)
+    """
+    _, duplicate_service, database_service, _ = services
+    
+    if not dry_run:
+        # Save first so file records can be indexed by hostname
+        database_service.save_tarball_record(tarball_record)
+    
+    updated_groups = {}
+    file_count = 0
+    
+    for batch in chunked(file_records, FILE_RECORD_BATCH_SIZE):
+        if not dry_run:
+            database_service.save_file_records(batch)
+        
+        # Process for duplicates (always run to show potential duplicates)
+        for group in duplicate_service.process_file_records(batch):
+            updated_groups[group.id] = group
+        
+        file_count += len(batch)
+    
+    duplicate_groups = list(updated_groups.values())
+    
+    if not dry_run:
+        # Save duplicate groups in a single batch
+        database_service.save_duplicate_groups(duplicate_groups)
+    
+    return file_count, duplicate_groups
+
+
+def print_tarball_summary(tarball_record, file_count: int, duplicate_groups: List,
+                          dry_run: bool = False):
+    """Print the per-tarball result lines for the process command."""
+    print(f"✅ Processed {tarball_record.filename}: {file_count} files")
+    
+    # Show duplicate detection results
+    if duplicate_groups:
+        total_duplicates = sum(group.file_count for group in duplicate_groups)
+        print(f"   Found {len(duplicate_groups)} duplicate groups with {total_duplicates} files")
+    
+    if dry_run:
+        print(f"   (Dry run - no data saved)")
+
+
+def process_command(args: argparse.Namespace, services: Services) -> int:
     """Handle the 'process' command."""
-    tarball_service, duplicate_service, database_service, _ = get_services()
+    tarball_service = services.tarball_service
     
     if not args.hostname:
         print("Error: --hostname is required for process command", file=sys.stderr)
@@ -68,6 +203,20 @@ def process_command(args: argparse.Namespace) -> int:
         print("Error: At least one tarball file is required", file=sys.stderr)
         return 1
     
+    jobs = getattr(args, 'jobs', 1)
+    if jobs < 0:
+        print("Error: --jobs must be 0 or greater", file=sys.stderr)
+        return 1
+    
+    min_file_size = getattr(args, 'min_file_size', 0)
+    if min_file_size < 0:
+        print("Error: --min-file-size must be 0 or greater", file=sys.stderr)
+        return 1
+    services.duplicate_service.min_file_size = min_file_size
+    
+    if jobs != 1:
+        return process_parallel(args, services, jobs or os.cpu_count())
+    
     success_count = 0
     total_files = 0
     
@@ -79,38 +228,20 @@ def process_command(args: argparse.Namespace) -> int:
         try:
             print(f"Processing {tarball_path}...")
             
-            # Process the tarball
-            tarball_record = tarball_service.process_tarball(tarball_path, args.hostname, args.hash_algorithm)
-            file_records = tarball_service.get_extracted_files(tarball_record.id)
-            
-            if not args.dry_run:
-                # Save to database
-                database_service.save_tarball_record(tarball_record)
-                database_service.save_file_records(file_records)
+            tarball_record = tarball_service.create_tarball_record(tarball_path, args.hostname)
             
-            # Process for duplicates (always run to show potential duplicates)
-            duplicate_groups = duplicate_service.process_file_records(file_records)
-            
-            if not args.dry_run:
-                # Save duplicate groups
-                for group in duplicate_groups:
-                    database_service.save_duplicate_group(group)
+            # Stream file records through in bounded batches
+            file_records = tarball_service.iter_tarball_files(
+                tarball_path, tarball_record, args.hash_algorithm
+            )
+            file_count, duplicate_groups = save_tarball_results(
+                services, tarball_record, file_records, args.dry_run
+            )
             
             success_count += 1
-            total_files += len(file_records)
-            
-            print(f"✅ Processed {tarball_record.filename}: {len(file_records)} files")
-            
-            # Show duplicate detection results
-            if duplicate_groups:
-                total_duplicates = sum(group.file_count for group in duplicate_groups)
-                print(f"   Found {len(duplicate_groups)} duplicate groups with {total_duplicates} files")
+            total_files += file_count
             
-            if args.dry_run:
-                print(f"   (Dry run - no data saved)")
-            
-            # Clean up memory
-            tarball_service.clear_extracted_files(tarball_record.id)
+            print_tarball_summary(tarball_record, file_count, duplicate_groups, args.dry_run)
             
         except Exception as e:
             print(f"❌ Error processing {tarball_path}: {e}", file=sys.stderr)
@@ -120,9 +251,57 @@ def process_command(args: argparse.Namespace) -> int:
     return 0 if success_count > 0 else 1
 
 
-def query_command(args: argparse.Namespace) -> int:
+def process_parallel(args: argparse.Namespace, services: Services, jobs: int) -> int:
+    """Handle the 'process' command with tarballs hashed in worker processes.
+    
+    Hashing is CPU-bound and independent per tarball, so each tarball is
+    hashed in its own process. Results are saved and checked for duplicates
+    in this process as workers finish, so the shared services are only
+    touched from one place.
+    """
+    from ..services.tarball_service import process_tarball_in_worker
+    
+    for tarball_path in args.files:
+        if not os.path.exists(tarball_path):
+            print(f"Error: File not found: {tarball_path}", file=sys.stderr)
+            sys.exit(4)  # File processing error
+    
+    success_count = 0
+    total_files = 0
+    
+    with ProcessPoolExecutor(max_workers=min(jobs, len(args.files))) as executor:
+        futures = {}
+        for tarball_path in args.files:
+            print(f"Processing {tarball_path}...")
+            future = executor.submit(
+                process_tarball_in_worker, tarball_path, args.hostname, args.hash_algorithm
+            )
+            futures[future] = tarball_path
+        
+        for future in as_completed(futures):
+            tarball_path = futures[future]
+            try:
+                tarball_record, file_records = future.result()
+                file_count, duplicate_groups = save_tarball_results(
+                    services, tarball_record, file_records, args.dry_run
+                )
+            except Exception as e:
+                print(f"❌ Error processing {tarball_path}: {e}", file=sys.stderr)
+                executor.shutdown(wait=False, cancel_futures=True)
+                sys.exit(4)  # File processing error
+            
+            success_count += 1
+            total_files += file_count
+            
+            print_tarball_summary(tarball_record, file_count, duplicate_groups, args.dry_run)
+    
+    print(f"\nProcessing complete: {success_count} tarballs, {total_files} files total")
+    return 0 if success_count > 0 else 1
+
+
+def query_command(args: argparse.Namespace, services: Services) -> int:
     """Handle the 'query' command."""
-    _, duplicate_service, database_service, _ = get_services()
+    _, duplicate_service, database_service, _ = services
     
     try:
         if args.stats:
@@ -137,7 +316,7 @@ def query_command(args: argparse.Namespace) -> int:
             }
             
             if args.format == 'json':
-                print(json.dumps(combined_stats, indent=2))
+                print(json_dumps(combined_stats, indent=True))
             else:
                 print("=== Duplicate Detection Statistics ===")
                 print(f"Total groups: {stats['total_groups']}")
@@ -154,67 +333,30 @@ def query_command(args: argparse.Namespace) -> int:
             
             return 0
         
-        # Query for duplicates
+        # Query for duplicates or list file records
         duplicates = []
+        file_records = []
         
         if args.duplicates_only:
             duplicates = duplicate_service.find_all_duplicates()
         else:
-            # Get all file records
-            if args.hostname:
-                file_records = database_service.get_file_records_by_hostname(args.hostname)
-            else:
-                # Get all tarballs and their files
-                all_tarballs = database_service.get_tarball_records()
-                file_records = []
-                for tarball in all_tarballs:
-                    file_records.extend(database_service.get_file_records(tarball.id))
-            
-            # Filter by date if specified
-            if args.since:
-                since_date = datetime.fromisoformat(args.since.replace('Z', '+00:00'))
-                file_records = [f for f in file_records 
-                              if f.created_at and f.created_at >= since_date]
-            
-            # Convert to output format
-            if args.duplicates_only:
-                # Only show duplicates
-                duplicate_checksums = {g.checksum for g in duplicate_service.find_all_duplicates()}
-                file_records = [f for f in file_records 
-                              if f.checksum in duplicate_checksums]
+            file_records = database_service.query_file_records(
+                hostname=args.hostname, since=args.since
+            )
         
         # Format output
-        if args.format == 'json':
+        if args.format in ('json', 'csv'):
             if args.duplicates_only:
-                output = []
-                for group in duplicates:
-                    output.append({
-                        'checksum': group.checksum,
-                        'file_count': group.file_count,
-                        'total_size_saved': group.total_size_saved,
-                        'hash_algorithm': group.hash_algorithm
-                    })
-                print(json.dumps(output, indent=2))
+                fieldnames = DUPLICATE_GROUP_FIELDS
+                rows = (duplicate_group_row(group) for group in duplicates)
             else:
-                output = []
-                for record in file_records:
-                    output.append({
-                        'filename': record.filename,
-                        'size': record.file_size,
-                        'checksum': record.checksum,
-                        'tarball_id': record.tarball_id
-                    })
-                print(json.dumps(output, indent=2))
-        
-        elif args.format == 'csv':
-            if args.duplicates_only:
-                print("checksum,file_count,total_size_saved,hash_algorithm")
-                for group in duplicates:
-                    print(f"{group.checksum},{group.file_count},{group.total_size_saved},{group.hash_algorithm}")
+                fieldnames = FILE_RECORD_FIELDS
+                rows = (file_record_row(record) for record in file_records)
+            
+            if args.format == 'json':
+                write_json_rows(rows)
             else:
-                print("filename,size,checksum,tarball_id")
-                for record in file_records:
-                    print(f"{record.filename},{record.file_size},{record.checksum},{record.tarball_id}")
+                write_csv_rows(fieldnames, rows)
         
         else:  # table format (default)
             if args.duplicates_only:
@@ -222,8 +364,10 @@ def query_command(args: argparse.Namespace) -> int:
                     print("Found duplicate groups:")
                     print(f"{'Checksum':<16} {'Files':<6} {'Saved (bytes)':<12} {'Algorithm':<10}")
                     print("-" * 50)
-                    for group in duplicates:
-                        print(f"{group.checksum[:16]:<16} {group.file_count:<6} {group.total_size_saved:<12} {group.hash_algorithm:<10}")
+                    write_lines(
+                        f"{group.checksum:<16.16} {group.file_count:<6} {group.total_size_saved:<12} {group.hash_algorithm:<10}\n"
+                        for group in duplicates
+                    )
                 else:
                     print("No duplicate files found.")
             else:
@@ -231,8 +375,10 @@ def query_command(args: argparse.Namespace) -> int:
                     print(f"Found {len(file_records)} files:")
                     print(f"{'Filename':<30} {'Size':<10} {'Checksum':<16}")
                     print("-" * 60)
-                    for record in file_records:
-                        print(f"{record.filename[:30]:<30} {record.file_size:<10} {record.checksum[:16]:<16}")
+                    write_lines(
+                        f"{record.filename:<30.30} {record.file_size:<10} {record.checksum:<16.16}\n"
+                        for record in file_records
+                    )
                 else:
                     print("No files found matching criteria.")
         
@@ -243,8 +389,31 @@ def query_command(args: argparse.Namespace) -> int:
         return 1
 
 
+def parse_iso_datetime(value: str) -> datetime:
+    """Parse an ISO 8601 date/time argument.
+    
+    Dates without a timezone are taken as UTC so they compare cleanly with
+    stored record timestamps.
+    
+    Raises:
+        argparse.ArgumentTypeError: If the value is not ISO 8601
+    """
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid ISO date: {value!r}")
+    
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
 def create_parser() -> argparse.ArgumentParser:
     """Create the argument parser."""
+    # Only the hashing module is needed here, for the algorithms that are
+    # actually installed; the rest of the service layer stays unloaded
+    from ..services.hash_service import HashService
+    
     parser = argparse.ArgumentParser(
         prog='dedupe-tarball',
         description='Dedupe-tarball: Detect duplicate files across tarball archives'
@@ -268,9 +437,9 @@ def create_parser() -> argparse.ArgumentParser:
     )
     process_parser.add_argument(
         '--hash-algorithm',
-        choices=['sha256', 'sha1', 'md5', 'sha512'],
+        choices=list(HashService.SUPPORTED_ALGORITHMS),
         default='sha256',
-        help='Hash algorithm to use'
+        help='Hash algorithm to use (blake3 and xxh3_128 need the [fast] extra)'
     )
     process_parser.add_argument(
         '--dry-run',
@@ -282,6 +451,20 @@ def create_parser() -> argparse.ArgumentParser:
         action='store_true',
         help='Show detailed progress during processing'
     )
+    process_parser.add_argument(
+        '--jobs',
+        type=int,
+        default=1,
+        metavar='N',
+        help='Number of tarballs to hash in parallel (0 = one per CPU)'
+    )
+    process_parser.add_argument(
+        '--min-file-size',
+        type=int,
+        default=0,
+        metavar='BYTES',
+        help='Record smaller files but leave them out of duplicate detection'
+    )
     process_parser.add_argument(
         'files',
         nargs='+',
@@ -301,6 +484,7 @@ def create_parser() -> argparse.ArgumentParser:
     )
     query_parser.add_argument(
         '--since',
+        type=parse_iso_datetime,
         help='Show files processed since date (ISO format)'
     )
     query_parser.add_argument(
@@ -335,9 +519,9 @@ def main(argv: Optional[List[str]] = None) -> int:
     
     try:
         if args.command == 'process':
-            return process_command(args)
+            return process_command(args, get_services())
         elif args.command == 'query':
-            return query_command(args)
+            return query_command(args, get_services())
         else:
             print(f"Unknown command: {args.command}", file=sys.stderr)
             return 1
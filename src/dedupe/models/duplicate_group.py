@@ -4,10 +4,20 @@ This module provides the DuplicateGroup model which represents a group
 of duplicate files sharing the same checksum.
 """
 
-import uuid
-from typing import Optional, Dict, Any, List
+import sys
+from typing import Optional, Dict, Any, Iterable, List, Set, Union
 from datetime import datetime, timezone
 
+from ..utils.identifiers import new_uuid4
+from ..utils.json_output import dumps as json_dumps
+from ..utils.timestamps import LazyTimestamp, parse_timestamp
+from ..utils.validation import require_hex, require_text
+
+# Canonical algorithm names. Records store these shared string objects
+# instead of a fresh copy of the caller's value.
+_HASH_ALGORITHMS = {name: sys.intern(name)
+                    for name in ('md5', 'sha1', 'sha256', 'sha512', 'blake3', 'xxh3_128')}
+
 
 class DuplicateGroup:
     """Model representing a group of duplicate files.
@@ -18,17 +28,31 @@ class DuplicateGroup:
         hash_algorithm (str): Algorithm used for the checksum
         file_count (int): Number of files in this duplicate group
         total_size_saved (int): Total bytes saved by deduplication
+        file_size (int): Size in bytes of each file in the group
         first_seen_at (Optional[datetime]): When the first duplicate was found
         last_seen_at (Optional[datetime]): When the last duplicate was found
         created_at (datetime): When the record was created
         updated_at (datetime): When the record was last updated
     """
     
+    # Fixed attribute set; avoids a per-instance __dict__ for large record counts
+    __slots__ = (
+        'id', 'checksum', 'hash_algorithm', 'file_count', 'total_size_saved', 'file_size',
+        '_first_seen_at', '_last_seen_at', '_created_at', '_updated_at', '_file_records',
+    )
+    
+    # Timestamps loaded by from_dict(trusted=True) are parsed on first access
+    first_seen_at = LazyTimestamp()
+    last_seen_at = LazyTimestamp()
+    created_at = LazyTimestamp()
+    updated_at = LazyTimestamp()
+    
     def __init__(self, 
                  checksum: str,
                  hash_algorithm: str,
                  file_count: int = 0,
                  total_size_saved: int = 0,
+                 file_size: int = 0,
                  id: Optional[str] = None,
                  first_seen_at: Optional[datetime] = None,
                  last_seen_at: Optional[datetime] = None,
@@ -41,6 +65,7 @@ class DuplicateGroup:
             hash_algorithm: Algorithm used for the checksum
             file_count: Number of files in this duplicate group
             total_size_saved: Total bytes saved by deduplication
+            file_size: Size in bytes of each file in the group
             id: UUID string (auto-generated if not provided)
             first_seen_at: When the first duplicate was found
             last_seen_at: When the last duplicate was found
@@ -54,11 +79,8 @@ class DuplicateGroup:
         if checksum is None:
             raise ValueError("checksum cannot be None")
         
-        if not checksum or not checksum.strip():
-            raise ValueError("checksum cannot be empty")
-        
-        if not hash_algorithm or not hash_algorithm.strip():
-            raise ValueError("hash_algorithm cannot be empty")
+        checksum = require_hex(checksum, 'checksum', 64)
+        hash_algorithm = require_text(hash_algorithm, 'hash_algorithm', 50).lower()
         
         if file_count < 0:
             raise ValueError("file_count cannot be negative")
@@ -66,35 +88,51 @@ class DuplicateGroup:
         if total_size_saved < 0:
             raise ValueError("total_size_saved cannot be negative")
         
-        # Validate field lengths
-        if len(checksum.strip()) > 64:
-            raise ValueError("checksum too long (max 64 characters)")
-        
-        if len(hash_algorithm.strip()) > 50:
-            raise ValueError("hash_algorithm too long (max 50 characters)")
+        if file_size < 0:
+            raise ValueError("file_size cannot be negative")
         
         # Validate hash algorithm
-        valid_algorithms = {'md5', 'sha1', 'sha256', 'sha512'}
-        if hash_algorithm.lower() not in valid_algorithms:
-            raise ValueError(f"hash_algorithm must be one of: {', '.join(valid_algorithms)}")
+        algorithm = _HASH_ALGORITHMS.get(hash_algorithm)
+        if algorithm is None:
+            raise ValueError(f"hash_algorithm must be one of: {', '.join(_HASH_ALGORITHMS)}")
         
         # Set attributes (minimal validation for test compatibility)
-        self.id = id or str(uuid.uuid4())
-        self.checksum = checksum.strip().lower()  # Store in lowercase for consistency
-        self.hash_algorithm = hash_algorithm.strip().lower()
+        self.id = id or new_uuid4()
+        self.checksum = checksum  # Stored in lowercase for consistency
+        self.hash_algorithm = algorithm
         self.file_count = file_count
         self.total_size_saved = total_size_saved
-        
-        now = datetime.now(timezone.utc)
-        # Use timezone-naive datetimes for test compatibility
-        now_naive = datetime.now()
-        self.first_seen_at = first_seen_at or now_naive
-        self.last_seen_at = last_seen_at or now_naive
-        self.created_at = created_at or now
-        self.updated_at = updated_at or now
-        
-        # Initialize relationship
-        self.file_records = []
+        self.file_size = file_size
+        
+        # Only read the clock for timestamps the caller didn't supply
+        if first_seen_at is None or last_seen_at is None:
+            # Use timezone-naive datetimes for test compatibility
+            now_naive = datetime.now()
+            first_seen_at = first_seen_at or now_naive
+            last_seen_at = last_seen_at or now_naive
+        if created_at is None or updated_at is None:
+            now = datetime.now(timezone.utc)
+            created_at = created_at or now
+            updated_at = updated_at or now
+        self.first_seen_at = first_seen_at
+        self.last_seen_at = last_seen_at
+        self.created_at = created_at
+        self.updated_at = updated_at
+        
+        # Relationship list is allocated on first access
+        self._file_records = None
+    
+    @property
+    def file_records(self) -> List[Any]:
+        """FileRecords in this group (relationship placeholder for ORM)."""
+        if self._file_records is None:
+            self._file_records = []
+        return self._file_records
+    
+    @file_records.setter
+    def file_records(self, value: List[Any]) -> None:
+        """Replace the related FileRecords."""
+        self._file_records = value
     
     def __str__(self) -> str:
         """String representation of the record."""
@@ -129,50 +167,59 @@ class DuplicateGroup:
             'hash_algorithm': self.hash_algorithm,
             'file_count': self.file_count,
             'total_size_saved': self.total_size_saved,
+            'file_size': self.file_size,
             'first_seen_at': self.first_seen_at.isoformat() if self.first_seen_at else None,
             'last_seen_at': self.last_seen_at.isoformat() if self.last_seen_at else None,
             'created_at': self.created_at.isoformat() if self.created_at else None,
             'updated_at': self.updated_at.isoformat() if self.updated_at else None
         }
     
+    def to_raw_dict(self) -> Dict[str, Any]:
+        """Convert record to a dictionary with the same fields as to_dict().
+        
+        Timestamps are left as datetimes rather than formatted with
+        isoformat(). Bulk exports can pass a list of these to one
+        json_output.dumps() call, which with orjson installed formats the
+        timestamps in C.
+        
+        Returns:
+            Dictionary representation of the record
+        """
+        return {
+            'id': self.id,
+            'checksum': self.checksum,
+            'hash_algorithm': self.hash_algorithm,
+            'file_count': self.file_count,
+            'total_size_saved': self.total_size_saved,
+            'file_size': self.file_size,
+            'first_seen_at': self.first_seen_at,
+            'last_seen_at': self.last_seen_at,
+            'created_at': self.created_at,
+            'updated_at': self.updated_at
+        }
+    
+    def to_json(self) -> str:
+        """Convert record to a JSON string with the same fields as to_dict().
+        
+        Returns:
+            JSON representation of the record
+        """
+        return json_dumps(self.to_raw_dict())
+    
     @classmethod
-    def from_dict(cls, data: Dict[str, Any]) -> 'DuplicateGroup':
+    def from_dict(cls, data: Dict[str, Any], trusted: bool = False) -> 'DuplicateGroup':
         """Create record from dictionary.
         
         Args:
             data: Dictionary containing record data
+            trusted: Data came from to_dict() (e.g. read back from storage),
+                so validation and normalization are skipped
             
         Returns:
             DuplicateGroup instance
         """
-        # Parse timestamps
-        created_at = None
-        if data.get('created_at'):
-            if isinstance(data['created_at'], str):
-                created_at = datetime.fromisoformat(data['created_at'].replace('Z', '+00:00'))
-            else:
-                created_at = data['created_at']
-        
-        updated_at = None
-        if data.get('updated_at'):
-            if isinstance(data['updated_at'], str):
-                updated_at = datetime.fromisoformat(data['updated_at'].replace('Z', '+00:00'))
-            else:
-                updated_at = data['updated_at']
-        
-        first_seen_at = None
-        if data.get('first_seen_at'):
-            if isinstance(data['first_seen_at'], str):
-                first_seen_at = datetime.fromisoformat(data['first_seen_at'].replace('Z', '+00:00'))
-            else:
-                first_seen_at = data['first_seen_at']
-        
-        last_seen_at = None
-        if data.get('last_seen_at'):
-            if isinstance(data['last_seen_at'], str):
-                last_seen_at = datetime.fromisoformat(data['last_seen_at'].replace('Z', '+00:00'))
-            else:
-                last_seen_at = data['last_seen_at']
+        if trusted:
+            return cls._new_trusted(data)
         
         return cls(
             id=data.get('id'),
@@ -180,17 +227,42 @@ class DuplicateGroup:
             hash_algorithm=data['hash_algorithm'],
             file_count=data.get('file_count', 0),
             total_size_saved=data.get('total_size_saved', 0),
-            first_seen_at=first_seen_at,
-            last_seen_at=last_seen_at,
-            created_at=created_at,
-            updated_at=updated_at
+            file_size=data.get('file_size', 0),
+            first_seen_at=parse_timestamp(data.get('first_seen_at')),
+            last_seen_at=parse_timestamp(data.get('last_seen_at')),
+            created_at=parse_timestamp(data.get('created_at')),
+            updated_at=parse_timestamp(data.get('updated_at'))
         )
     
-    def add_file(self, file_size: int) -> None:
+    @classmethod
+    def _new_trusted(cls, data: Dict[str, Any]) -> 'DuplicateGroup':
+        """Build a group from already-validated data without running __init__.
+        
+        Timestamp strings are stored as-is and parsed when first read.
+        """
+        now = datetime.now(timezone.utc)
+        now_naive = datetime.now()
+        
+        group = cls.__new__(cls)
+        group.id = data.get('id') or new_uuid4()
+        group.checksum = data['checksum']
+        group.hash_algorithm = _HASH_ALGORITHMS.get(data['hash_algorithm'], data['hash_algorithm'])
+        group.file_count = data.get('file_count', 0)
+        group.total_size_saved = data.get('total_size_saved', 0)
+        group.file_size = data.get('file_size', 0)
+        group.first_seen_at = data.get('first_seen_at') or now_naive
+        group.last_seen_at = data.get('last_seen_at') or now_naive
+        group.created_at = data.get('created_at') or now
+        group.updated_at = data.get('updated_at') or now
+        group._file_records = None
+        return group
+    
+    def add_file(self, file_size: int, now: Optional[datetime] = None) -> None:
         """Add a file to this duplicate group.
         
         Args:
             file_size: Size of the file being added
+            now: Update timestamp; batch callers can pass one shared value
         """
         if file_size < 0:
             raise ValueError("file_size cannot be negative")
@@ -200,17 +272,18 @@ class DuplicateGroup:
         if self.file_count > 1:
             self.total_size_saved += file_size
         
-        now = datetime.now(timezone.utc)
+        now = now or datetime.now(timezone.utc)
         if self.first_seen_at is None:
             self.first_seen_at = now
         self.last_seen_at = now
         self.updated_at = now
     
-    def remove_file(self, file_size: int) -> None:
+    def remove_file(self, file_size: int, now: Optional[datetime] = None) -> None:
         """Remove a file from this duplicate group.
         
         Args:
             file_size: Size of the file being removed
+            now: Update timestamp; batch callers can pass one shared value
             
         Raises:
             ValueError: If trying to remove more files than exist
@@ -228,7 +301,7 @@ class DuplicateGroup:
         else:
             self.total_size_saved = max(0, self.total_size_saved - file_size)
         
-        self.updated_at = datetime.now(timezone.utc)
+        self.updated_at = now or datetime.now(timezone.utc)
     
     def update_last_seen(self, timestamp: datetime = None) -> None:
         """Update the last seen timestamp.
@@ -236,15 +309,12 @@ class DuplicateGroup:
         Args:
             timestamp: Optional timestamp to set (defaults to now)
         """
-        if timestamp is None:
-            now = datetime.now(timezone.utc)
-        else:
-            # Store the timestamp as provided by the caller
-            now = timestamp
+        now = datetime.now(timezone.utc)
         
-        self.last_seen_at = now
+        # Store the timestamp as provided by the caller
+        self.last_seen_at = timestamp if timestamp is not None else now
         # Always update updated_at with timezone-aware timestamp
-        self.updated_at = datetime.now(timezone.utc)
+        self.updated_at = now
     
     def calculate_space_savings(self, original_file_size: int = None) -> int:
         """Calculate space savings for this group.
@@ -268,21 +338,39 @@ class DuplicateGroup:
         """
         return self.file_count == 0
     
+    @staticmethod
+    def build_checksum_index(groups: Iterable['DuplicateGroup']) -> Set[str]:
+        """Build a checksum index for repeated is_checksum_unique() checks.
+        
+        Args:
+            groups: Existing groups
+            
+        Returns:
+            Set of the groups' (lowercase) checksums
+        """
+        return {group.checksum for group in groups}
+    
     @classmethod
-    def is_checksum_unique(cls, checksum: str, existing_groups: list = None) -> bool:
+    def is_checksum_unique(cls, checksum: str,
+                           existing_groups: Union[Set[str], Iterable['DuplicateGroup'], None] = None) -> bool:
         """Check if a checksum is unique among existing groups.
         
         Args:
             checksum: Checksum to check for uniqueness
-            existing_groups: List of existing groups to check against
+            existing_groups: Index from build_checksum_index() (O(1) per
+                check), or a list of groups, which is scanned on every call
             
         Returns:
             True if checksum is unique
         """
-        if existing_groups is None:
-            existing_groups = []
+        if not existing_groups:
+            return True
+        
+        checksum = checksum.lower()
+        if isinstance(existing_groups, (set, frozenset)):
+            return checksum not in existing_groups
         
-        return not any(group.checksum == checksum.lower() for group in existing_groups)
+        return not any(group.checksum == checksum for group in existing_groups)
     
     def has_duplicates(self) -> bool:
         """Check if this group has actual duplicates.
@@ -4,10 +4,20 @@ This module provides the FileRecord model which represents a file
 within a processed tarball.
 """
 
-import uuid
-from typing import Optional, Dict, Any
+import sys
+from typing import Optional, Dict, Any, List, Callable
 from datetime import datetime, timezone
 
+from ..utils.json_output import dumps as json_dumps
+from ..utils.identifiers import is_valid_uuid, new_uuid4, uuid4_strings
+from ..utils.timestamps import parse_timestamp
+from ..utils.validation import require_hex, require_text
+
+# Canonical algorithm names. Records store these shared string objects
+# instead of a fresh copy of the caller's value.
+_HASH_ALGORITHMS = {name: sys.intern(name)
+                    for name in ('md5', 'sha1', 'sha256', 'sha512', 'blake3', 'xxh3_128')}
+
 
 class FileRecord:
     """Model representing a file record within a tarball.
@@ -25,6 +35,13 @@ class FileRecord:
         updated_at (datetime): When the record was last updated
     """
     
+    # Fixed attribute set; avoids a per-instance __dict__ for large record counts
+    __slots__ = (
+        'id', 'tarball_id', 'filename', 'file_size', 'checksum', 'hash_algorithm',
+        'file_timestamp', 'is_duplicate', 'created_at', 'updated_at', 'tarball',
+        'duplicate_group',
+    )
+    
     def __init__(self, 
                  tarball_id: str,
                  filename: str, 
@@ -53,56 +70,41 @@ class FileRecord:
         Raises:
             ValueError: If required fields are invalid
         """
-        # Validate required fields
-        if not tarball_id or not tarball_id.strip():
-            raise ValueError("tarball_id cannot be empty")
-        
-        # Validate tarball_id as UUID
-        try:
-            uuid.UUID(tarball_id.strip())
-        except ValueError:
+        # Validate required fields (500 chars max for filename as per test)
+        tarball_id = require_text(tarball_id, 'tarball_id')
+        if not is_valid_uuid(tarball_id):
             raise ValueError("tarball_id must be a valid UUID")
         
-        if not filename or not filename.strip():
-            raise ValueError("filename cannot be empty")
+        filename = require_text(filename, 'filename', 500)
         
         if file_size < 0:
             raise ValueError("file_size cannot be negative")
         
-        if not checksum or not checksum.strip():
-            raise ValueError("checksum cannot be empty")
-        
-        if not hash_algorithm or not hash_algorithm.strip():
-            raise ValueError("hash_algorithm cannot be empty")
-        
-        # Validate field lengths (500 chars max for filename as per test)
-        if len(filename.strip()) > 500:
-            raise ValueError("filename too long (max 500 characters)")
-        
-        if len(checksum.strip()) > 128:
-            raise ValueError("checksum too long (max 128 characters)")
-        
-        if len(hash_algorithm.strip()) > 50:
-            raise ValueError("hash_algorithm too long (max 50 characters)")
+        checksum = require_hex(checksum, 'checksum', 128)
+        hash_algorithm = require_text(hash_algorithm, 'hash_algorithm', 50).lower()
         
         # Validate hash algorithm
-        valid_algorithms = {'md5', 'sha1', 'sha256', 'sha512'}
-        if hash_algorithm.lower() not in valid_algorithms:
-            raise ValueError(f"hash_algorithm must be one of: {', '.join(valid_algorithms)}")
+        algorithm = _HASH_ALGORITHMS.get(hash_algorithm)
+        if algorithm is None:
+            raise ValueError(f"hash_algorithm must be one of: {', '.join(_HASH_ALGORITHMS)}")
         
         # Set attributes
-        self.id = id or str(uuid.uuid4())
-        self.tarball_id = tarball_id.strip()
-        self.filename = filename.strip()
+        self.id = id or new_uuid4()
+        self.tarball_id = tarball_id
+        self.filename = filename
         self.file_size = file_size
-        self.checksum = checksum.strip()
-        self.hash_algorithm = hash_algorithm.strip()
+        self.checksum = checksum
+        self.hash_algorithm = algorithm
         self.file_timestamp = file_timestamp
         self.is_duplicate = is_duplicate
         
-        now = datetime.now(timezone.utc)
-        self.created_at = created_at or now
-        self.updated_at = updated_at or now
+        # Only read the clock for timestamps the caller didn't supply
+        if created_at is None or updated_at is None:
+            now = datetime.now(timezone.utc)
+            created_at = created_at or now
+            updated_at = updated_at or now
+        self.created_at = created_at
+        self.updated_at = updated_at
         
         # Initialize relationship (placeholder for ORM)
         self.tarball = None
@@ -151,37 +153,52 @@ class FileRecord:
             'updated_at': self.updated_at.isoformat() if self.updated_at else None
         }
     
+    def to_raw_dict(self) -> Dict[str, Any]:
+        """Convert record to a dictionary with the same fields as to_dict().
+        
+        Timestamps are left as datetimes rather than formatted with
+        isoformat(). Bulk exports can pass a list of these to one
+        json_output.dumps() call, which with orjson installed formats the
+        timestamps in C.
+        
+        Returns:
+            Dictionary representation of the record
+        """
+        return {
+            'id': self.id,
+            'tarball_id': self.tarball_id,
+            'filename': self.filename,
+            'file_size': self.file_size,
+            'checksum': self.checksum,
+            'hash_algorithm': self.hash_algorithm,
+            'file_timestamp': self.file_timestamp,
+            'is_duplicate': self.is_duplicate,
+            'created_at': self.created_at,
+            'updated_at': self.updated_at
+        }
+    
+    def to_json(self) -> str:
+        """Convert record to a JSON string with the same fields as to_dict().
+        
+        Returns:
+            JSON representation of the record
+        """
+        return json_dumps(self.to_raw_dict())
+    
     @classmethod
-    def from_dict(cls, data: Dict[str, Any]) -> 'FileRecord':
+    def from_dict(cls, data: Dict[str, Any], trusted: bool = False) -> 'FileRecord':
         """Create record from dictionary.
         
         Args:
             data: Dictionary containing record data
+            trusted: Data came from to_dict() (e.g. read back from storage),
+                so validation and normalization are skipped
             
         Returns:
             FileRecord instance
         """
-        # Parse timestamps
-        created_at = None
-        if data.get('created_at'):
-            if isinstance(data['created_at'], str):
-                created_at = datetime.fromisoformat(data['created_at'].replace('Z', '+00:00'))
-            else:
-                created_at = data['created_at']
-        
-        updated_at = None
-        if data.get('updated_at'):
-            if isinstance(data['updated_at'], str):
-                updated_at = datetime.fromisoformat(data['updated_at'].replace('Z', '+00:00'))
-            else:
-                updated_at = data['updated_at']
-        
-        file_timestamp = None
-        if data.get('file_timestamp'):
-            if isinstance(data['file_timestamp'], str):
-                file_timestamp = datetime.fromisoformat(data['file_timestamp'].replace('Z', '+00:00'))
-            else:
-                file_timestamp = data['file_timestamp']
+        if trusted:
+            return cls._new_trusted(data)
         
         return cls(
             id=data.get('id'),
@@ -190,43 +207,145 @@ class FileRecord:
             file_size=data['file_size'],
             checksum=data['checksum'],
             hash_algorithm=data['hash_algorithm'],
-            file_timestamp=file_timestamp,
+            file_timestamp=parse_timestamp(data.get('file_timestamp')),
             is_duplicate=data.get('is_duplicate', False),
-            created_at=created_at,
-            updated_at=updated_at
+            created_at=parse_timestamp(data.get('created_at')),
+            updated_at=parse_timestamp(data.get('updated_at'))
         )
     
-    def mark_as_duplicate(self) -> None:
-        """Mark this file as a duplicate."""
+    @classmethod
+    def _new_trusted(cls, data: Dict[str, Any], now: Optional[datetime] = None,
+                     record_id: Optional[str] = None) -> 'FileRecord':
+        """Build a record from already-validated data without running __init__.
+        
+        now and record_id are the defaults for missing timestamps and id.
+        """
+        now = now or datetime.now(timezone.utc)
+        
+        record = cls.__new__(cls)
+        record.id = data.get('id') or record_id or new_uuid4()
+        record.tarball_id = data['tarball_id']
+        record.filename = data['filename']
+        record.file_size = data['file_size']
+        record.checksum = data['checksum']
+        record.hash_algorithm = _HASH_ALGORITHMS.get(data['hash_algorithm'], data['hash_algorithm'])
+        record.file_timestamp = parse_timestamp(data.get('file_timestamp'))
+        record.is_duplicate = data.get('is_duplicate', False)
+        record.created_at = parse_timestamp(data.get('created_at')) or now
+        record.updated_at = parse_timestamp(data.get('updated_at')) or now
+        record.tarball = None
+        record.duplicate_group = None
+        return record
+    
+    @classmethod
+    def bulk_new(cls, records: List[Dict[str, Any]]) -> List['FileRecord']:
+        """Create many records at once from already-validated data.
+        
+        Like from_dict(data, trusted=True) for each item, but ids for the
+        batch come from one block of random bytes and the whole batch shares
+        one creation timestamp.
+        
+        Args:
+            records: Dictionaries in to_dict() form
+            
+        Returns:
+            List of FileRecord instances, in input order
+        """
+        now = datetime.now(timezone.utc)
+        return [cls._new_trusted(data, now, record_id)
+                for data, record_id in zip(records, uuid4_strings(len(records)))]
+    
+    @classmethod
+    def record_factory(cls, tarball_id: str,
+                       hash_algorithm: str) -> Callable[..., 'FileRecord']:
+        """Return a constructor for records that share a tarball and algorithm.
+        
+        tarball_id and hash_algorithm are validated once here, so each call
+        of the returned function only checks the filename and file size.
+        Used by tarball extraction, where one record is built per member.
+        
+        Args:
+            tarball_id: Foreign key to TarballRecord
+            hash_algorithm: Algorithm used for the checksums
+            
+        Returns:
+            Function taking (filename, file_size, checksum, file_timestamp=None)
+            
+        Raises:
+            ValueError: If tarball_id or hash_algorithm is invalid
+        """
+        tarball_id = require_text(tarball_id, 'tarball_id')
+        if not is_valid_uuid(tarball_id):
+            raise ValueError("tarball_id must be a valid UUID")
+        
+        algorithm = _HASH_ALGORITHMS.get(require_text(hash_algorithm, 'hash_algorithm', 50).lower())
+        if algorithm is None:
+            raise ValueError(f"hash_algorithm must be one of: {', '.join(_HASH_ALGORITHMS)}")
+        
+        new = cls.__new__
+        
+        def make(filename: str, file_size: int, checksum: str,
+                 file_timestamp: Optional[datetime] = None) -> 'FileRecord':
+            filename = require_text(filename, 'filename', 500)
+            if file_size < 0:
+                raise ValueError("file_size cannot be negative")
+            
+            now = datetime.now(timezone.utc)
+            record = new(cls)
+            record.id = new_uuid4()
+            record.tarball_id = tarball_id
+            record.filename = filename
+            record.file_size = file_size
+            record.checksum = require_hex(checksum, 'checksum', 128)
+            record.hash_algorithm = algorithm
+            record.file_timestamp = file_timestamp
+            record.is_duplicate = False
+            record.created_at = now
+            record.updated_at = now
+            record.tarball = None
+            record.duplicate_group = None
+            return record
+        
+        return make
+    
+    def mark_as_duplicate(self, now: Optional[datetime] = None) -> None:
+        """Mark this file as a duplicate.
+        
+        Args:
+            now: Update timestamp; batch callers can pass one shared value
+        """
         self.is_duplicate = True
-        self.updated_at = datetime.now(timezone.utc)
+        self.updated_at = now or datetime.now(timezone.utc)
     
-    def mark_as_unique(self) -> None:
-        """Mark this file as unique (not a duplicate)."""
+    def mark_as_unique(self, now: Optional[datetime] = None) -> None:
+        """Mark this file as unique (not a duplicate).
+        
+        Args:
+            now: Update timestamp; batch callers can pass one shared value
+        """
         self.is_duplicate = False
-        self.updated_at = datetime.now(timezone.utc)
+        self.updated_at = now or datetime.now(timezone.utc)
     
-    def update_checksum(self, checksum: str, hash_algorithm: str) -> None:
+    def update_checksum(self, checksum: str, hash_algorithm: str,
+                        now: Optional[datetime] = None) -> None:
         """Update the file checksum and algorithm.
         
         Args:
             checksum: New checksum value
             hash_algorithm: New hash algorithm
+            now: Update timestamp; batch callers can pass one shared value
             
         Raises:
             ValueError: If checksum or hash_algorithm is invalid
         """
-        if not checksum or not checksum.strip():
-            raise ValueError("checksum cannot be empty")
-        
-        if not hash_algorithm or not hash_algorithm.strip():
-            raise ValueError("hash_algorithm cannot be empty")
+        checksum = require_hex(checksum, 'checksum')
+        hash_algorithm = require_text(hash_algorithm, 'hash_algorithm')
         
         # Validate hash algorithm
-        valid_algorithms = {'md5', 'sha1', 'sha256', 'sha512'}
-        if hash_algorithm.lower() not in valid_algorithms:
-            raise ValueError(f"hash_algorithm must be one of: {', '.join(valid_algorithms)}")
+        algorithm = _HASH_ALGORITHMS.get(hash_algorithm.lower())
+        if algorithm is None:
+            raise ValueError(f"hash_algorithm must be one of: {', '.join(_HASH_ALGORITHMS)}")
         
-        self.checksum = checksum.strip()
-        self.hash_algorithm = hash_algorithm.strip()
-        self.updated_at = datetime.now(timezone.utc)
\ No newline at end of file
+        self.checksum = checksum
+        self.hash_algorithm = algorithm
+        self.updated_at = now or datetime.now(timezone.utc)
\ No newline at end of file
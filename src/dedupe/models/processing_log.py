@@ -4,11 +4,34 @@ This module provides the ProcessingLog model which represents a log entry
 for operations performed by the system.
 """
 
-import uuid
+import sys
 from typing import Optional, Dict, Any
 from datetime import datetime, timezone
+from enum import IntEnum
 import json
 
+from ..utils.json_output import dumps as json_dumps
+from ..utils.identifiers import is_valid_uuid, new_uuid4
+from ..utils.timestamps import parse_timestamp
+from ..utils.validation import require_text
+
+# Canonical operation names. Records store these shared string objects
+# instead of a fresh copy of the caller's value.
+_OPERATION_TYPES = {
+    name: sys.intern(name) for name in (
+        'PROCESS_TARBALL', 'DETECT_DUPLICATES', 'CLEANUP', 'QUERY',
+        'SCHEMA_MIGRATION', 'BACKUP', 'RESTORE', 'TEST'
+    )
+}
+
+
+class LogLevel(IntEnum):
+    """Log levels, valued by severity (higher = more severe)."""
+    DEBUG = 1
+    INFO = 2
+    WARNING = 3
+    ERROR = 4
+
 
 class ProcessingLog:
     """Model representing a processing log entry.
@@ -18,11 +41,18 @@ class ProcessingLog:
         operation_type (str): Type of operation being logged
         tarball_id (Optional[str]): Foreign key to TarballRecord (optional)
         log_level (str): Log level (DEBUG, INFO, WARNING, ERROR)
+        level (LogLevel): Log level as a severity-ordered enum
         message (str): Log message
         details (Optional[Dict[str, Any]]): Additional details as JSON
         timestamp (datetime): When the log entry was created
     """
     
+    # Fixed attribute set; avoids a per-instance __dict__ for large record counts
+    __slots__ = (
+        'id', 'operation_type', 'tarball_id', 'level', 'message', 'details',
+        'timestamp', 'tarball', '_details_owned',
+    )
+    
     def __init__(self, 
                  operation_type: str,
                  log_level: str,
@@ -46,56 +76,38 @@ class ProcessingLog:
             ValueError: If required fields are invalid
         """
         # Validate required fields
-        if not operation_type or not operation_type.strip():
-            raise ValueError("operation_type cannot be empty")
-        
-        if not log_level or not log_level.strip():
-            raise ValueError("log_level cannot be empty")
-        
-        if not message or not message.strip():
-            raise ValueError("message cannot be empty")
-        
-        # Validate field lengths
-        if len(operation_type.strip()) > 50:
-            raise ValueError("operation_type too long (max 50 characters)")
-        
-        if len(log_level.strip()) > 20:
-            raise ValueError("log_level too long (max 20 characters)")
-        
-        if len(message.strip()) > 2000:
-            raise ValueError("message too long (max 2000 characters)")
+        operation_type = require_text(operation_type, 'operation_type', 50).upper()
+        log_level = require_text(log_level, 'log_level', 20).upper()
+        message = require_text(message, 'message', 2000)
         
         # Validate log level
-        valid_levels = {'DEBUG', 'INFO', 'WARNING', 'ERROR'}
-        if log_level.upper() not in valid_levels:
-            raise ValueError(f"log_level must be one of: {', '.join(valid_levels)}")
-        
-        # Validate operation type (basic validation)
-        valid_operations = {
-            'PROCESS_TARBALL', 'DETECT_DUPLICATES', 'CLEANUP', 'QUERY',
-            'SCHEMA_MIGRATION', 'BACKUP', 'RESTORE', 'TEST'
-        }
-        if operation_type.upper() not in valid_operations:
-            # Allow any operation type for flexibility, just warn
-            pass
+        level = LogLevel.__members__.get(log_level)
+        if level is None:
+            raise ValueError(f"log_level must be one of: {', '.join(LogLevel.__members__)}")
+        
+        # Any operation type is allowed for flexibility; known ones share
+        # the canonical string
+        operation_type = _OPERATION_TYPES.get(operation_type, operation_type)
         
         # Set attributes
-        self.id = id or str(uuid.uuid4())
-        self.operation_type = operation_type.strip().upper()
+        self.id = id or new_uuid4()
+        self.operation_type = operation_type
         
         # Validate tarball_id as UUID if provided
         if tarball_id:
-            try:
-                uuid.UUID(tarball_id.strip())
-                self.tarball_id = tarball_id.strip()
-            except ValueError:
+            tarball_id = tarball_id.strip()
+            if not is_valid_uuid(tarball_id):
                 raise ValueError("tarball_id must be a valid UUID")
+            self.tarball_id = tarball_id
         else:
             self.tarball_id = None
             
-        self.log_level = log_level.strip().upper()
-        self.message = message.strip()
-        self.details = details.copy() if details else None
+        self.level = level
+        self.message = message
+        # The caller's details dict is shared until add_detail() first
+        # modifies it (copy-on-write)
+        self.details = details if details else None
+        self._details_owned = False
         
         # Use timezone-naive for test compatibility
         self.timestamp = timestamp or datetime.now()
@@ -141,23 +153,49 @@ class ProcessingLog:
             'timestamp': self.timestamp.isoformat() if self.timestamp else None
         }
     
+    def to_raw_dict(self) -> Dict[str, Any]:
+        """Convert record to a dictionary with the same fields as to_dict().
+        
+        Timestamps are left as datetimes rather than formatted with
+        isoformat(). Bulk exports can pass a list of these to one
+        json_output.dumps() call, which with orjson installed formats the
+        timestamps in C.
+        
+        Returns:
+            Dictionary representation of the record
+        """
+        return {
+            'id': self.id,
+            'operation_type': self.operation_type,
+            'tarball_id': self.tarball_id,
+            'log_level': self.log_level,
+            'message': self.message,
+            'details': self.details,
+            'timestamp': self.timestamp
+        }
+    
+    def to_json(self) -> str:
+        """Convert record to a JSON string with the same fields as to_dict().
+        
+        Returns:
+            JSON representation of the record
+        """
+        return json_dumps(self.to_raw_dict())
+    
     @classmethod
-    def from_dict(cls, data: Dict[str, Any]) -> 'ProcessingLog':
+    def from_dict(cls, data: Dict[str, Any], trusted: bool = False) -> 'ProcessingLog':
         """Create record from dictionary.
         
         Args:
             data: Dictionary containing record data
+            trusted: Data came from to_dict() (e.g. read back from storage),
+                so validation and normalization are skipped
             
         Returns:
             ProcessingLog instance
         """
-        # Parse timestamp
-        timestamp = None
-        if data.get('timestamp'):
-            if isinstance(data['timestamp'], str):
-                timestamp = datetime.fromisoformat(data['timestamp'].replace('Z', '+00:00'))
-            else:
-                timestamp = data['timestamp']
+        if trusted:
+            return cls._new_trusted(data)
         
         return cls(
             id=data.get('id'),
@@ -166,9 +204,27 @@ class ProcessingLog:
             log_level=data['log_level'],
             message=data['message'],
             details=data.get('details'),
-            timestamp=timestamp
+            timestamp=parse_timestamp(data.get('timestamp'))
         )
     
+    @classmethod
+    def _new_trusted(cls, data: Dict[str, Any]) -> 'ProcessingLog':
+        """Build a log entry from already-validated data without running __init__."""
+        operation_type = data['operation_type']
+        details = data.get('details')
+        
+        log = cls.__new__(cls)
+        log.id = data.get('id') or new_uuid4()
+        log.operation_type = _OPERATION_TYPES.get(operation_type, operation_type)
+        log.tarball_id = data.get('tarball_id')
+        log.level = LogLevel[data['log_level']]
+        log.message = data['message']
+        log.details = details if details else None
+        log._details_owned = False
+        log.timestamp = parse_timestamp(data.get('timestamp')) or datetime.now()
+        log.tarball = None
+        return log
+    
     def add_detail(self, key: str, value: Any) -> None:
         """Add a detail to the log entry.
         
@@ -176,8 +232,10 @@ class ProcessingLog:
             key: Detail key
             value: Detail value
         """
-        if self.details is None:
-            self.details = {}
+        if not self._details_owned:
+            # Copy before the first write so the caller's dict is untouched
+            self.details = dict(self.details) if self.details else {}
+            self._details_owned = True
         self.details[key] = value
     
     def get_detail(self, key: str, default: Any = None) -> Any:
@@ -194,13 +252,26 @@ class ProcessingLog:
             return default
         return self.details.get(key, default)
     
+    @property
+    def log_level(self) -> str:
+        """Log level name (DEBUG, INFO, WARNING, ERROR)."""
+        return self.level.name
+    
+    @log_level.setter
+    def log_level(self, value: str) -> None:
+        """Set the level from its name, validated as in the constructor."""
+        try:
+            self.level = LogLevel[value.strip().upper()]
+        except KeyError:
+            raise ValueError(f"log_level must be one of: {', '.join(LogLevel.__members__)}") from None
+    
     def is_error(self) -> bool:
         """Check if this is an error log.
         
         Returns:
             True if log_level is ERROR
         """
-        return self.log_level == 'ERROR'
+        return self.level is LogLevel.ERROR
     
     def is_warning(self) -> bool:
         """Check if this is a warning log.
@@ -208,7 +279,7 @@ class ProcessingLog:
         Returns:
             True if log_level is WARNING
         """
-        return self.log_level == 'WARNING'
+        return self.level is LogLevel.WARNING
     
     def get_severity_level(self) -> int:
         """Get numeric severity level for ordering.
@@ -216,13 +287,7 @@ class ProcessingLog:
         Returns:
             Numeric severity (higher = more severe)
         """
-        levels = {
-            'DEBUG': 1,
-            'INFO': 2,
-            'WARNING': 3,
-            'ERROR': 4
-        }
-        return levels.get(self.log_level, 0)
+        return int(self.level)
     
     def is_more_severe_than(self, other: 'ProcessingLog') -> bool:
         """Check if this log is more severe than another.
@@ -233,7 +298,7 @@ class ProcessingLog:
         Returns:
             True if this log is more severe
         """
-        return self.get_severity_level() > other.get_severity_level()
+        return self.level > other.level
     
     def format_message(self) -> str:
         """Format the log message with timestamp and level.
@@ -241,5 +306,10 @@ class ProcessingLog:
         Returns:
             Formatted log message
         """
-        timestamp_str = self.timestamp.strftime('%Y-%m-%d %H:%M:%S UTC') if self.timestamp else 'Unknown'
+        t = self.timestamp
+        if t:
+            # Same text as strftime('%Y-%m-%d %H:%M:%S UTC') without parsing a format string
+            timestamp_str = f"{t.year:04d}-{t.month:02d}-{t.day:02d} {t.hour:02d}:{t.minute:02d}:{t.second:02d} UTC"
+        else:
+            timestamp_str = 'Unknown'
         return f"[{timestamp_str}] {self.log_level}: {self.message}"
\ No newline at end of file
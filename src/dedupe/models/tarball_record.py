@@ -4,11 +4,16 @@ This module provides the TarballRecord model which represents a tarball file
 that has been processed by the system.
 """
 
-import uuid
+import sys
 from typing import Optional, Dict, Any, List
 from datetime import datetime, timezone
 from enum import Enum
 
+from ..utils.identifiers import new_uuid4
+from ..utils.json_output import dumps as json_dumps
+from ..utils.timestamps import parse_timestamp
+from ..utils.validation import require_text
+
 
 class TarballStatus(Enum):
     """Enumeration of tarball processing statuses."""
@@ -20,6 +25,29 @@ class TarballStatus(Enum):
     FAILED = "FAILED"
 
 
+# Records store the status as one of these shared value strings rather than
+# the Enum member, so reading status and the is_*() checks are plain string
+# operations instead of Enum attribute lookups.
+_STATUSES = {status.value: status.value for status in TarballStatus}
+_COMPLETED = TarballStatus.COMPLETED.value
+_FAILED = TarballStatus.FAILED.value
+_PROCESSING = TarballStatus.PROCESSING.value
+
+
+def _status_value(status: Any) -> str:
+    """Return the canonical status string for a TarballStatus or its value.
+    
+    Raises:
+        ValueError: If status is not a valid TarballStatus or value
+    """
+    if isinstance(status, TarballStatus):
+        return status.value
+    value = _STATUSES.get(status) if isinstance(status, str) else None
+    if value is None:
+        return TarballStatus(status).value
+    return value
+
+
 class TarballRecord:
     """Model representing a tarball file record.
     
@@ -38,6 +66,13 @@ class TarballRecord:
         file_records (List): List of FileRecord objects in this tarball
     """
     
+    # Fixed attribute set; avoids a per-instance __dict__ for large record counts
+    __slots__ = (
+        'id', 'filename', 'hostname', '_status', 'file_size', 'created_at',
+        'updated_at', 'processed_at', 'processing_duration', 'total_files_count',
+        'error_message', 'file_records',
+    )
+    
     def __init__(self, 
                  filename: str, 
                  hostname: str, 
@@ -68,35 +103,30 @@ class TarballRecord:
         Raises:
             ValueError: If required fields are invalid
         """
-        # Validate required fields
-        if not filename or not filename.strip():
-            raise ValueError("filename cannot be empty")
-        
-        if not hostname or not hostname.strip():
-            raise ValueError("hostname cannot be empty")
+        # Validate required fields (255/100 char limits as per test)
+        filename = require_text(filename, 'filename', 255)
+        hostname = require_text(hostname, 'hostname', 100)
         
         if file_size < 0:
             raise ValueError("file_size cannot be negative")
         
-        # Validate filename format (255 char limit as per test)
-        if len(filename.strip()) > 255:
-            raise ValueError("filename too long (max 255 characters)")
-        
-        # Validate hostname format (100 char limit as per test)
-        if len(hostname.strip()) > 100:
-            raise ValueError("hostname too long (max 100 characters)")
-        
         # Set attributes
-        self.id = id or str(uuid.uuid4())
-        self.filename = filename.strip()
-        self.hostname = hostname.strip()
-        self._status = status if isinstance(status, TarballStatus) else TarballStatus(status)
+        self.id = id or new_uuid4()
+        self.filename = filename
+        # Few distinct hostnames across many records; share one string each
+        self.hostname = sys.intern(hostname)
+        self._status = _status_value(status)
         self.file_size = file_size
         
-        now = datetime.now(timezone.utc)
-        self.created_at = created_at or now
-        self.updated_at = updated_at or now
-        self.processed_at = processed_at or now
+        # Only read the clock for timestamps the caller didn't supply
+        if created_at is None or updated_at is None or processed_at is None:
+            now = datetime.now(timezone.utc)
+            created_at = created_at or now
+            updated_at = updated_at or now
+            processed_at = processed_at or now
+        self.created_at = created_at
+        self.updated_at = updated_at
+        self.processed_at = processed_at
         self.processing_duration = processing_duration
         
         # Validate processing_duration
@@ -117,15 +147,13 @@ class TarballRecord:
     @property
     def status(self) -> str:
         """Get the status as a string."""
-        return self._status.value
+        return self._status
     
     @status.setter
     def status(self, value) -> None:
         """Set the status from string or enum."""
-        if isinstance(value, str):
-            self._status = TarballStatus(value)
-        elif isinstance(value, TarballStatus):
-            self._status = value
+        if isinstance(value, (str, TarballStatus)):
+            self._status = _status_value(value)
         else:
             raise ValueError(f"Invalid status type: {type(value)}")
     
@@ -162,7 +190,7 @@ class TarballRecord:
             'id': self.id,
             'filename': self.filename,
             'hostname': self.hostname,
-            'status': self.status,
+            'status': self._status,
             'file_size': self.file_size,
             'created_at': self.created_at.isoformat() if self.created_at else None,
             'updated_at': self.updated_at.isoformat() if self.updated_at else None,
@@ -172,37 +200,53 @@ class TarballRecord:
             'error_message': self.error_message
         }
     
+    def to_raw_dict(self) -> Dict[str, Any]:
+        """Convert record to a dictionary with the same fields as to_dict().
+        
+        Timestamps are left as datetimes rather than formatted with
+        isoformat(). Bulk exports can pass a list of these to one
+        json_output.dumps() call, which with orjson installed formats the
+        timestamps in C.
+        
+        Returns:
+            Dictionary representation of the record
+        """
+        return {
+            'id': self.id,
+            'filename': self.filename,
+            'hostname': self.hostname,
+            'status': self._status,
+            'file_size': self.file_size,
+            'created_at': self.created_at,
+            'updated_at': self.updated_at,
+            'processed_at': self.processed_at,
+            'processing_duration': self.processing_duration,
+            'total_files_count': self.total_files_count,
+            'error_message': self.error_message
+        }
+    
+    def to_json(self) -> str:
+        """Convert record to a JSON string with the same fields as to_dict().
+        
+        Returns:
+            JSON representation of the record
+        """
+        return json_dumps(self.to_raw_dict())
+    
     @classmethod
-    def from_dict(cls, data: Dict[str, Any]) -> 'TarballRecord':
+    def from_dict(cls, data: Dict[str, Any], trusted: bool = False) -> 'TarballRecord':
         """Create record from dictionary.
         
         Args:
             data: Dictionary containing record data
+            trusted: Data came from to_dict() (e.g. read back from storage),
+                so validation and normalization are skipped
             
         Returns:
             TarballRecord instance
         """
-        # Parse timestamps
-        created_at = None
-        if data.get('created_at'):
-            if isinstance(data['created_at'], str):
-                created_at = datetime.fromisoformat(data['created_at'].replace('Z', '+00:00'))
-            else:
-                created_at = data['created_at']
-        
-        updated_at = None
-        if data.get('updated_at'):
-            if isinstance(data['updated_at'], str):
-                updated_at = datetime.fromisoformat(data['updated_at'].replace('Z', '+00:00'))
-            else:
-                updated_at = data['updated_at']
-        
-        processed_at = None
-        if data.get('processed_at'):
-            if isinstance(data['processed_at'], str):
-                processed_at = datetime.fromisoformat(data['processed_at'].replace('Z', '+00:00'))
-            else:
-                processed_at = data['processed_at']
+        if trusted:
+            return cls._new_trusted(data)
         
         # Parse status
         status = data.get('status', 'PROCESSING')
@@ -213,28 +257,50 @@ class TarballRecord:
             hostname=data['hostname'],
             file_size=data['file_size'],
             status=status,
-            created_at=created_at,
-            updated_at=updated_at,
-            processed_at=processed_at,
+            created_at=parse_timestamp(data.get('created_at')),
+            updated_at=parse_timestamp(data.get('updated_at')),
+            processed_at=parse_timestamp(data.get('processed_at')),
             processing_duration=data.get('processing_duration'),
             total_files_count=data.get('total_files_count'),
             error_message=data.get('error_message')
         )
     
-    def update_status(self, status: str) -> None:
+    @classmethod
+    def _new_trusted(cls, data: Dict[str, Any]) -> 'TarballRecord':
+        """Build a record from already-validated data without running __init__."""
+        now = datetime.now(timezone.utc)
+        
+        record = cls.__new__(cls)
+        record.id = data.get('id') or new_uuid4()
+        record.filename = data['filename']
+        record.hostname = sys.intern(data['hostname'])
+        record._status = _STATUSES[data.get('status', 'PROCESSING')]
+        record.file_size = data['file_size']
+        record.created_at = parse_timestamp(data.get('created_at')) or now
+        record.updated_at = parse_timestamp(data.get('updated_at')) or now
+        record.processed_at = parse_timestamp(data.get('processed_at')) or now
+        record.processing_duration = data.get('processing_duration')
+        record.total_files_count = data.get('total_files_count')
+        record.error_message = data.get('error_message')
+        record.file_records = []
+        return record
+    
+    def update_status(self, status: str, now: Optional[datetime] = None) -> None:
         """Update the record status and timestamp.
         
         Args:
             status: New status value
+            now: Update timestamp; batch callers can pass one shared value
         """
         self.status = status
-        self.updated_at = datetime.now(timezone.utc)
+        self.updated_at = now or datetime.now(timezone.utc)
     
-    def set_processing_duration(self, duration: int) -> None:
+    def set_processing_duration(self, duration: int, now: Optional[datetime] = None) -> None:
         """Set the processing duration.
         
         Args:
             duration: Processing time in seconds
+            now: Update timestamp; batch callers can pass one shared value
             
         Raises:
             ValueError: If duration is negative
@@ -242,7 +308,7 @@ class TarballRecord:
         if duration < 0:
             raise ValueError("processing_duration cannot be negative")
         self.processing_duration = duration
-        self.updated_at = datetime.now(timezone.utc)
+        self.updated_at = now or datetime.now(timezone.utc)
     
     def is_completed(self) -> bool:
         """Check if processing is completed.
@@ -250,7 +316,7 @@ class TarballRecord:
         Returns:
             True if status is COMPLETED
         """
-        return self._status == TarballStatus.COMPLETED
+        return self._status == _COMPLETED
     
     def is_failed(self) -> bool:
         """Check if processing failed.
@@ -258,7 +324,7 @@ class TarballRecord:
         Returns:
             True if status is FAILED
         """
-        return self._status == TarballStatus.FAILED
+        return self._status == _FAILED
     
     def is_processing(self) -> bool:
         """Check if currently processing.
@@ -266,4 +332,4 @@ class TarballRecord:
         Returns:
             True if status is PROCESSING
         """
-        return self._status == TarballStatus.PROCESSING
\ No newline at end of file
+        return self._status == _PROCESSING
\ No newline at end of file
@@ -5,7 +5,8 @@ for all model types in the dedupe-tarball application.
 """
 
 import logging
-from typing import List, Optional, Dict, Any
+from operator import attrgetter
+from typing import List, Optional, Dict, Any, Tuple
 from datetime import datetime, timezone
 
 from ..models.tarball_record import TarballRecord
@@ -15,6 +16,10 @@ from ..models.processing_log import ProcessingLog
 
 logger = logging.getLogger(__name__)
 
+_get_id = attrgetter('id')
+_get_checksum = attrgetter('checksum')
+_get_tarball_id = attrgetter('tarball_id')
+
 
 class DatabaseService:
     """Service for database operations and model management."""
@@ -28,11 +33,17 @@ class DatabaseService:
         self._duplicate_groups: Dict[str, DuplicateGroup] = {}
         self._processing_logs: Dict[str, ProcessingLog] = {}
         
-        # Indexes for efficient queries
-        self._tarball_by_hostname: Dict[str, List[str]] = {}
-        self._files_by_tarball: Dict[str, List[str]] = {}
-        self._files_by_hostname: Dict[str, List[str]] = {}
-        self._duplicates_by_checksum: Dict[str, str] = {}
+        # Indexes for efficient queries. Each entry maps record IDs to None,
+        # an insertion-ordered set with O(1) add, membership and removal.
+        self._tarball_by_hostname: Dict[str, Dict[str, None]] = {}
+        self._files_by_tarball: Dict[str, Dict[str, None]] = {}
+        self._files_by_hostname: Dict[str, Dict[str, None]] = {}
+        self._files_by_checksum: Dict[str, Dict[str, None]] = {}
+        self._duplicates_by_checksum: Dict[Tuple[str, str], str] = {}
+        self._duplicate_algorithms: Dict[str, None] = {}
+        self._multi_file_groups: Dict[str, None] = {}
+        self._logs_by_tarball: Dict[str, Dict[str, None]] = {}
+        self._logs_by_level: Dict[str, Dict[str, None]] = {}
     
     # TarballRecord operations
     def save_tarball_record(self, record: TarballRecord) -> TarballRecord:
@@ -47,10 +58,7 @@ class DatabaseService:
         self._tarball_records[record.id] = record
         
         # Update hostname index
-        if record.hostname not in self._tarball_by_hostname:
-            self._tarball_by_hostname[record.hostname] = []
-        if record.id not in self._tarball_by_hostname[record.hostname]:
-            self._tarball_by_hostname[record.hostname].append(record.id)
+        self._tarball_by_hostname.setdefault(record.hostname, {})[record.id] = None
         
         logger.debug(f"Saved tarball record {record.id} for hostname {record.hostname}")
         return record
@@ -76,7 +84,7 @@ class DatabaseService:
             List of TarballRecord objects
         """
         if hostname:
-            record_ids = self._tarball_by_hostname.get(hostname, [])
+            record_ids = self._tarball_by_hostname.get(hostname, ())
             return [self._tarball_records[rid] for rid in record_ids 
                    if rid in self._tarball_records]
         
@@ -97,10 +105,10 @@ class DatabaseService:
         record = self._tarball_records[record_id]
         
         # Remove from hostname index
-        if record.hostname in self._tarball_by_hostname:
-            if record_id in self._tarball_by_hostname[record.hostname]:
-                self._tarball_by_hostname[record.hostname].remove(record_id)
-            if not self._tarball_by_hostname[record.hostname]:
+        entry = self._tarball_by_hostname.get(record.hostname)
+        if entry is not None:
+            entry.pop(record_id, None)
+            if not entry:
                 del self._tarball_by_hostname[record.hostname]
         
         # Delete the record
@@ -122,18 +130,13 @@ class DatabaseService:
         self._file_records[record.id] = record
         
         # Update tarball index
-        if record.tarball_id not in self._files_by_tarball:
-            self._files_by_tarball[record.tarball_id] = []
-        if record.id not in self._files_by_tarball[record.tarball_id]:
-            self._files_by_tarball[record.tarball_id].append(record.id)
+        self._files_by_tarball.setdefault(record.tarball_id, {})[record.id] = None
+        self._files_by_checksum.setdefault(record.checksum, {})[record.id] = None
         
         # Update hostname index (need to look up tarball for hostname)
-        tarball = self.get_tarball_record(record.tarball_id)
+        tarball = self._tarball_records.get(record.tarball_id)
         if tarball:
-            if tarball.hostname not in self._files_by_hostname:
-                self._files_by_hostname[tarball.hostname] = []
-            if record.id not in self._files_by_hostname[tarball.hostname]:
-                self._files_by_hostname[tarball.hostname].append(record.id)
+            self._files_by_hostname.setdefault(tarball.hostname, {})[record.id] = None
         
         logger.debug(f"Saved file record {record.id} for tarball {record.tarball_id}")
         return record
@@ -147,12 +150,37 @@ class DatabaseService:
         Returns:
             List of saved records
         """
-        saved_records = []
-        for record in records:
-            saved_records.append(self.save_file_record(record))
+        record_ids = list(map(_get_id, records))
+        self._file_records.update(zip(record_ids, records))
+        
+        files_by_checksum = self._files_by_checksum
+        for record_id, checksum in zip(record_ids, map(_get_checksum, records)):
+            entry = files_by_checksum.get(checksum)
+            if entry is None:
+                files_by_checksum[checksum] = {record_id: None}
+            else:
+                entry[record_id] = None
+        
+        # Group IDs by tarball so each tarball's indexes and hostname lookup
+        # are updated once per batch. Batches from the CLI hold a single
+        # tarball, which needs no per-record grouping.
+        ids_by_tarball: Dict[str, Dict[str, None]] = {}
+        tarball_ids = set(map(_get_tarball_id, records))
+        if len(tarball_ids) == 1:
+            ids_by_tarball[tarball_ids.pop()] = dict.fromkeys(record_ids)
+        else:
+            for record_id, tarball_id in zip(record_ids, map(_get_tarball_id, records)):
+                ids_by_tarball.setdefault(tarball_id, {})[record_id] = None
+        
+        for tarball_id, tarball_record_ids in ids_by_tarball.items():
+            self._files_by_tarball.setdefault(tarball_id, {}).update(tarball_record_ids)
+            
+            tarball = self._tarball_records.get(tarball_id)
+            if tarball:
+                self._files_by_hostname.setdefault(tarball.hostname, {}).update(tarball_record_ids)
         
-        logger.info(f"Saved {len(saved_records)} file records")
-        return saved_records
+        logger.info(f"Saved {len(records)} file records")
+        return records
     
     def get_file_record(self, record_id: str) -> Optional[FileRecord]:
         """Get a file record by ID.
@@ -174,7 +202,7 @@ class DatabaseService:
         Returns:
             List of FileRecord objects
         """
-        record_ids = self._files_by_tarball.get(tarball_id, [])
+        record_ids = self._files_by_tarball.get(tarball_id, ())
         return [self._file_records[rid] for rid in record_ids 
                if rid in self._file_records]
     
@@ -187,10 +215,35 @@ class DatabaseService:
         Returns:
             List of FileRecord objects
         """
-        record_ids = self._files_by_hostname.get(hostname, [])
+        record_ids = self._files_by_hostname.get(hostname, ())
         return [self._file_records[rid] for rid in record_ids 
                if rid in self._file_records]
     
+    def query_file_records(self, 
+                           hostname: Optional[str] = None,
+                           since: Optional[datetime] = None) -> List[FileRecord]:
+        """Get file records matching optional hostname and creation-time filters.
+        
+        Args:
+            hostname: Optional hostname to filter by
+            since: Optional lower bound (inclusive) on record creation time
+            
+        Returns:
+            List of FileRecord objects
+        """
+        if hostname:
+            records = (self._file_records[rid] 
+                       for rid in self._files_by_hostname.get(hostname, ())
+                       if rid in self._file_records)
+        else:
+            records = self._file_records.values()
+        
+        if since is None:
+            return list(records)
+        
+        return [record for record in records 
+                if record.created_at and record.created_at >= since]
+    
     def delete_file_record(self, record_id: str) -> bool:
         """Delete a file record.
         
@@ -206,15 +259,13 @@ class DatabaseService:
         record = self._file_records[record_id]
         
         # Remove from tarball index
-        if record.tarball_id in self._files_by_tarball:
-            if record_id in self._files_by_tarball[record.tarball_id]:
-                self._files_by_tarball[record.tarball_id].remove(record_id)
+        self._files_by_tarball.get(record.tarball_id, {}).pop(record_id, None)
+        self._files_by_checksum.get(record.checksum, {}).pop(record_id, None)
         
         # Remove from hostname index
-        tarball = self.get_tarball_record(record.tarball_id)
-        if tarball and tarball.hostname in self._files_by_hostname:
-            if record_id in self._files_by_hostname[tarball.hostname]:
-                self._files_by_hostname[tarball.hostname].remove(record_id)
+        tarball = self._tarball_records.get(record.tarball_id)
+        if tarball:
+            self._files_by_hostname.get(tarball.hostname, {}).pop(record_id, None)
         
         # Delete the record
         del self._file_records[record_id]
@@ -226,19 +277,58 @@ class DatabaseService:
     def save_duplicate_group(self, group: DuplicateGroup) -> DuplicateGroup:
         """Save a duplicate group to the database.
         
+        Groups are unique by checksum and hash algorithm. If a different
+        group with the same checksum and algorithm is already stored, its
+        counts are updated in place instead of storing a second group (upsert).
+        
         Args:
             group: DuplicateGroup to save
             
         Returns:
-            The saved group
+            The saved group (the existing one if it was updated)
         """
-        self._duplicate_groups[group.id] = group
+        saved = self._upsert_duplicate_group(group)
+        
+        logger.debug(f"Saved duplicate group {saved.id} for checksum {saved.checksum[:16]}...")
+        return saved
+    
+    def save_duplicate_groups(self, groups: List[DuplicateGroup]) -> List[DuplicateGroup]:
+        """Save multiple duplicate groups in a single batch.
         
-        # Update checksum index
-        self._duplicates_by_checksum[group.checksum] = group.id
+        Args:
+            groups: List of DuplicateGroup objects to save
+            
+        Returns:
+            List of saved groups
+        """
+        saved_groups = [self._upsert_duplicate_group(group) for group in groups]
         
-        logger.debug(f"Saved duplicate group {group.id} for checksum {group.checksum[:16]}...")
-        return group
+        logger.info(f"Saved {len(saved_groups)} duplicate groups")
+        return saved_groups
+    
+    def _upsert_duplicate_group(self, group: DuplicateGroup) -> DuplicateGroup:
+        """Insert a group, or update the stored group with the same checksum and algorithm."""
+        key = (group.hash_algorithm, group.checksum)
+        existing_id = self._duplicates_by_checksum.get(key)
+        existing = self._duplicate_groups.get(existing_id) if existing_id else None
+        
+        if existing is None or existing is group:
+            self._duplicate_groups[group.id] = group
+            self._duplicates_by_checksum[key] = group.id
+            self._duplicate_algorithms[group.hash_algorithm] = None
+            saved = group
+        else:
+            # Counts from the service are cumulative, so the incoming values
+            # replace the stored ones rather than being added to them
+            existing.file_count = group.file_count
+            existing.total_size_saved = group.total_size_saved
+            existing.last_seen_at = group.last_seen_at
+            existing.updated_at = group.updated_at
+            saved = existing
+        
+        if saved.file_count > 1:
+            self._multi_file_groups[saved.id] = None
+        return saved
     
     def get_duplicate_group(self, group_id: str) -> Optional[DuplicateGroup]:
         """Get a duplicate group by ID.
@@ -251,28 +341,42 @@ class DatabaseService:
         """
         return self._duplicate_groups.get(group_id)
     
-    def get_duplicate_group_by_checksum(self, checksum: str) -> Optional[DuplicateGroup]:
+    def get_duplicate_group_by_checksum(self, checksum: str,
+                                        hash_algorithm: Optional[str] = None) -> Optional[DuplicateGroup]:
         """Get a duplicate group by checksum.
         
         Args:
             checksum: Checksum to search for
+            hash_algorithm: Algorithm the checksum was made with (the first
+                stored algorithm with a matching group if not given)
             
         Returns:
             DuplicateGroup or None if not found
         """
-        group_id = self._duplicates_by_checksum.get(checksum)
-        if group_id:
-            return self._duplicate_groups.get(group_id)
+        if hash_algorithm:
+            algorithms = [hash_algorithm.lower()]
+        else:
+            algorithms = self._duplicate_algorithms
+        
+        for algorithm in algorithms:
+            group_id = self._duplicates_by_checksum.get((algorithm, checksum))
+            if group_id:
+                return self._duplicate_groups.get(group_id)
         return None
     
     def get_duplicate_files(self) -> List[DuplicateGroup]:
         """Get all duplicate groups with more than one file.
         
+        Only groups that had more than one file when last saved are
+        checked, so callers that change file_count should save the group
+        again (as the CLI does after each tarball).
+        
         Returns:
             List of DuplicateGroup objects representing duplicates
         """
-        return [group for group in self._duplicate_groups.values() 
-               if group.file_count > 1]
+        groups = self._duplicate_groups
+        return [groups[group_id] for group_id in self._multi_file_groups
+                if groups[group_id].file_count > 1]
     
     def get_all_duplicate_groups(self) -> List[DuplicateGroup]:
         """Get all duplicate groups.
@@ -296,9 +400,11 @@ class DatabaseService:
         
         group = self._duplicate_groups[group_id]
         
-        # Remove from checksum index
-        if group.checksum in self._duplicates_by_checksum:
-            del self._duplicates_by_checksum[group.checksum]
+        # Remove from checksum and duplicate indexes
+        key = (group.hash_algorithm, group.checksum)
+        if self._duplicates_by_checksum.get(key) == group_id:
+            del self._duplicates_by_checksum[key]
+        self._multi_file_groups.pop(group_id, None)
         
         # Delete the group
         del self._duplicate_groups[group_id]
@@ -318,6 +424,11 @@ class DatabaseService:
         """
         self._processing_logs[log.id] = log
         
+        # Update tarball and level indexes
+        if log.tarball_id:
+            self._logs_by_tarball.setdefault(log.tarball_id, {})[log.id] = None
+        self._logs_by_level.setdefault(log.log_level, {})[log.id] = None
+        
         logger.debug(f"Saved processing log {log.id} with level {log.log_level}")
         return log
     
@@ -337,6 +448,9 @@ class DatabaseService:
                           level: Optional[str] = None) -> List[ProcessingLog]:
         """Get processing logs, optionally filtered.
         
+        Filters are answered from the indexes, so only matching logs are
+        sorted. Logs match a hostname through their tarball's hostname.
+        
         Args:
             hostname: Optional hostname to filter by
             level: Optional log level to filter by
@@ -344,16 +458,26 @@ class DatabaseService:
         Returns:
             List of ProcessingLog objects
         """
-        logs = list(self._processing_logs.values())
+        log_ids = None
         
         if hostname:
-            logs = [log for log in logs if log.hostname == hostname]
+            log_ids = {}
+            for tarball_id in self._tarball_by_hostname.get(hostname, ()):
+                log_ids.update(self._logs_by_tarball.get(tarball_id, {}))
         
         if level:
-            logs = [log for log in logs if log.log_level == level.upper()]
+            level_ids = self._logs_by_level.get(level.upper(), {})
+            log_ids = level_ids if log_ids is None else [
+                log_id for log_id in log_ids if log_id in level_ids
+            ]
+        
+        if log_ids is None:
+            logs = list(self._processing_logs.values())
+        else:
+            logs = [self._processing_logs[log_id] for log_id in log_ids]
         
         # Sort by timestamp (newest first)
-        logs.sort(key=lambda x: x.timestamp, reverse=True)
+        logs.sort(key=attrgetter('timestamp'), reverse=True)
         
         return logs
     
@@ -369,7 +493,12 @@ class DatabaseService:
         if log_id not in self._processing_logs:
             return False
         
-        del self._processing_logs[log_id]
+        log = self._processing_logs.pop(log_id)
+        
+        # Remove from tarball and level indexes
+        if log.tarball_id:
+            self._logs_by_tarball.get(log.tarball_id, {}).pop(log_id, None)
+        self._logs_by_level.get(log.log_level, {}).pop(log_id, None)
         
         logger.info(f"Deleted processing log {log_id}")
         return True
@@ -388,7 +517,12 @@ class DatabaseService:
         self._tarball_by_hostname.clear()
         self._files_by_tarball.clear()
         self._files_by_hostname.clear()
+        self._files_by_checksum.clear()
         self._duplicates_by_checksum.clear()
+        self._duplicate_algorithms.clear()
+        self._multi_file_groups.clear()
+        self._logs_by_tarball.clear()
+        self._logs_by_level.clear()
         
         logger.warning("Cleared all database data")
     
@@ -404,8 +538,7 @@ class DatabaseService:
             'duplicate_groups': len(self._duplicate_groups),
             'processing_logs': len(self._processing_logs),
             'unique_hostnames': len(self._tarball_by_hostname),
-            'duplicate_files': len([g for g in self._duplicate_groups.values() 
-                                  if g.file_count > 1])
+            'duplicate_files': len(self.get_duplicate_files())
         }
     
     # Batch operations
@@ -435,9 +568,9 @@ class DatabaseService:
         Returns:
             List of FileRecord objects with matching checksum
         """
-        matching_files = []
-        for file_record in self._file_records.values():
-            if file_record.checksum and file_record.checksum.lower() == checksum.lower():
-                matching_files.append(file_record)
-        
-        return matching_files
\ No newline at end of file
+        # FileRecord stores checksums in lowercase, so they are indexed as-is.
+        # The equality check skips records whose checksum changed after saving.
+        checksum = checksum.lower()
+        file_records = self._file_records
+        return [file_records[rid] for rid in self._files_by_checksum.get(checksum, ())
+                if rid in file_records and file_records[rid].checksum == checksum]
\ No newline at end of file
@@ -4,8 +4,10 @@ This module provides duplicate file detection functionality using checksums
 and manages duplicate group tracking.
 """
 
+import functools
 import logging
-from typing import List, Optional, Dict, Any, Tuple
+import re
+from typing import Iterator, List, Optional, Dict, Any, Tuple
 from collections import defaultdict
 
 from ..models.duplicate_group import DuplicateGroup
@@ -13,19 +15,69 @@ from ..models.file_record import FileRecord
 
 logger = logging.getLogger(__name__)
 
+# Checksums from HashService are already lowercase hex and need no copying
+_LOWER_HEX = re.compile(r'[0-9a-f]+').fullmatch
+
+
+@functools.lru_cache(maxsize=64)
+def _canonical_algorithm(hash_algorithm: str) -> str:
+    """Strip and lowercase an algorithm name (drawn from a small fixed set)."""
+    return hash_algorithm.strip().lower()
+
+
+def _canonical_checksum(checksum: str) -> str:
+    """Strip and lowercase a checksum unless it is already in that form."""
+    if _LOWER_HEX(checksum) is not None:
+        return checksum
+    return checksum.strip().lower()
+
 
 class DuplicateService:
     """Service for detecting and managing duplicate files."""
     
-    def __init__(self):
-        """Initialize the duplicate detection service."""
-        self._duplicate_groups: Dict[str, DuplicateGroup] = {}
-        self._checksum_to_group: Dict[str, str] = {}
+    def __init__(self, min_file_size: int = 0):
+        """Initialize the duplicate detection service.
         
+        Args:
+            min_file_size: Files smaller than this many bytes are not
+                tracked; deduplicating them can't save meaningful space
+        """
+        if min_file_size < 0:
+            raise ValueError("min_file_size cannot be negative")
+        
+        self.min_file_size = min_file_size
+        self._duplicate_groups: Dict[str, DuplicateGroup] = {}
+        # Keyed by (hash_algorithm, checksum): equal hex strings from
+        # different algorithms are different files
+        self._checksum_to_group: Dict[Tuple[str, str], str] = {}
+        # Group IDs per algorithm, as insertion-ordered sets
+        self._groups_by_algorithm: Dict[str, Dict[str, None]] = {}
+        # IDs of groups with more than one file; most groups in a typical
+        # run hold a single unique file and never enter this set
+        self._duplicate_group_ids: Dict[str, None] = {}
+        
+        # Running totals for get_duplicate_statistics(), kept up to date by
+        # every method here that adds, changes or removes a group
+        self._total_files = 0
+        self._total_size_saved = 0
+        self._duplicate_group_count = 0
+        self._duplicate_file_count = 0
+    
+    def _count_group(self, group: DuplicateGroup, sign: int) -> None:
+        """Add (sign=1) or remove (sign=-1) a group's share of the running totals."""
+        file_count = group.file_count
+        self._total_files += sign * file_count
+        self._total_size_saved += sign * group.total_size_saved
+        if file_count > 1:
+            self._duplicate_group_count += sign
+            self._duplicate_file_count += sign * file_count
+            if sign > 0:
+                self._duplicate_group_ids[group.id] = None
+    
     def process_file_for_duplicates(self, 
                                   checksum: str, 
                                   hash_algorithm: str, 
-                                  file_size: int) -> DuplicateGroup:
+                                  file_size: int) -> Optional[DuplicateGroup]:
         """Process a file for duplicate detection.
         
         Args:
@@ -34,28 +86,45 @@ class DuplicateService:
             file_size: Size of the file in bytes
             
         Returns:
-            DuplicateGroup that the file belongs to
+            DuplicateGroup that the file belongs to, or None if the file is
+            smaller than min_file_size and was not tracked
         """
-        if not checksum or not checksum.strip():
+        checksum = _canonical_checksum(checksum) if checksum else ''
+        if not checksum:
             raise ValueError("checksum cannot be empty")
         
-        if not hash_algorithm or not hash_algorithm.strip():
+        hash_algorithm = _canonical_algorithm(hash_algorithm) if hash_algorithm else ''
+        if not hash_algorithm:
             raise ValueError("hash_algorithm cannot be empty")
         
         if file_size < 0:
             raise ValueError("file_size cannot be negative")
         
-        checksum = checksum.strip().lower()
-        hash_algorithm = hash_algorithm.strip().lower()
+        if file_size < self.min_file_size:
+            return None
+        
+        return self._track_file((hash_algorithm, checksum), file_size)
+    
+    def _track_file(self, key: Tuple[str, str], file_size: int) -> DuplicateGroup:
+        """Add a validated file to its group, creating the group if needed.
         
+        Args:
+            key: Normalized (hash_algorithm, checksum) pair
+            file_size: Size of the file in bytes
+            
+        Returns:
+            DuplicateGroup that the file belongs to
+        """
         # Check if we already have a group for this checksum
-        if checksum in self._checksum_to_group:
-            group_id = self._checksum_to_group[checksum]
+        group_id = self._checksum_to_group.get(key)
+        if group_id is not None:
             group = self._duplicate_groups[group_id]
             
             # Update group statistics
+            self._count_group(group, -1)
             group.file_count += 1
-            group.total_size_saved = (group.file_count - 1) * file_size
+            group.total_size_saved = (group.file_count - 1) * group.file_size
+            self._count_group(group, 1)
             
             logger.debug(f"Added duplicate to existing group {group_id}: "
                         f"file_count={group.file_count}, "
@@ -64,44 +133,72 @@ class DuplicateService:
             return group
         
         # Create new duplicate group
+        hash_algorithm, checksum = key
         group = DuplicateGroup(
             checksum=checksum,
             hash_algorithm=hash_algorithm,
             file_count=1,
-            total_size_saved=0
+            total_size_saved=0,
+            file_size=file_size
         )
         
         # Store in our tracking dictionaries
         self._duplicate_groups[group.id] = group
-        self._checksum_to_group[checksum] = group.id
+        self._checksum_to_group[key] = group.id
+        self._groups_by_algorithm.setdefault(group.hash_algorithm, {})[group.id] = None
+        self._count_group(group, 1)
         
         logger.debug(f"Created new duplicate group {group.id} for checksum {checksum[:16]}...")
         
         return group
     
-    def find_duplicates_by_checksum(self, checksum: str) -> List[DuplicateGroup]:
+    def find_duplicates_by_checksum(self, checksum: str,
+                                    hash_algorithm: Optional[str] = None) -> List[DuplicateGroup]:
         """Find duplicate groups by checksum.
         
         Args:
             checksum: Checksum to search for
+            hash_algorithm: Only look in this algorithm's groups (all
+                algorithms seen so far if not given)
             
         Returns:
             List of DuplicateGroup objects (empty if no duplicates found)
         """
-        if not checksum or not checksum.strip():
+        checksum = _canonical_checksum(checksum) if checksum else ''
+        if not checksum:
             return []
         
-        checksum = checksum.strip().lower()
+        if hash_algorithm:
+            algorithms = [_canonical_algorithm(hash_algorithm)]
+        else:
+            algorithms = self._groups_by_algorithm
         
-        if checksum in self._checksum_to_group:
-            group_id = self._checksum_to_group[checksum]
+        duplicates = []
+        for algorithm in algorithms:
+            group_id = self._checksum_to_group.get((algorithm, checksum))
+            if group_id is None:
+                continue
             group = self._duplicate_groups[group_id]
             
             # Only return if it's actually a duplicate (more than 1 file)
             if group.file_count > 1:
-                return [group]
+                duplicates.append(group)
         
-        return []
+        return duplicates
+    
+    def iter_duplicates(self) -> Iterator[DuplicateGroup]:
+        """Iterate over duplicate groups with more than one file.
+        
+        Groups must not be added or removed while iterating.
+        
+        Yields:
+            DuplicateGroup objects with file_count > 1
+        """
+        groups = self._duplicate_groups
+        for group_id in self._duplicate_group_ids:
+            group = groups[group_id]
+            if group.file_count > 1:
+                yield group
     
     def find_all_duplicates(self) -> List[DuplicateGroup]:
         """Find all duplicate groups with more than one file.
@@ -109,38 +206,32 @@ class DuplicateService:
         Returns:
             List of DuplicateGroup objects with file_count > 1
         """
-        duplicates = []
-        for group in self._duplicate_groups.values():
-            if group.file_count > 1:
-                duplicates.append(group)
-        
-        return duplicates
+        return list(self.iter_duplicates())
     
     def get_duplicate_statistics(self) -> Dict[str, Any]:
         """Get statistics about detected duplicates.
         
+        Totals are maintained as groups change through this service, so
+        this is O(1). Changes made directly on returned group objects are
+        not reflected.
+        
         Returns:
             Dictionary with duplicate statistics
         """
         total_groups = len(self._duplicate_groups)
-        duplicate_groups = len([g for g in self._duplicate_groups.values() 
-                              if g.file_count > 1])
-        total_files = sum(g.file_count for g in self._duplicate_groups.values())
-        total_size_saved = sum(g.total_size_saved for g in self._duplicate_groups.values())
+        duplicate_groups = self._duplicate_group_count
         
         # Calculate average duplicates per group
         avg_duplicates = 0
         if duplicate_groups > 0:
-            duplicate_files = sum(g.file_count for g in self._duplicate_groups.values() 
-                                if g.file_count > 1)
-            avg_duplicates = duplicate_files / duplicate_groups
+            avg_duplicates = self._duplicate_file_count / duplicate_groups
         
         return {
             'total_groups': total_groups,
             'duplicate_groups': duplicate_groups,
             'unique_groups': total_groups - duplicate_groups,
-            'total_files_processed': total_files,
-            'total_size_saved_bytes': total_size_saved,
+            'total_files_processed': self._total_files,
+            'total_size_saved_bytes': self._total_size_saved,
             'average_duplicates_per_group': round(avg_duplicates, 2)
         }
     
@@ -151,26 +242,34 @@ class DuplicateService:
             file_records: List of FileRecord objects to process
             
         Returns:
-            List of DuplicateGroup objects that were updated
+            List of DuplicateGroup objects that were updated, in the order
+            they were first updated
         """
-        updated_groups = []
+        # Keyed by group ID: a list membership test here would compare
+        # groups with DuplicateGroup.__eq__ and make large batches quadratic
+        updated_groups: Dict[str, DuplicateGroup] = {}
+        
+        # FileRecord validated and normalized these fields when it was
+        # built, so skip the per-call checks in process_file_for_duplicates
+        track_file = self._track_file
+        min_file_size = self.min_file_size
         
         for file_record in file_records:
-            if not file_record.checksum:
+            checksum = file_record.checksum
+            if not checksum:
                 logger.warning(f"Skipping file record {file_record.id} - no checksum")
                 continue
             
-            group = self.process_file_for_duplicates(
-                checksum=file_record.checksum,
-                hash_algorithm=file_record.hash_algorithm,
-                file_size=file_record.file_size
-            )
+            file_size = file_record.file_size
+            if file_size < min_file_size:
+                continue
+            
+            group = track_file((file_record.hash_algorithm, checksum), file_size)
             
             # Track which groups were updated
-            if group not in updated_groups:
-                updated_groups.append(group)
+            updated_groups[group.id] = group
         
-        return updated_groups
+        return list(updated_groups.values())
     
     def find_duplicates_by_algorithm(self, hash_algorithm: str) -> List[DuplicateGroup]:
         """Find duplicate groups using a specific hash algorithm.
@@ -181,18 +280,13 @@ class DuplicateService:
         Returns:
             List of DuplicateGroup objects using the specified algorithm
         """
-        if not hash_algorithm or not hash_algorithm.strip():
+        hash_algorithm = _canonical_algorithm(hash_algorithm) if hash_algorithm else ''
+        if not hash_algorithm:
             return []
+        groups = self._duplicate_groups
         
-        hash_algorithm = hash_algorithm.strip().lower()
-        duplicates = []
-        
-        for group in self._duplicate_groups.values():
-            if (group.hash_algorithm == hash_algorithm and 
-                group.file_count > 1):
-                duplicates.append(group)
-        
-        return duplicates
+        return [groups[group_id] for group_id in self._groups_by_algorithm.get(hash_algorithm, ())
+                if groups[group_id].file_count > 1]
     
     def mark_group_processed(self, group_id: str) -> bool:
         """Mark a duplicate group as processed.
@@ -227,12 +321,17 @@ class DuplicateService:
         
         group = self._duplicate_groups[group_id]
         
-        # Remove from checksum mapping
-        if group.checksum in self._checksum_to_group:
-            del self._checksum_to_group[group.checksum]
+        # Remove from checksum mapping, unless it points at another group
+        # with the same checksum (e.g. the target of merge_groups)
+        key = (group.hash_algorithm, group.checksum)
+        if self._checksum_to_group.get(key) == group_id:
+            del self._checksum_to_group[key]
         
         # Remove from groups
         del self._duplicate_groups[group_id]
+        self._groups_by_algorithm.get(group.hash_algorithm, {}).pop(group_id, None)
+        self._duplicate_group_ids.pop(group_id, None)
+        self._count_group(group, -1)
         
         logger.info(f"Removed duplicate group {group_id}")
         return True
@@ -252,6 +351,12 @@ class DuplicateService:
         """Clear all duplicate groups and reset tracking."""
         self._duplicate_groups.clear()
         self._checksum_to_group.clear()
+        self._groups_by_algorithm.clear()
+        self._duplicate_group_ids.clear()
+        self._total_files = 0
+        self._total_size_saved = 0
+        self._duplicate_group_count = 0
+        self._duplicate_file_count = 0
         logger.info("Cleared all duplicate groups")
     
     def merge_groups(self, target_group_id: str, source_group_id: str) -> bool:
@@ -274,15 +379,18 @@ class DuplicateService:
         source_group = self._duplicate_groups[source_group_id]
         
         # Verify groups can be merged (same checksum)
-        if target_group.checksum != source_group.checksum:
+        if (target_group.checksum != source_group.checksum or
+                target_group.hash_algorithm != source_group.hash_algorithm):
             logger.error(f"Cannot merge groups with different checksums: "
-                        f"{target_group.checksum} != {source_group.checksum}")
+                        f"{target_group.hash_algorithm}:{target_group.checksum} != "
+                        f"{source_group.hash_algorithm}:{source_group.checksum}")
             return False
         
         # Merge counts
+        self._count_group(target_group, -1)
         target_group.file_count += source_group.file_count
-        target_group.total_size_saved = (target_group.file_count - 1) * \
-                                       (target_group.total_size_saved // max(target_group.file_count - source_group.file_count - 1, 1))
+        target_group.total_size_saved = (target_group.file_count - 1) * target_group.file_size
+        self._count_group(target_group, 1)
         
         # Remove source group
         self.remove_group(source_group_id)
@@ -304,20 +412,13 @@ class DuplicateService:
         """
         candidates = []
         
-        for group in self._duplicate_groups.values():
-            if group.file_count <= 1:
+        for group in self.iter_duplicates():
+            if group.file_size < min_file_size:
                 continue
             
-            # Estimate file size from total_size_saved
-            if group.file_count > 1:
-                estimated_file_size = group.total_size_saved // (group.file_count - 1)
-                
-                if estimated_file_size < min_file_size:
-                    continue
-                
-                if max_file_size is not None and estimated_file_size > max_file_size:
-                    continue
-                
-                candidates.append(group)
+            if max_file_size is not None and group.file_size > max_file_size:
+                continue
+            
+            candidates.append(group)
         
         return candidates
\ No newline at end of file
@@ -4,12 +4,35 @@ This module provides hash calculation functionality for file checksums
 supporting multiple hash algorithms.
 """
 
+import functools
 import hashlib
-from typing import BinaryIO, Optional
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, BinaryIO, Dict, List, Optional
 import logging
 
+try:
+    from blake3 import blake3
+except ImportError:  # pragma: no cover - exercised when blake3 is absent
+    blake3 = None
+
+try:
+    import xxhash
+except ImportError:  # pragma: no cover - exercised when xxhash is absent
+    xxhash = None
+
 logger = logging.getLogger(__name__)
 
+# Small payloads such as manifests and archive headers are often hashed more
+# than once; larger ones bypass the cache so it never holds big buffers
+_CACHED_BYTES_LIMIT = 4096
+
+
+@functools.lru_cache(maxsize=4096)
+def _cached_bytes_checksum(data: bytes, algorithm: str) -> str:
+    """Hash a small bytes payload, reusing the result for repeated inputs."""
+    return HashService.SUPPORTED_ALGORITHMS[algorithm](data).hexdigest()
+
 
 class HashService:
     """Service for calculating file checksums using various hash algorithms."""
@@ -21,8 +44,15 @@ class HashService:
         'sha512': hashlib.sha512
     }
     
+    # Faster hashes for dedupe-only checksums, available when installed
+    # (pip install dedupe-tarball[fast])
+    if blake3 is not None:
+        SUPPORTED_ALGORITHMS['blake3'] = blake3
+    if xxhash is not None:
+        SUPPORTED_ALGORITHMS['xxh3_128'] = xxhash.xxh3_128
+    
     DEFAULT_ALGORITHM = 'sha256'
-    CHUNK_SIZE = 8192  # 8KB chunks for efficient reading
+    CHUNK_SIZE = 1024 * 1024  # 1MB chunks keep per-read Python overhead small
     
     def __init__(self):
         """Initialize the hash service."""
@@ -39,12 +69,30 @@ class HashService:
             except Exception as e:
                 logger.warning(f"Hash algorithm {algorithm_name} not available: {e}")
     
+    def _check_algorithm(self, algorithm: str) -> str:
+        """Normalize an algorithm name, rejecting ones that aren't supported.
+        
+        Returns:
+            Lowercase algorithm name
+            
+        Raises:
+            ValueError: If algorithm is not supported
+        """
+        algorithm = algorithm.lower()
+        if algorithm not in self.SUPPORTED_ALGORITHMS:
+            raise ValueError(f"Unsupported hash algorithm: {algorithm}. "
+                           f"Supported: {', '.join(self.SUPPORTED_ALGORITHMS.keys())}")
+        return algorithm
+    
     def calculate_checksum(self, 
                           file_obj: BinaryIO, 
                           algorithm: str = DEFAULT_ALGORITHM,
                           chunk_size: Optional[int] = None) -> str:
         """Calculate checksum for a file object.
         
+        The file is read from its current position to the end and is left
+        there; callers that need to re-read it must seek back themselves.
+        
         Args:
             file_obj: File-like object to calculate checksum for
             algorithm: Hash algorithm to use (md5, sha1, sha256, sha512)
@@ -57,32 +105,10 @@ class HashService:
             ValueError: If algorithm is not supported
             IOError: If file cannot be read
         """
-        algorithm = algorithm.lower()
-        if algorithm not in self.SUPPORTED_ALGORITHMS:
-            raise ValueError(f"Unsupported hash algorithm: {algorithm}. "
-                           f"Supported: {', '.join(self.SUPPORTED_ALGORITHMS.keys())}")
-        
-        if chunk_size is None:
-            chunk_size = self.CHUNK_SIZE
+        algorithm = self._check_algorithm(algorithm)
         
         try:
-            # Create hasher
-            hasher = self.SUPPORTED_ALGORITHMS[algorithm]()
-            
-            # Remember current position
-            initial_position = file_obj.tell()
-            
-            # Read and hash file in chunks
-            while True:
-                chunk = file_obj.read(chunk_size)
-                if not chunk:
-                    break
-                hasher.update(chunk)
-            
-            # Restore file position
-            file_obj.seek(initial_position)
-            
-            checksum = hasher.hexdigest()
+            checksum = self._hash_stream(file_obj, algorithm, chunk_size).hexdigest()
             logger.debug(f"Calculated {algorithm} checksum: {checksum}")
             return checksum
             
@@ -90,6 +116,34 @@ class HashService:
             logger.error(f"Error calculating checksum: {e}")
             raise IOError(f"Failed to calculate checksum: {e}")
     
+    def create_hasher(self, algorithm: str = DEFAULT_ALGORITHM) -> Any:
+        """Create a hash object for callers that feed data in themselves.
+        
+        Args:
+            algorithm: Hash algorithm to use
+            
+        Returns:
+            New hash object with update(), digest() and hexdigest()
+            
+        Raises:
+            ValueError: If algorithm is not supported
+        """
+        algorithm = self._check_algorithm(algorithm)
+        return self.SUPPORTED_ALGORITHMS[algorithm]()
+    
+    def _hash_stream(self, file_obj: BinaryIO, algorithm: str, chunk_size: Optional[int]):
+        """Feed a file object to a new hasher from its position to the end.
+        
+        Large chunks let OpenSSL hash each one with the GIL released.
+        """
+        hasher = self.SUPPORTED_ALGORITHMS[algorithm]()
+        read = file_obj.read
+        update = hasher.update
+        chunk_size = chunk_size or self.CHUNK_SIZE
+        while chunk := read(chunk_size):
+            update(chunk)
+        return hasher
+    
     def calculate_file_checksum(self, 
                                file_path: str, 
                                algorithm: str = DEFAULT_ALGORITHM,
@@ -104,13 +158,24 @@ class HashService:
         Returns:
             Hexadecimal string representation of the checksum
             
+        Without a chunk_size, the file is hashed by hashlib.file_digest(),
+        which runs the whole read/update loop in C.
+        
         Raises:
             ValueError: If algorithm is not supported
             FileNotFoundError: If file doesn't exist
             IOError: If file cannot be read
         """
+        algorithm = self._check_algorithm(algorithm)
+        
         try:
             with open(file_path, 'rb') as file_obj:
+                if chunk_size is None:
+                    checksum = hashlib.file_digest(
+                        file_obj, self.SUPPORTED_ALGORITHMS[algorithm]
+                    ).hexdigest()
+                    logger.debug(f"Calculated {algorithm} checksum: {checksum}")
+                    return checksum
                 return self.calculate_checksum(file_obj, algorithm, chunk_size)
         except FileNotFoundError:
             logger.error(f"File not found: {file_path}")
@@ -119,6 +184,40 @@ class HashService:
             logger.error(f"Error reading file {file_path}: {e}")
             raise IOError(f"Failed to read file {file_path}: {e}")
     
+    def calculate_file_checksums(self,
+                                 file_paths: List[str],
+                                 algorithm: str = DEFAULT_ALGORITHM,
+                                 max_workers: Optional[int] = None) -> Dict[str, str]:
+        """Calculate checksums for several files in parallel.
+        
+        hashlib releases the GIL while hashing, so a thread pool hashes
+        files concurrently on separate cores.
+        
+        Args:
+            file_paths: Paths of the files to hash
+            algorithm: Hash algorithm to use
+            max_workers: Worker thread count (defaults to the CPU count)
+            
+        Returns:
+            Dictionary mapping each path to its checksum, in input order
+            
+        Raises:
+            ValueError: If algorithm is not supported
+            FileNotFoundError: If a file doesn't exist
+            IOError: If a file cannot be read
+        """
+        algorithm = self._check_algorithm(algorithm)
+        
+        if not file_paths:
+            return {}
+        
+        workers = min(max_workers or os.cpu_count() or 1, len(file_paths))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            checksums = executor.map(
+                lambda path: self.calculate_file_checksum(path, algorithm), file_paths
+            )
+            return dict(zip(file_paths, checksums))
+    
     def calculate_bytes_checksum(self, 
                                 data: bytes, 
                                 algorithm: str = DEFAULT_ALGORITHM) -> str:
@@ -134,21 +233,50 @@ class HashService:
         Raises:
             ValueError: If algorithm is not supported
         """
-        algorithm = algorithm.lower()
-        if algorithm not in self.SUPPORTED_ALGORITHMS:
-            raise ValueError(f"Unsupported hash algorithm: {algorithm}. "
-                           f"Supported: {', '.join(self.SUPPORTED_ALGORITHMS.keys())}")
+        algorithm = self._check_algorithm(algorithm)
         
         try:
-            hasher = self.SUPPORTED_ALGORITHMS[algorithm]()
-            hasher.update(data)
-            checksum = hasher.hexdigest()
+            if type(data) is bytes and len(data) <= _CACHED_BYTES_LIMIT:
+                checksum = _cached_bytes_checksum(data, algorithm)
+            else:
+                hasher = self.SUPPORTED_ALGORITHMS[algorithm]()
+                hasher.update(data)
+                checksum = hasher.hexdigest()
             logger.debug(f"Calculated {algorithm} checksum for {len(data)} bytes: {checksum}")
             return checksum
         except Exception as e:
             logger.error(f"Error calculating checksum for bytes: {e}")
             raise
     
+    def calculate_digest(self,
+                         file_obj: BinaryIO,
+                         algorithm: str = DEFAULT_ALGORITHM,
+                         chunk_size: Optional[int] = None) -> bytes:
+        """Calculate the raw digest for a file object.
+        
+        Like calculate_checksum(), but returns the digest bytes (half the
+        size of the hex form) for callers that key large indexes by it.
+        
+        Args:
+            file_obj: File-like object to hash, read to the end
+            algorithm: Hash algorithm to use
+            chunk_size: Size of chunks to read (defaults to CHUNK_SIZE)
+            
+        Returns:
+            Digest bytes
+            
+        Raises:
+            ValueError: If algorithm is not supported
+            IOError: If file cannot be read
+        """
+        algorithm = self._check_algorithm(algorithm)
+        
+        try:
+            return self._hash_stream(file_obj, algorithm, chunk_size).digest()
+        except Exception as e:
+            logger.error(f"Error calculating digest: {e}")
+            raise IOError(f"Failed to calculate digest: {e}")
+    
     def verify_checksum(self, 
                        file_obj: BinaryIO, 
                        expected_checksum: str, 
@@ -209,9 +337,7 @@ class HashService:
         Raises:
             ValueError: If algorithm is not supported
         """
-        algorithm = algorithm.lower()
-        if algorithm not in self.SUPPORTED_ALGORITHMS:
-            raise ValueError(f"Unsupported hash algorithm: {algorithm}")
+        algorithm = self._check_algorithm(algorithm)
         
         # Calculate expected digest size
         hasher = self.SUPPORTED_ALGORITHMS[algorithm]()
@@ -4,10 +4,18 @@ This module provides tarball processing functionality including extraction,
 file analysis, and metadata collection.
 """
 
+import contextlib
+import functools
+import io
+import mmap
+import shutil
 import tarfile
 import os
 import tempfile
-from typing import List, Optional, Dict, Any, BinaryIO
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import List, Optional, Dict, Any, BinaryIO, Deque, Iterator, Tuple
 from pathlib import Path
 import logging
 from datetime import datetime, timezone
@@ -16,19 +24,241 @@ from ..models.tarball_record import TarballRecord, TarballStatus
 from ..models.file_record import FileRecord
 from .hash_service import HashService
 
+# Faster gzip decompression, when installed (pip install dedupe-tarball[fast])
+try:
+    from isal import igzip as _fast_gzip
+except ImportError:  # pragma: no cover - exercised when isal is absent
+    try:
+        from zlib_ng import gzip_ng as _fast_gzip
+    except ImportError:  # pragma: no cover - exercised when zlib-ng is absent
+        _fast_gzip = None
+
 logger = logging.getLogger(__name__)
 
+# Archives are read through a large buffer; the decompressors and the tar
+# parser otherwise issue one small read() syscall after another
+_READ_BUFFER_SIZE = 1024 * 1024
+
+_GZIP_MAGIC = b'\x1f\x8b'
+# gzip, bzip2 and xz
+_COMPRESSED_MAGIC = (_GZIP_MAGIC, b'BZh', b'\xfd7zXZ\x00')
+
+
+# Members of one tarball usually share a handful of mtimes, so their
+# timestamps are built once and shared
+@functools.lru_cache(maxsize=1024)
+def _member_timestamp(mtime: float) -> datetime:
+    """Convert a member's mtime to a UTC datetime."""
+    return datetime.fromtimestamp(mtime, tz=timezone.utc)
+
+
+# Tarballs whose member index extract_file_to_temp keeps; the oldest is
+# dropped beyond this
+_MEMBER_INDEX_MAX_TARBALLS = 16
+
+# Larger members are hashed as a stream instead of read into memory for the
+# hashing thread pool
+_PARALLEL_HASH_MAX_SIZE = 16 * 1024 * 1024
+
+
+@contextlib.contextmanager
+def _open_tarball(file_path: str) -> Iterator[tarfile.TarFile]:
+    """Open a tarball of any supported compression for reading.
+    
+    Args:
+        file_path: Path to the tarball file
+        
+    Yields:
+        Open TarFile, closed along with the underlying file on exit
+    """
+    with open(file_path, 'rb', buffering=_READ_BUFFER_SIZE) as file_obj:
+        if _fast_gzip is None or file_obj.peek(2)[:2] != _GZIP_MAGIC:
+            with tarfile.open(fileobj=file_obj, mode='r:*') as tar:
+                yield tar
+            return
+        
+        with _fast_gzip.GzipFile(fileobj=file_obj, mode='rb') as gzip_file:
+            try:
+                tar = tarfile.open(fileobj=gzip_file, mode='r:')
+            except (OSError, EOFError) as e:
+                # Match the error tarfile's own gzip support raises
+                raise tarfile.ReadError(f"not a gzip file: {e}") from e
+            with tar:
+                yield tar
+
+
+def _sendfile_member(tar: tarfile.TarFile, member: tarfile.TarInfo, out_file: BinaryIO) -> bool:
+    """Copy a member's data to a file inside the kernel, if the archive allows.
+    
+    Only an uncompressed archive stores member data as a plain byte range
+    of the file; compressed archives and sparse members need tarfile to
+    decode them.
+    
+    Args:
+        tar: Open tarball
+        member: Regular file member to copy
+        out_file: Destination file, still empty
+        
+    Returns:
+        True if the data was copied, False if the caller must copy it
+        
+    Raises:
+        tarfile.ReadError: If the archive ends before the member's data
+    """
+    source = tar.fileobj
+    if not hasattr(os, 'sendfile') or not isinstance(source, io.BufferedReader) or member.issparse():
+        return False
+    
+    in_fd = source.fileno()
+    out_fd = out_file.fileno()
+    offset = member.offset_data
+    remaining = member.size
+    while remaining:
+        try:
+            sent = os.sendfile(out_fd, in_fd, offset, remaining)
+        except OSError:
+            # e.g. a source that isn't a regular file; fall back before
+            # anything has been written
+            if remaining == member.size:
+                return False
+            raise
+        if not sent:
+            raise tarfile.ReadError(f"unexpected end of data in {member.name}")
+        offset += sent
+        remaining -= sent
+    return True
+
+
+def _tarball_size(file_path: str) -> int:
+    """Get a tarball's size with a single stat() call.
+    
+    Args:
+        file_path: Path to the tarball file
+        
+    Returns:
+        Size in bytes
+        
+    Raises:
+        FileNotFoundError: If the file doesn't exist
+    """
+    try:
+        return os.stat(file_path).st_size
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Tarball file not found: {file_path}") from None
+
+
+@contextlib.contextmanager
+def _open_tarball_headers(file_path: str) -> Iterator[tarfile.TarFile]:
+    """Open a tarball for reading member headers only, not their data.
+    
+    An uncompressed tarball is memory-mapped, so skipping over member data
+    is a seek that reads nothing; through _open_tarball's large buffer each
+    header would pull in a full buffer of file data. Compressed tarballs
+    must be decompressed in full either way and go through _open_tarball.
+    
+    Args:
+        file_path: Path to the tarball file
+        
+    Yields:
+        Open TarFile, closed along with the underlying file on exit
+    """
+    with open(file_path, 'rb') as file_obj:
+        head = file_obj.read(6)
+        if not head or head.startswith(_COMPRESSED_MAGIC):
+            mapped = None
+        else:
+            mapped = mmap.mmap(file_obj.fileno(), 0, access=mmap.ACCESS_READ)
+    
+    if mapped is None:
+        with _open_tarball(file_path) as tar:
+            yield tar
+        return
+    
+    with mapped:
+        try:
+            with tarfile.open(fileobj=mapped, mode='r:') as tar:
+                yield tar
+        except ValueError as e:
+            # A truncated tarball makes tarfile seek past the end of the
+            # map, which mmap refuses; match the error a plain file gives
+            raise tarfile.ReadError("unexpected end of data") from e
+
+
+def _iter_members(tar: tarfile.TarFile) -> Iterator[tarfile.TarInfo]:
+    """Yield the members of an open tarball in a single pass.
+    
+    Args:
+        tar: Open tarball
+        
+    Yields:
+        TarInfo for each member, in archive order
+    """
+    while (member := tar.next()) is not None:
+        # TarFile appends every member it reads to tar.members; drop them
+        # so memory stays flat however many entries there are
+        tar.members.clear()
+        yield member
+
+
+def _iter_file_members(tar: tarfile.TarFile) -> Iterator[tarfile.TarInfo]:
+    """Yield the regular files of an open tarball in a single pass.
+    
+    Args:
+        tar: Open tarball
+        
+    Yields:
+        TarInfo for each regular file, skipping directories and links
+    """
+    for member in _iter_members(tar):
+        if member.isfile():
+            yield member
+
+
+def process_tarball_in_worker(file_path: str,
+                              hostname: str,
+                              hash_algorithm: str,
+                              hash_service: Optional[HashService] = None,
+                              hash_workers: int = 1) -> Tuple[TarballRecord, List[FileRecord]]:
+    """Process one tarball in a worker process.
+    
+    Shared by process_tarballs() and the CLI's --jobs option. It builds its
+    own service, since a worker process can't use the caller's; the
+    caller's settings are passed in to configure it.
+    
+    Args:
+        file_path: Path to the tarball file
+        hostname: Hostname where processing is occurring
+        hash_algorithm: Hash algorithm to use for checksums
+        hash_service: Hash service to use (a copy arrives in the worker)
+        hash_workers: Threads used to hash the files of the tarball
+    
+    Returns:
+        Tuple of (TarballRecord, list of FileRecord)
+    """
+    service = TarballService(hash_service, hash_workers)
+    tarball_record = service.create_tarball_record(file_path, hostname)
+    file_records = list(service.iter_tarball_files(file_path, tarball_record, hash_algorithm))
+    return tarball_record, file_records
+
 
 class TarballService:
     """Service for processing tarball files and extracting metadata."""
     
-    def __init__(self, hash_service: Optional[HashService] = None):
+    def __init__(self, hash_service: Optional[HashService] = None, hash_workers: int = 1):
         """Initialize the tarball service.
         
         Args:
             hash_service: Hash service instance (creates new one if not provided)
+            hash_workers: Threads used to hash the files of one tarball; 1
+                hashes them in the reading thread
         """
+        if hash_workers < 1:
+            raise ValueError("hash_workers must be at least 1")
+        
         self.hash_service = hash_service or HashService()
+        self.hash_workers = hash_workers
+        # tarball path -> ((st_mtime_ns, st_size), {member name: TarInfo})
+        self._member_index: Dict[str, Tuple[Tuple[int, int], Dict[str, tarfile.TarInfo]]] = {}
         self._extracted_files: Dict[str, List[FileRecord]] = {}
     
     def validate_tarball(self, file_path: str) -> bool:
@@ -41,7 +271,7 @@ class TarballService:
             True if valid tarball, False otherwise
         """
         try:
-            with tarfile.open(file_path, 'r:*') as tar:
+            with _open_tarball_headers(file_path) as tar:
                 # Try to list members to validate structure
                 tar.getnames()
                 return True
@@ -62,118 +292,194 @@ class TarballService:
             tarfile.TarError: If tarball is invalid
             FileNotFoundError: If file doesn't exist
         """
-        if not os.path.exists(file_path):
-            raise FileNotFoundError(f"Tarball file not found: {file_path}")
+        file_size = _tarball_size(file_path)
         
         try:
-            file_size = os.path.getsize(file_path)
+            # Count files vs directories and the total uncompressed size
+            # in one pass, without holding on to the member list
+            member_count = file_count = directory_count = total_size = 0
+            with _open_tarball_headers(file_path) as tar:
+                for member in _iter_members(tar):
+                    member_count += 1
+                    if member.isfile():
+                        file_count += 1
+                        total_size += member.size
+                    elif member.isdir():
+                        directory_count += 1
             
-            with tarfile.open(file_path, 'r:*') as tar:
-                members = tar.getmembers()
-                
-                # Count files vs directories
-                files = [m for m in members if m.isfile()]
-                directories = [m for m in members if m.isdir()]
-                
-                # Calculate total uncompressed size
-                total_size = sum(m.size for m in files)
-                
-                return {
-                    'file_path': file_path,
-                    'file_size': file_size,
-                    'total_files': len(files),
-                    'total_directories': len(directories),
-                    'total_uncompressed_size': total_size,
-                    'compression_ratio': (file_size / total_size) if total_size > 0 else 0,
-                    'members': len(members)
-                }
+            return {
+                'file_path': file_path,
+                'file_size': file_size,
+                'total_files': file_count,
+                'total_directories': directory_count,
+                'total_uncompressed_size': total_size,
+                'compression_ratio': (file_size / total_size) if total_size > 0 else 0,
+                'members': member_count
+            }
                 
         except tarfile.TarError as e:
             logger.error(f"Error reading tarball {file_path}: {e}")
             raise
     
-    def process_tarball(self, 
-                       file_path: str, 
-                       hostname: str,
-                       hash_algorithm: str = 'sha256') -> TarballRecord:
-        """Process a tarball file and extract metadata.
+    def create_tarball_record(self, file_path: str, hostname: str) -> TarballRecord:
+        """Create the in-progress record for a tarball before its files are read.
         
         Args:
             file_path: Path to the tarball file
             hostname: Hostname where processing is occurring
-            hash_algorithm: Hash algorithm to use for checksums
             
         Returns:
-            TarballRecord with processing results
+            TarballRecord with PROCESSING status
             
         Raises:
             FileNotFoundError: If tarball file doesn't exist
-            tarfile.TarError: If tarball is invalid
+            ValueError: If hostname is empty
         """
-        start_time = datetime.now(timezone.utc)
-        
-        # Validate inputs
-        if not os.path.exists(file_path):
-            raise FileNotFoundError(f"Tarball file not found: {file_path}")
+        file_size = _tarball_size(file_path)
         
         if not hostname or not hostname.strip():
             raise ValueError("hostname cannot be empty")
         
+        return TarballRecord(
+            filename=os.path.basename(file_path),
+            hostname=hostname.strip(),
+            file_size=file_size,
+            status=TarballStatus.PROCESSING
+        )
+    
+    def iter_tarball_files(self, 
+                           file_path: str, 
+                           tarball_record: TarballRecord,
+                           hash_algorithm: str = HashService.DEFAULT_ALGORITHM) -> Iterator[FileRecord]:
+        """Stream FileRecords for a tarball as its members are read.
+        
+        Nothing is retained once a record has been yielded, so memory use stays
+        bounded regardless of how many files the tarball holds. When the stream
+        is exhausted the tarball record is marked SUCCESS with its file count
+        and processing duration; on error it is marked FAILED.
+        
+        Args:
+            file_path: Path to the tarball file
+            tarball_record: Record created by create_tarball_record
+            hash_algorithm: Hash algorithm to use for checksums
+            
+        Yields:
+            FileRecord for each regular file in the tarball
+            
+        Raises:
+            ValueError: If hash_algorithm is not supported
+            tarfile.TarError: If tarball is invalid
+        """
+        start = time.monotonic()
+        file_count = 0
+        
         logger.info(f"Starting tarball processing: {file_path}")
         
         try:
-            # Get basic file info
-            file_size = os.path.getsize(file_path)
-            filename = os.path.basename(file_path)
-            
-            # Create tarball record
-            tarball_record = TarballRecord(
-                filename=filename,
-                hostname=hostname.strip(),
-                file_size=file_size,
-                status=TarballStatus.PROCESSING
-            )
+            # Raises ValueError for an unsupported algorithm here, once, rather
+            # than failing (and being skipped) for every member
+            self.hash_service.create_hasher(hash_algorithm)
             
-            # Extract and process files
-            file_records = self._extract_and_analyze_files(
+            for file_record in self._iter_analyzed_files(
                 file_path, tarball_record.id, hash_algorithm
-            )
-            
-            # Update tarball record with results
-            tarball_record.total_files_count = len(file_records)
-            tarball_record.status = TarballStatus.SUCCESS
-            
-            # Calculate processing duration
-            end_time = datetime.now(timezone.utc)
-            duration = (end_time - start_time).total_seconds()
-            tarball_record.set_processing_duration(int(duration))
-            
-            # Store extracted files for retrieval
-            self._extracted_files[tarball_record.id] = file_records
-            
-            logger.info(f"Successfully processed tarball: {file_path}, "
-                       f"files: {len(file_records)}, duration: {duration:.2f}s")
-            
-            return tarball_record
-            
+            ):
+                file_count += 1
+                yield file_record
         except Exception as e:
             logger.error(f"Error processing tarball {file_path}: {e}")
-            
-            # Create failed record
-            tarball_record = TarballRecord(
-                filename=os.path.basename(file_path),
-                hostname=hostname.strip(),
-                file_size=file_size if 'file_size' in locals() else 0,
-                status=TarballStatus.FAILED,
-                error_message=str(e)
-            )
-            
+            tarball_record.status = TarballStatus.FAILED
+            tarball_record.error_message = str(e)
+            raise
+        finally:
             # Calculate processing duration even for failures
-            end_time = datetime.now(timezone.utc)
-            duration = (end_time - start_time).total_seconds()
+            duration = time.monotonic() - start
             tarball_record.set_processing_duration(int(duration))
+        
+        # Update tarball record with results
+        tarball_record.total_files_count = file_count
+        tarball_record.status = TarballStatus.SUCCESS
+        
+        logger.info(f"Successfully processed tarball: {file_path}, "
+                   f"files: {file_count}, duration: {duration:.2f}s")
+    
+    def process_tarball(self, 
+                       file_path: str, 
+                       hostname: str,
+                       hash_algorithm: str = HashService.DEFAULT_ALGORITHM) -> TarballRecord:
+        """Process a tarball file and extract metadata.
+        
+        The resulting file records are kept in memory until
+        clear_extracted_files is called; use iter_tarball_files to stream them
+        instead.
+        
+        Args:
+            file_path: Path to the tarball file
+            hostname: Hostname where processing is occurring
+            hash_algorithm: Hash algorithm to use for checksums
             
-            raise
+        Returns:
+            TarballRecord with processing results
+            
+        Raises:
+            FileNotFoundError: If tarball file doesn't exist
+            ValueError: If hash_algorithm is not supported
+            tarfile.TarError: If tarball is invalid
+        """
+        tarball_record = self.create_tarball_record(file_path, hostname)
+        
+        file_records = list(self.iter_tarball_files(file_path, tarball_record, hash_algorithm))
+        
+        # Store extracted files for retrieval
+        self._extracted_files[tarball_record.id] = file_records
+        
+        return tarball_record
+    
+    def process_tarballs(self,
+                         file_paths: List[str],
+                         hostname: str,
+                         hash_algorithm: str = HashService.DEFAULT_ALGORITHM,
+                         workers: Optional[int] = None) -> List[TarballRecord]:
+        """Process several tarballs, each in its own worker process.
+        
+        Decompression and hashing hold the GIL for much of their time, so
+        separate processes are what lets tarballs be read on separate cores.
+        Results are the same as calling process_tarball for each path,
+        including the file records kept for get_extracted_files. Each
+        worker uses a copy of this service's hash_service and its
+        hash_workers setting, so the hash_service must be picklable.
+        
+        Args:
+            file_paths: Paths to the tarball files
+            hostname: Hostname where processing is occurring
+            hash_algorithm: Hash algorithm to use for checksums
+            workers: Worker process count (defaults to the CPU count)
+            
+        Returns:
+            TarballRecords in the order of file_paths
+            
+        Raises:
+            FileNotFoundError: If a tarball file doesn't exist
+            tarfile.TarError: If a tarball is invalid
+        """
+        workers = min(workers or os.cpu_count() or 1, len(file_paths))
+        if workers <= 1:
+            return [self.process_tarball(path, hostname, hash_algorithm) for path in file_paths]
+        
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(
+                process_tarball_in_worker,
+                file_paths,
+                [hostname] * len(file_paths),
+                [hash_algorithm] * len(file_paths),
+                [self.hash_service] * len(file_paths),
+                [self.hash_workers] * len(file_paths)
+            ))
+        
+        tarball_records = []
+        for tarball_record, file_records in results:
+            self._extracted_files[tarball_record.id] = file_records
+            tarball_records.append(tarball_record)
+        return tarball_records
     
     def _extract_and_analyze_files(self, 
                                  tarball_path: str, 
@@ -189,45 +495,44 @@ class TarballService:
         Returns:
             List of FileRecord objects
         """
-        file_records = []
+        return list(self._iter_analyzed_files(tarball_path, tarball_id, hash_algorithm))
+    
+    def _iter_analyzed_files(self, 
+                             tarball_path: str, 
+                             tarball_id: str,
+                             hash_algorithm: str) -> Iterator[FileRecord]:
+        """Extract files from tarball and analyze them one at a time.
         
-        with tarfile.open(tarball_path, 'r:*') as tar:
-            for member in tar.getmembers():
-                # Skip directories, links, and other non-regular files
-                if not member.isfile():
-                    continue
-                
+        Members are read in a single pass as they stream out of the archive,
+        and aren't retained once processed.
+        
+        Args:
+            tarball_path: Path to the tarball
+            tarball_id: ID of the tarball record
+            hash_algorithm: Hash algorithm to use
+            
+        Yields:
+            FileRecord objects
+        """
+        make_record = FileRecord.record_factory(tarball_id, hash_algorithm)
+        
+        with _open_tarball(tarball_path) as tar:
+            if self.hash_workers > 1:
+                hashed_members = self._hash_members_parallel(tar, hash_algorithm)
+            else:
+                hashed_members = self._hash_members(tar, hash_algorithm)
+            
+            for member, checksum in hashed_members:
                 try:
-                    # Extract file content
-                    file_obj = tar.extractfile(member)
-                    if file_obj is None:
-                        logger.warning(f"Could not extract file: {member.name}")
-                        continue
-                    
-                    # Calculate checksum
-                    checksum = self.hash_service.calculate_checksum(
-                        file_obj, hash_algorithm
-                    )
-                    
                     # Get file timestamp (use member modification time if available)
-                    file_timestamp = None
-                    if hasattr(member, 'mtime') and member.mtime:
-                        file_timestamp = datetime.fromtimestamp(
-                            member.mtime, tz=timezone.utc
-                        )
+                    mtime = member.mtime
+                    file_timestamp = _member_timestamp(mtime) if mtime else None
                     
                     # Create file record
-                    file_record = FileRecord(
-                        tarball_id=tarball_id,
-                        filename=member.name,
-                        file_size=member.size,
-                        checksum=checksum,
-                        hash_algorithm=hash_algorithm,
-                        file_timestamp=file_timestamp
+                    file_record = make_record(
+                        member.name, member.size, checksum, file_timestamp
                     )
                     
-                    file_records.append(file_record)
-                    
                     logger.debug(f"Processed file: {member.name}, "
                                f"size: {member.size}, checksum: {checksum[:16]}...")
                     
@@ -235,8 +540,97 @@ class TarballService:
                     logger.error(f"Error processing file {member.name}: {e}")
                     # Continue processing other files
                     continue
+                
+                yield file_record
+    
+    def _hash_members(self,
+                      tar: tarfile.TarFile,
+                      hash_algorithm: str) -> Iterator[Tuple[tarfile.TarInfo, str]]:
+        """Hash each regular file in an open tarball, in archive order.
+        
+        Files that can't be read are logged and skipped.
+        
+        Args:
+            tar: Open tarball
+            hash_algorithm: Hash algorithm to use
+            
+        Yields:
+            (member, checksum) tuples
+        """
+        for member in _iter_file_members(tar):
+            try:
+                # Extract file content
+                file_obj = tar.extractfile(member)
+                if file_obj is None:
+                    logger.warning(f"Could not extract file: {member.name}")
+                    continue
+                
+                # Calculate checksum
+                checksum = self.hash_service.calculate_checksum(
+                    file_obj, hash_algorithm
+                )
+            except Exception as e:
+                logger.error(f"Error processing file {member.name}: {e}")
+                # Continue processing other files
+                continue
+            
+            yield member, checksum
+    
+    def _hash_members_parallel(self,
+                               tar: tarfile.TarFile,
+                               hash_algorithm: str) -> Iterator[Tuple[tarfile.TarInfo, str]]:
+        """Hash each regular file in an open tarball on a thread pool.
+        
+        tarfile isn't thread-safe, so members are still read one at a time
+        here; only the hashing, which releases the GIL, runs on the pool.
+        Members larger than _PARALLEL_HASH_MAX_SIZE are hashed in place as
+        a stream rather than held in memory. Results keep archive order.
         
-        return file_records
+        Args:
+            tar: Open tarball
+            hash_algorithm: Hash algorithm to use
+            
+        Yields:
+            (member, checksum) tuples
+        """
+        hash_service = self.hash_service
+        max_pending = 2 * self.hash_workers
+        # (member, checksum or Future) in archive order
+        pending: Deque[Tuple[tarfile.TarInfo, Any]] = deque()
+        
+        def finished() -> Iterator[Tuple[tarfile.TarInfo, str]]:
+            member, result = pending.popleft()
+            try:
+                checksum = result if isinstance(result, str) else result.result()
+            except Exception as e:
+                logger.error(f"Error processing file {member.name}: {e}")
+                return
+            yield member, checksum
+        
+        with ThreadPoolExecutor(max_workers=self.hash_workers) as executor:
+            for member in _iter_file_members(tar):
+                try:
+                    file_obj = tar.extractfile(member)
+                    if file_obj is None:
+                        logger.warning(f"Could not extract file: {member.name}")
+                        continue
+                    
+                    if member.size > _PARALLEL_HASH_MAX_SIZE:
+                        result = hash_service.calculate_checksum(file_obj, hash_algorithm)
+                    else:
+                        result = executor.submit(
+                            hash_service.calculate_bytes_checksum, file_obj.read(), hash_algorithm
+                        )
+                except Exception as e:
+                    logger.error(f"Error processing file {member.name}: {e}")
+                    continue
+                
+                pending.append((member, result))
+                while len(pending) >= max_pending:
+                    yield from finished()
+            
+            while pending:
+                yield from finished()
     
     def get_extracted_files(self, tarball_id: str) -> List[FileRecord]:
         """Get the list of extracted files for a tarball.
@@ -274,9 +668,51 @@ class TarballService:
             FileNotFoundError: If tarball or file not found
             tarfile.TarError: If extraction fails
         """
-        with tarfile.open(tarball_path, 'r:*') as tar:
+        temp_path, _ = self._extract_to_temp(tarball_path, file_path, None)
+        return temp_path
+    
+    def extract_file_to_temp_with_checksum(self,
+                                           tarball_path: str,
+                                           file_path: str,
+                                           hash_algorithm: str = HashService.DEFAULT_ALGORITHM
+                                           ) -> Tuple[str, str]:
+        """Extract a file to a temporary location and checksum it in the same pass.
+        
+        Args:
+            tarball_path: Path to the tarball
+            file_path: Path of file within tarball
+            hash_algorithm: Hash algorithm to use
+            
+        Returns:
+            Tuple of (path to extracted temporary file, checksum)
+            
+        Raises:
+            ValueError: If hash_algorithm is not supported
+            FileNotFoundError: If tarball or file not found
+            tarfile.TarError: If extraction fails
+        """
+        hasher = self.hash_service.create_hasher(hash_algorithm)
+        return self._extract_to_temp(tarball_path, file_path, hasher)
+    
+    def _extract_to_temp(self,
+                         tarball_path: str,
+                         file_path: str,
+                         hasher: Any) -> Tuple[str, Optional[str]]:
+        """Extract a file to a temporary location, optionally hashing it as it's copied.
+        
+        Args:
+            tarball_path: Path to the tarball
+            file_path: Path of file within tarball
+            hasher: Hash object fed the file's contents, or None
+            
+        Returns:
+            Tuple of (path to extracted temporary file, hex digest or None)
+        """
+        member_index = self._get_member_index(tarball_path)
+        
+        with _open_tarball(tarball_path) as tar:
             try:
-                member = tar.getmember(file_path)
+                member = member_index[file_path.rstrip('/')]
                 if not member.isfile():
                     raise ValueError(f"Not a regular file: {file_path}")
                 
@@ -289,8 +725,20 @@ class TarballService:
                 temp_fd, temp_path = tempfile.mkstemp()
                 try:
                     with os.fdopen(temp_fd, 'wb') as temp_file:
-                        temp_file.write(file_obj.read())
-                    return temp_path
+                        # Copy in bounded chunks; members can be far larger
+                        # than memory
+                        if hasher is not None:
+                            read = file_obj.read
+                            write = temp_file.write
+                            update = hasher.update
+                            while chunk := read(_READ_BUFFER_SIZE):
+                                write(chunk)
+                                update(chunk)
+                            return temp_path, hasher.hexdigest()
+                        
+                        if not _sendfile_member(tar, member, temp_file):
+                            shutil.copyfileobj(file_obj, temp_file, _READ_BUFFER_SIZE)
+                    return temp_path, None
                 except:
                     # Clean up on error
                     os.unlink(temp_path)
@@ -299,6 +747,38 @@ class TarballService:
             except KeyError:
                 raise FileNotFoundError(f"File not found in tarball: {file_path}")
     
+    def _get_member_index(self, tarball_path: str) -> Dict[str, tarfile.TarInfo]:
+        """Get a tarball's members by name, reading the archive only when needed.
+        
+        The index is rebuilt if the file's mtime or size has changed since
+        it was built. Like TarFile.getmember(), a name that occurs more than
+        once maps to its last occurrence.
+        
+        Args:
+            tarball_path: Path to the tarball
+            
+        Returns:
+            Dictionary mapping member name to TarInfo
+            
+        Raises:
+            FileNotFoundError: If the tarball doesn't exist
+        """
+        stat = os.stat(tarball_path)
+        version = (stat.st_mtime_ns, stat.st_size)
+        
+        cached = self._member_index.get(tarball_path)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        
+        with _open_tarball_headers(tarball_path) as tar:
+            members = {member.name: member for member in _iter_members(tar)}
+        
+        self._member_index.pop(tarball_path, None)
+        if len(self._member_index) >= _MEMBER_INDEX_MAX_TARBALLS:
+            del self._member_index[next(iter(self._member_index))]
+        self._member_index[tarball_path] = (version, members)
+        return members
+    
     def list_files(self, tarball_path: str) -> List[Dict[str, Any]]:
         """List all files in a tarball with their metadata.
         
@@ -310,7 +790,7 @@ class TarballService:
         """
         files = []
         
-        with tarfile.open(tarball_path, 'r:*') as tar:
+        with _open_tarball_headers(tarball_path) as tar:
             for member in tar.getmembers():
                 if member.isfile():
                     files.append({
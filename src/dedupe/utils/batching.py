@@ -0,0 +1,34 @@
+"""Batching helpers for dedupe-tarball.
+
+This module provides helpers for splitting record streams into
+fixed-size batches so large tarballs can be processed in bounded memory.
+"""
+
+from itertools import islice
+from typing import Iterable, Iterator, List, TypeVar
+
+T = TypeVar('T')
+
+
+def chunked(iterable: Iterable[T], size: int) -> Iterator[List[T]]:
+    """Split an iterable into lists of at most ``size`` items.
+    
+    Args:
+        iterable: Items to batch
+        size: Maximum number of items per batch
+        
+    Yields:
+        Lists of up to ``size`` items, in input order
+        
+    Raises:
+        ValueError: If size is not positive
+    """
+    if size <= 0:
+        raise ValueError("size must be positive")
+    
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
@@ -0,0 +1,76 @@
+"""Identifier generation and validation helpers."""
+
+import functools
+import os
+import uuid
+from typing import List
+
+
+@functools.lru_cache(maxsize=4096)
+def is_valid_uuid(value: str) -> bool:
+    """Check whether a string parses as a UUID.
+    
+    Results are cached: every FileRecord in a tarball carries the same
+    tarball_id, so it is only parsed once per tarball rather than once per
+    file.
+    
+    Args:
+        value: Candidate UUID string
+        
+    Returns:
+        True if value is a valid UUID
+    """
+    try:
+        uuid.UUID(value)
+    except ValueError:
+        return False
+    return True
+
+
+def uuid4_strings(count: int) -> List[str]:
+    """Generate random (version 4) UUID strings in bulk.
+    
+    Reads the randomness for all ids with one os.urandom() call instead of
+    one per id as uuid.uuid4() does, and formats the hex digits directly
+    rather than through uuid.UUID objects.
+    
+    Args:
+        count: Number of ids to generate
+        
+    Returns:
+        List of UUID strings
+    """
+    digits = os.urandom(16 * count).hex()
+    ids = []
+    for offset in range(0, 32 * count, 32):
+        h = digits[offset:offset + 32]
+        # Set the version nibble to 4 and the variant bits to 10xx (RFC 4122)
+        ids.append(f"{h[:8]}-{h[8:12]}-4{h[13:16]}-{_VARIANT_DIGITS[h[16]]}{h[17:20]}-{h[20:]}")
+    return ids
+
+
+def new_uuid4() -> str:
+    """Return a random (version 4) UUID string.
+    
+    Drop-in for str(uuid.uuid4()). Ids are generated in blocks of
+    _ID_POOL_SIZE by uuid4_strings() and handed out one at a time.
+    
+    Returns:
+        UUID string
+    """
+    try:
+        return _id_pool.pop()
+    except IndexError:
+        _id_pool.extend(uuid4_strings(_ID_POOL_SIZE))
+        return _id_pool.pop()
+
+
+_VARIANT_DIGITS = {digit: '89ab'[int(digit, 16) & 3] for digit in '0123456789abcdef'}
+
+_ID_POOL_SIZE = 256
+_id_pool: List[str] = []
+
+# A forked child (e.g. a --jobs worker) must not hand out the same ids as
+# its parent, so it starts with an empty pool.
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_id_pool.clear)
@@ -0,0 +1,41 @@
+"""JSON serialization for CLI output and model export.
+
+Uses orjson when it is installed (pip install dedupe-tarball[fast]) and
+falls back to the standard library json module otherwise.
+"""
+
+from datetime import datetime
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - exercised when orjson is absent
+    orjson = None
+
+import json
+
+
+def _default(obj: Any) -> Any:
+    """Encode types the stdlib json module doesn't handle natively."""
+    if isinstance(obj, datetime):
+        return obj.isoformat()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def dumps(obj: Any, indent: bool = False) -> str:
+    """Serialize an object to a JSON string.
+
+    datetimes are written in ISO 8601 form, as datetime.isoformat() would.
+
+    Args:
+        obj: JSON-compatible object (dicts must have string keys)
+        indent: Pretty-print with two-space indentation
+
+    Returns:
+        JSON text
+    """
+    if orjson is not None:
+        option = orjson.OPT_INDENT_2 if indent else 0
+        return orjson.dumps(obj, option=option).decode('utf-8')
+
+    return json.dumps(obj, indent=2 if indent else None, default=_default)
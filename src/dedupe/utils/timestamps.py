@@ -0,0 +1,55 @@
+"""Timestamp parsing helpers."""
+
+import functools
+from datetime import datetime
+from typing import Any, Optional
+
+# Replayed logs and groups loaded from one scan repeat the same timestamp
+# strings, and datetimes are immutable, so parsed values can be shared.
+_parse_iso = functools.lru_cache(maxsize=4096)(datetime.fromisoformat)
+
+
+def parse_timestamp(value: Any) -> Optional[datetime]:
+    """Parse a serialized timestamp field.
+    
+    datetime.fromisoformat() accepts a trailing 'Z' from Python 3.11, so
+    strings are parsed directly without rewriting the suffix first. Values
+    are checked with an exact type test since they come from to_dict() or
+    JSON, never from str subclasses.
+    
+    Args:
+        value: ISO 8601 string, datetime, or empty value
+        
+    Returns:
+        datetime, or None if value is empty
+    """
+    if not value:
+        return None
+    if type(value) is str:
+        return _parse_iso(value)
+    return value
+
+
+class LazyTimestamp:
+    """Descriptor for a timestamp that may hold an unparsed ISO 8601 string.
+    
+    The value lives in a private slot named after the attribute with a
+    leading underscore. Strings stored there (e.g. by a trusted from_dict())
+    are parsed on first read and replaced by the datetime, so records that
+    are loaded but never have the timestamp read skip the parse entirely.
+    """
+    
+    def __set_name__(self, owner: type, name: str) -> None:
+        self.storage_name = f'_{name}'
+    
+    def __get__(self, obj: Any, objtype: Optional[type] = None) -> Any:
+        if obj is None:
+            return self
+        value = getattr(obj, self.storage_name)
+        if type(value) is str:
+            value = _parse_iso(value)
+            setattr(obj, self.storage_name, value)
+        return value
+    
+    def __set__(self, obj: Any, value: Any) -> None:
+        setattr(obj, self.storage_name, value)
@@ -0,0 +1,55 @@
+"""Field validation helpers for the data models."""
+
+import re
+from typing import Any, Optional
+
+# Checksums come from hexdigest(), so nearly all are already lowercase hex
+# and can be accepted by one regex match without stripping or lowercasing.
+_LOWER_HEX = re.compile(r'[0-9a-f]+').fullmatch
+_HEX = re.compile(r'[0-9a-fA-F]+').fullmatch
+
+
+def require_text(value: Any, name: str, max_length: Optional[int] = None) -> str:
+    """Strip a required string field and check it is non-empty and short enough.
+    
+    Args:
+        value: Field value as given by the caller
+        name: Field name used in error messages
+        max_length: Maximum length after stripping, if limited
+        
+    Returns:
+        The stripped value
+        
+    Raises:
+        ValueError: If the value is missing, blank or too long
+    """
+    text = value.strip() if value else ''
+    if not text:
+        raise ValueError(f"{name} cannot be empty")
+    if max_length is not None and len(text) > max_length:
+        raise ValueError(f"{name} too long (max {max_length} characters)")
+    return text
+
+
+def require_hex(value: Any, name: str, max_length: Optional[int] = None) -> str:
+    """Validate a required hexadecimal string field such as a checksum.
+    
+    Args:
+        value: Field value as given by the caller
+        name: Field name used in error messages
+        max_length: Maximum length after stripping, if limited
+        
+    Returns:
+        The stripped value in lowercase
+        
+    Raises:
+        ValueError: If the value is missing, blank, too long or not hexadecimal
+    """
+    if (type(value) is str and _LOWER_HEX(value) is not None
+            and (max_length is None or len(value) <= max_length)):
+        return value
+    
+    text = require_text(value, name, max_length)
+    if _HEX(text) is None:
+        raise ValueError(f"{name} must be a hexadecimal string")
+    return text.lower()
@@ -15,6 +15,11 @@ from unittest.mock import patch
 class TestDryRun:
     """Test dry-run analysis functionality."""
 
+    def setup_method(self):
+        """Reset services before each test to avoid state interference."""
+        from dedupe.cli.main import reset_services
+        reset_services()
+
     def test_dry_run_analysis(self):
         """Test dry-run processing analysis."""
         # This will fail until implementation exists
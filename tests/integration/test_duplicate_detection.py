@@ -102,6 +102,73 @@ class TestDuplicateDetection:
             os.unlink(tar1_file.name)
             os.unlink(tar2_file.name)
 
+    def test_duplicate_detection_with_parallel_jobs(self):
+        """Test that --jobs hashes tarballs in workers and still finds duplicates."""
+        from dedupe.cli.main import main, get_services
+        
+        shared_content = b'Shared content hashed by separate worker processes'
+        tar_paths = []
+        
+        for index in range(2):
+            with tempfile.NamedTemporaryFile(suffix=f'_job{index}.tar.gz', delete=False) as tar_file:
+                with tarfile.open(tar_file.name, 'w:gz') as tar:
+                    info = tarfile.TarInfo(f'shared{index}.log')
+                    info.size = len(shared_content)
+                    tar.addfile(info, fileobj=io.BytesIO(shared_content))
+            tar_paths.append(tar_file.name)
+        
+        try:
+            with patch('sys.stdout', new_callable=io.StringIO) as mock_stdout:
+                result = main(['process', '--hostname', 'test-server', '--jobs', '2'] + tar_paths)
+            assert result == 0
+            assert 'Processing complete: 2 tarballs, 2 files total' in mock_stdout.getvalue()
+            
+            _, _, db_service, _ = get_services()
+            assert len(db_service.get_tarball_records(hostname='test-server')) == 2
+            
+            shared_checksum = hashlib.sha256(shared_content).hexdigest()
+            group = db_service.get_duplicate_group_by_checksum(shared_checksum)
+            assert group is not None
+            assert group.file_count == 2
+            
+        finally:
+            for tar_path in tar_paths:
+                os.unlink(tar_path)
+
+    def test_min_file_size_skips_small_duplicates(self):
+        """Test --min-file-size records small files but groups only larger ones."""
+        from dedupe.cli.main import main, get_services
+        
+        small_content = b'tiny'
+        large_content = b'Large shared content ' * 10
+        tar_paths = []
+        
+        for index in range(2):
+            with tempfile.NamedTemporaryFile(suffix=f'_min{index}.tar.gz', delete=False) as tar_file:
+                with tarfile.open(tar_file.name, 'w:gz') as tar:
+                    for name, content in [('small.log', small_content), ('large.log', large_content)]:
+                        info = tarfile.TarInfo(name)
+                        info.size = len(content)
+                        tar.addfile(info, fileobj=io.BytesIO(content))
+            tar_paths.append(tar_file.name)
+        
+        try:
+            with patch('sys.stdout', new_callable=io.StringIO) as mock_stdout:
+                result = main(['process', '--hostname', 'test-server',
+                               '--min-file-size', '100'] + tar_paths)
+            assert result == 0
+            assert 'Processing complete: 2 tarballs, 4 files total' in mock_stdout.getvalue()
+            
+            _, _, db_service, _ = get_services()
+            small_checksum = hashlib.sha256(small_content).hexdigest()
+            large_checksum = hashlib.sha256(large_content).hexdigest()
+            assert db_service.get_duplicate_group_by_checksum(small_checksum) is None
+            assert db_service.get_duplicate_group_by_checksum(large_checksum).file_count == 2
+            
+        finally:
+            for tar_path in tar_paths:
+                os.unlink(tar_path)
+
     def test_duplicate_group_management(self):
         """Test duplicate group creation and management."""
         # This will fail until implementation exists
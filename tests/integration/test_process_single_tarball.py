@@ -324,5 +324,32 @@ class TestProcessSingleTarball:
             # Should complete within reasonable time (less than 30 seconds for 100 small files)
             assert processing_time < 30, f"Processing took {processing_time} seconds"
             
+        finally:
+            os.unlink(tar_file.name)
+
+    def test_uninstalled_hash_algorithm_is_rejected(self, monkeypatch):
+        """Test an algorithm whose optional package is missing is a usage error."""
+        from dedupe.cli.main import main
+        from dedupe.services.hash_service import HashService
+        
+        supported = dict(HashService.SUPPORTED_ALGORITHMS)
+        supported.pop('xxh3_128', None)
+        monkeypatch.setattr(HashService, 'SUPPORTED_ALGORITHMS', supported)
+        
+        with tempfile.NamedTemporaryFile(suffix='.tar.gz', delete=False) as tar_file:
+            with tarfile.open(tar_file.name, 'w:gz') as tar:
+                info = tarfile.TarInfo('app.log')
+                info.size = len(b'test log content')
+                tar.addfile(info, fileobj=io.BytesIO(b'test log content'))
+        
+        try:
+            with pytest.raises(SystemExit) as exc_info:
+                with patch('sys.stderr', new_callable=io.StringIO) as mock_stderr:
+                    main(['process', '--hostname', 'server01',
+                          '--hash-algorithm', 'xxh3_128', tar_file.name])
+            
+            assert exc_info.value.code == 2  # Command line usage error
+            assert 'xxh3_128' in mock_stderr.getvalue()
+            
         finally:
             os.unlink(tar_file.name)
\ No newline at end of file
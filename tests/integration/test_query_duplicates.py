@@ -105,4 +105,74 @@ class TestQueryDuplicates:
         
         # Test stats option
         result = main(['query', '--stats'])
-        assert result == 0
\ No newline at end of file
+        assert result == 0
+
+    def test_query_machine_readable_output(self):
+        """Test that JSON output parses and CSV output quotes awkward filenames."""
+        from dedupe.cli.main import main
+        import csv
+        import json
+        import os
+        
+        content = b'comma content'
+        
+        with tempfile.NamedTemporaryFile(suffix='.tar.gz', delete=False) as tar_file:
+            with tarfile.open(tar_file.name, 'w:gz') as tar:
+                info = tarfile.TarInfo('logs/a,b "quoted".log')
+                info.size = len(content)
+                tar.addfile(info, fileobj=io.BytesIO(content))
+        
+        try:
+            main(['process', '--hostname', 'csv-host', tar_file.name])
+            
+            with patch('sys.stdout', new_callable=io.StringIO) as mock_stdout:
+                result = main(['query', '--hostname', 'csv-host', '--format', 'csv'])
+            assert result == 0
+            rows = list(csv.DictReader(io.StringIO(mock_stdout.getvalue())))
+            assert [row['filename'] for row in rows] == ['logs/a,b "quoted".log']
+            
+            with patch('sys.stdout', new_callable=io.StringIO) as mock_stdout:
+                result = main(['query', '--hostname', 'csv-host', '--format', 'json'])
+            assert result == 0
+            parsed = json.loads(mock_stdout.getvalue())
+            assert parsed[0]['filename'] == 'logs/a,b "quoted".log'
+            assert parsed[0]['size'] == len(content)
+            
+            with patch('sys.stdout', new_callable=io.StringIO) as mock_stdout:
+                result = main(['query', '--hostname', 'no-such-host', '--format', 'json'])
+            assert result == 0
+            assert json.loads(mock_stdout.getvalue()) == []
+        finally:
+            os.unlink(tar_file.name)
+
+    def test_query_since_filter_with_records(self):
+        """Test --since filtering against stored records, including bad dates."""
+        from dedupe.cli.main import main
+        import os
+        
+        content = b'since content'
+        
+        with tempfile.NamedTemporaryFile(suffix='.tar.gz', delete=False) as tar_file:
+            with tarfile.open(tar_file.name, 'w:gz') as tar:
+                info = tarfile.TarInfo('since.log')
+                info.size = len(content)
+                tar.addfile(info, fileobj=io.BytesIO(content))
+        
+        try:
+            main(['process', '--hostname', 'since-host', tar_file.name])
+            
+            with patch('sys.stdout', new_callable=io.StringIO) as mock_stdout:
+                result = main(['query', '--hostname', 'since-host', '--since', '2000-01-01'])
+            assert result == 0
+            assert 'since.log' in mock_stdout.getvalue()
+            
+            with patch('sys.stdout', new_callable=io.StringIO) as mock_stdout:
+                result = main(['query', '--hostname', 'since-host', '--since', '2999-01-01T00:00:00Z'])
+            assert result == 0
+            assert 'No files found' in mock_stdout.getvalue()
+            
+            with pytest.raises(SystemExit) as exc_info:
+                main(['query', '--since', '10/01/2025'])
+            assert exc_info.value.code == 2
+        finally:
+            os.unlink(tar_file.name)
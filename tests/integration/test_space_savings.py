@@ -13,6 +13,11 @@ from unittest.mock import patch
 class TestSpaceSavings:
     """Test space savings report functionality."""
 
+    def setup_method(self):
+        """Reset services before each test to avoid state interference."""
+        from dedupe.cli.main import reset_services
+        reset_services()
+
     def test_space_savings_calculation(self):
         """Test space savings calculation."""
         # This will fail until implementation exists
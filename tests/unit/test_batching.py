@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+"""Unit tests for batching helpers."""
+
+import pytest
+
+
+class TestChunked:
+    """Test the chunked batching helper."""
+
+    def test_chunked_splits_into_batches(self):
+        """Test that items are split into fixed-size batches in order."""
+        from dedupe.utils.batching import chunked
+        
+        assert list(chunked(range(7), 3)) == [[0, 1, 2], [3, 4, 5], [6]]
+
+    def test_chunked_consumes_lazily(self):
+        """Test that chunked pulls from generators one batch at a time."""
+        from dedupe.utils.batching import chunked
+        
+        consumed = []
+        
+        def source():
+            for i in range(10):
+                consumed.append(i)
+                yield i
+        
+        batches = chunked(source(), 4)
+        assert next(batches) == [0, 1, 2, 3]
+        assert consumed == [0, 1, 2, 3]
+
+    def test_chunked_empty_and_invalid_size(self):
+        """Test empty input and non-positive batch sizes."""
+        from dedupe.utils.batching import chunked
+        
+        assert list(chunked([], 5)) == []
+        with pytest.raises(ValueError):
+            list(chunked([1], 0))
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""Unit tests for DatabaseConfig loading."""
+
+import os
+import pytest
+
+
+class TestDatabaseConfig:
+    """Test DatabaseConfig file loading and merging."""
+
+    def test_partial_file_keeps_defaults(self, tmp_path):
+        """Test that a config file overriding one key keeps the other defaults."""
+        from dedupe.config.database import DatabaseConfig
+        
+        config_file = tmp_path / 'dedupe.toml'
+        config_file.write_text('[database]\npool_size = 3\n')
+        
+        config = DatabaseConfig(str(config_file))
+        
+        assert config.pool_size == 3
+        assert config.timeout == 30
+        assert config.connection_string.startswith('postgresql://')
+
+    def test_config_file_is_parsed_once_until_modified(self, tmp_path):
+        """Test that repeated loads reuse the parsed file until it changes."""
+        from dedupe.config.database import DatabaseConfig, _load_toml
+        
+        config_file = tmp_path / 'dedupe.toml'
+        config_file.write_text('[database]\npool_size = 4\n')
+        
+        _load_toml.cache_clear()
+        DatabaseConfig(str(config_file))
+        DatabaseConfig(str(config_file))
+        assert _load_toml.cache_info().misses == 1
+        
+        config_file.write_text('[database]\npool_size = 5\n')
+        stat = os.stat(config_file)
+        os.utime(config_file, (stat.st_atime, stat.st_mtime + 10))
+        
+        assert DatabaseConfig(str(config_file)).pool_size == 5
+
+
+class TestConnectionHelper:
+    """Test the pooled connection context manager."""
+
+    def test_connection_commits_and_returns_to_pool(self):
+        """Test that a successful block commits and returns the connection."""
+        from unittest.mock import MagicMock, patch
+        from dedupe.config import database
+        
+        pool = MagicMock()
+        with patch.object(database, 'get_connection_pool', return_value=pool):
+            with database.connection() as conn:
+                assert conn is pool.get_connection.return_value
+        
+        conn.commit.assert_called_once()
+        conn.rollback.assert_not_called()
+        pool.return_connection.assert_called_once_with(conn)
+
+    def test_connection_rolls_back_and_returns_on_error(self):
+        """Test that a failing block rolls back and still returns the connection."""
+        from unittest.mock import MagicMock, patch
+        from dedupe.config import database
+        
+        pool = MagicMock()
+        with patch.object(database, 'get_connection_pool', return_value=pool):
+            with pytest.raises(RuntimeError):
+                with database.connection() as conn:
+                    raise RuntimeError("boom")
+        
+        conn.rollback.assert_called_once()
+        conn.commit.assert_not_called()
+        pool.return_connection.assert_called_once_with(conn)
+
+
+class TestConnectionValidation:
+    """Test connection validation in DatabaseConnectionPool.get_connection."""
+
+    def _make_pool(self, *connections):
+        from unittest.mock import MagicMock
+        from dedupe.config.database import DatabaseConfig, DatabaseConnectionPool
+        
+        pool = DatabaseConnectionPool(DatabaseConfig())
+        pool._pool = MagicMock()
+        pool._pool.getconn.side_effect = list(connections)
+        return pool
+
+    def test_closed_connection_is_discarded(self):
+        """Test that a closed connection is closed out and another taken."""
+        from unittest.mock import MagicMock
+        
+        dead = MagicMock(closed=1)
+        live = MagicMock(closed=0)
+        pool = self._make_pool(dead, live)
+        
+        assert pool.get_connection() is live
+        pool._pool.putconn.assert_called_once_with(dead, close=True)
+        live.cursor.return_value.__enter__.return_value.execute.assert_called_once_with("SELECT 1")
+
+    def test_failed_check_is_discarded(self):
+        """Test that a connection failing SELECT 1 is discarded."""
+        from unittest.mock import MagicMock
+        import psycopg2
+        
+        stale = MagicMock(closed=0)
+        stale.cursor.side_effect = psycopg2.OperationalError("server closed the connection")
+        live = MagicMock(closed=0)
+        pool = self._make_pool(stale, live)
+        
+        assert pool.get_connection() is live
+        pool._pool.putconn.assert_called_once_with(stale, close=True)
+
+    def test_recent_check_is_reused(self):
+        """Test that SELECT 1 runs at most once per check interval."""
+        from unittest.mock import MagicMock
+        
+        conn = MagicMock(closed=0)
+        pool = self._make_pool(conn, conn)
+        
+        pool.get_connection()
+        pool.get_connection()
+        
+        assert conn.cursor.call_count == 1
@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""Unit tests for DatabaseService.
+
+These tests cover the in-memory storage and index maintenance.
+"""
+
+
+def _make_tarball(hostname='server01', filename='logs.tar.gz'):
+    from dedupe.models.tarball_record import TarballRecord
+    return TarballRecord(filename=filename, hostname=hostname, file_size=100)
+
+
+def _make_file(tarball, name, checksum='a' * 64, size=10):
+    from dedupe.models.file_record import FileRecord
+    return FileRecord(
+        tarball_id=tarball.id,
+        filename=name,
+        file_size=size,
+        checksum=checksum,
+        hash_algorithm='sha256'
+    )
+
+
+class TestDatabaseServiceFileRecords:
+    """Test FileRecord storage in DatabaseService."""
+
+    def test_save_file_records_indexes_by_tarball_and_hostname(self):
+        """Test that bulk saves populate tarball and hostname indexes."""
+        from dedupe.services.database_service import DatabaseService
+        
+        service = DatabaseService()
+        tarball_a = service.save_tarball_record(_make_tarball('host-a', 'a.tar'))
+        tarball_b = service.save_tarball_record(_make_tarball('host-b', 'b.tar'))
+        records = [
+            _make_file(tarball_a, 'one.log'),
+            _make_file(tarball_b, 'two.log'),
+            _make_file(tarball_a, 'three.log'),
+        ]
+        
+        saved = service.save_file_records(records)
+        
+        assert saved == records
+        assert [r.filename for r in service.get_file_records(tarball_a.id)] == ['one.log', 'three.log']
+        assert [r.filename for r in service.get_file_records_by_hostname('host-b')] == ['two.log']
+
+    def test_save_file_records_is_idempotent(self):
+        """Test that saving the same records twice does not duplicate index entries."""
+        from dedupe.services.database_service import DatabaseService
+        
+        service = DatabaseService()
+        tarball = service.save_tarball_record(_make_tarball())
+        records = [_make_file(tarball, 'one.log'), _make_file(tarball, 'two.log')]
+        
+        service.save_file_records(records)
+        service.save_file_records(records)
+        service.save_file_record(records[0])
+        
+        assert len(service.get_file_records(tarball.id)) == 2
+        assert len(service.get_file_records_by_hostname('server01')) == 2
+
+    def test_delete_records_updates_indexes(self):
+        """Test that deletes remove IDs from the indexes and keep the rest in order."""
+        from dedupe.services.database_service import DatabaseService
+        
+        service = DatabaseService()
+        tarball = service.save_tarball_record(_make_tarball())
+        records = service.save_file_records([_make_file(tarball, f'{i}.log') for i in range(4)])
+        
+        assert service.delete_file_record(records[1].id)
+        assert not service.delete_file_record(records[1].id)
+        
+        expected = ['0.log', '2.log', '3.log']
+        assert [r.filename for r in service.get_file_records(tarball.id)] == expected
+        assert [r.filename for r in service.get_file_records_by_hostname('server01')] == expected
+        
+        assert service.delete_tarball_record(tarball.id)
+        assert service.get_tarball_records('server01') == []
+
+    def test_find_files_by_checksum_uses_index(self):
+        """Test checksum lookups across tarballs, case-insensitively and after deletes."""
+        from dedupe.services.database_service import DatabaseService
+        
+        service = DatabaseService()
+        tarball_a = service.save_tarball_record(_make_tarball('host-a', 'a.tar'))
+        tarball_b = service.save_tarball_record(_make_tarball('host-b', 'b.tar'))
+        first = service.save_file_record(_make_file(tarball_a, 'one.log', checksum='c' * 64))
+        second, other = service.save_file_records([
+            _make_file(tarball_b, 'two.log', checksum='c' * 64),
+            _make_file(tarball_b, 'other.log', checksum='d' * 64),
+        ])
+        
+        assert service.find_files_by_checksum('C' * 64) == [first, second]
+        assert service.find_files_by_checksum('e' * 64) == []
+        
+        service.delete_file_record(first.id)
+        assert service.find_files_by_checksum('c' * 64) == [second]
+        
+        other.update_checksum('c' * 64, 'sha256')
+        service.save_file_record(other)
+        assert service.find_files_by_checksum('c' * 64) == [second, other]
+        assert service.find_files_by_checksum('d' * 64) == []
+
+
+class TestDatabaseServiceDuplicateGroups:
+    """Test DuplicateGroup storage in DatabaseService."""
+
+    def test_save_duplicate_group_upserts_by_checksum(self):
+        """Test that a second group with the same checksum updates the first."""
+        from dedupe.models.duplicate_group import DuplicateGroup
+        from dedupe.services.database_service import DatabaseService
+        
+        service = DatabaseService()
+        first = service.save_duplicate_group(
+            DuplicateGroup(checksum='b' * 64, hash_algorithm='sha256', file_count=2, total_size_saved=10)
+        )
+        saved = service.save_duplicate_groups([
+            DuplicateGroup(checksum='b' * 64, hash_algorithm='sha256', file_count=3, total_size_saved=20)
+        ])
+        
+        assert saved == [first]
+        assert saved[0] is first
+        assert len(service.get_all_duplicate_groups()) == 1
+        assert service.get_duplicate_group_by_checksum('b' * 64).file_count == 3
+        assert first.total_size_saved == 20
+
+    def test_same_checksum_under_other_algorithm_is_a_separate_group(self):
+        """Test groups are keyed by (hash_algorithm, checksum), not checksum alone."""
+        from dedupe.models.duplicate_group import DuplicateGroup
+        from dedupe.services.database_service import DatabaseService
+
+        service = DatabaseService()
+        md5 = service.save_duplicate_group(
+            DuplicateGroup(checksum='d' * 32, hash_algorithm='md5', file_count=2, total_size_saved=10)
+        )
+        xxh = service.save_duplicate_group(
+            DuplicateGroup(checksum='d' * 32, hash_algorithm='xxh3_128', file_count=5, total_size_saved=40)
+        )
+
+        assert len(service.get_all_duplicate_groups()) == 2
+        assert (md5.file_count, md5.total_size_saved) == (2, 10)
+        assert service.get_duplicate_group_by_checksum('d' * 32, 'xxh3_128') is xxh
+        assert service.get_duplicate_group_by_checksum('d' * 32) is md5
+
+        assert service.delete_duplicate_group(md5.id)
+        assert service.get_duplicate_group_by_checksum('d' * 32) is xxh
+        assert service.get_duplicate_group_by_checksum('d' * 32, 'md5') is None
+
+    def test_get_duplicate_files_tracks_multi_file_groups(self):
+        """Test duplicate queries follow saves, count changes and deletes."""
+        from dedupe.models.duplicate_group import DuplicateGroup
+        from dedupe.services.database_service import DatabaseService
+        
+        service = DatabaseService()
+        single = service.save_duplicate_group(
+            DuplicateGroup(checksum='c' * 64, hash_algorithm='sha256', file_count=1)
+        )
+        double = service.save_duplicate_group(
+            DuplicateGroup(checksum='d' * 64, hash_algorithm='sha256', file_count=2)
+        )
+        
+        assert service.get_duplicate_files() == [double]
+        
+        single.add_file(10)
+        service.save_duplicate_group(single)
+        assert service.get_duplicate_files() == [double, single]
+        assert service.get_statistics()['duplicate_files'] == 2
+        
+        service.delete_duplicate_group(double.id)
+        assert service.get_duplicate_files() == [single]
+
+
+class TestDatabaseServiceProcessingLogs:
+    """Test ProcessingLog storage in DatabaseService."""
+
+    def test_get_processing_logs_filters_by_hostname_and_level(self):
+        """Test log queries use the tarball hostname and level indexes."""
+        from datetime import datetime, timedelta
+        from dedupe.models.processing_log import ProcessingLog
+        from dedupe.services.database_service import DatabaseService
+        
+        service = DatabaseService()
+        tarball_a = service.save_tarball_record(_make_tarball('host-a', 'a.tar'))
+        tarball_b = service.save_tarball_record(_make_tarball('host-b', 'b.tar'))
+        start = datetime(2025, 1, 1)
+        
+        def save(tarball, level, minutes):
+            return service.save_processing_log(ProcessingLog(
+                operation_type='SCAN',
+                tarball_id=tarball.id if tarball else None,
+                log_level=level,
+                message=f'{level} at {minutes}',
+                timestamp=start + timedelta(minutes=minutes)
+            ))
+        
+        a_info = save(tarball_a, 'INFO', 1)
+        a_error = save(tarball_a, 'ERROR', 2)
+        b_error = save(tarball_b, 'ERROR', 3)
+        no_tarball = save(None, 'INFO', 4)
+        
+        assert service.get_processing_logs() == [no_tarball, b_error, a_error, a_info]
+        assert service.get_processing_logs(hostname='host-a') == [a_error, a_info]
+        assert service.get_processing_logs(level='error') == [b_error, a_error]
+        assert service.get_processing_logs(hostname='host-a', level='ERROR') == [a_error]
+        assert service.get_processing_logs(hostname='host-c') == []
+        
+        assert service.delete_processing_log(a_error.id)
+        assert service.get_processing_logs(level='ERROR') == [b_error]
+        assert service.get_processing_logs(hostname='host-a') == [a_info]
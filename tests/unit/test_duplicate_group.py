@@ -306,6 +306,37 @@ class TestDuplicateGroupModel:
         checksum = "abc123def456"
         assert DuplicateGroup.is_checksum_unique(checksum)
 
+    def test_duplicate_group_checksum_index(self):
+        """Test uniqueness checks against a prebuilt checksum index."""
+        from dedupe.models.duplicate_group import DuplicateGroup
+        
+        groups = [
+            DuplicateGroup(checksum="ABC123", hash_algorithm="sha256"),
+            DuplicateGroup(checksum="def456", hash_algorithm="sha256")
+        ]
+        index = DuplicateGroup.build_checksum_index(groups)
+        
+        assert index == {"abc123", "def456"}
+        assert not DuplicateGroup.is_checksum_unique("Abc123", index)
+        assert DuplicateGroup.is_checksum_unique("fed789", index)
+        
+        # A plain list of groups still works
+        assert not DuplicateGroup.is_checksum_unique("DEF456", groups)
+        assert DuplicateGroup.is_checksum_unique("fed789", groups)
+
+    def test_duplicate_group_trusted_from_dict_parses_lazily(self):
+        """Test that trusted loads defer timestamp parsing until first read."""
+        from datetime import datetime
+        from dedupe.models.duplicate_group import DuplicateGroup
+        
+        group = DuplicateGroup(checksum="abc123", hash_algorithm="sha256")
+        loaded = DuplicateGroup.from_dict(group.to_dict(), trusted=True)
+        
+        assert isinstance(loaded._created_at, str)
+        assert loaded.created_at == group.created_at
+        assert isinstance(loaded._created_at, datetime)
+        assert loaded.to_dict() == group.to_dict()
+
     def test_duplicate_group_relationships(self):
         """Test model relationships."""
         # This will fail until model is implemented
@@ -400,4 +431,18 @@ class TestDuplicateGroupModel:
         original_file_size = 1024
         expected_savings = original_file_size * (group.file_count - 1)  # Keep one, save others
         
-        assert group.calculate_space_savings(original_file_size) == expected_savings
\ No newline at end of file
+        assert group.calculate_space_savings(original_file_size) == expected_savings
+
+    def test_duplicate_group_file_records_allocated_lazily(self):
+        """Test the file_records list is only created when first accessed."""
+        from dedupe.models.duplicate_group import DuplicateGroup
+        
+        group = DuplicateGroup(checksum="abc123", hash_algorithm="sha256")
+        assert group._file_records is None
+        
+        group.file_records.append("record")
+        assert group.file_records == ["record"]
+        
+        loaded = DuplicateGroup.from_dict(group.to_dict(), trusted=True)
+        assert loaded._file_records is None
+        assert loaded.file_records == []
\ No newline at end of file
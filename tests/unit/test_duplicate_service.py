@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""Unit tests for DuplicateService."""
+
+import uuid
+
+import pytest
+
+
+class TestProcessFileRecords:
+    """Test batch duplicate detection."""
+
+    def test_process_file_records_returns_each_updated_group_once(self):
+        """Test groups are returned once each, in first-update order."""
+        from dedupe.models.file_record import FileRecord
+        from dedupe.services.duplicate_service import DuplicateService
+        
+        make_record = FileRecord.record_factory(str(uuid.uuid4()), 'sha256')
+        checksums = ['a' * 64, 'b' * 64, 'a' * 64, 'c' * 64, 'a' * 64]
+        records = [make_record(f'{i}.log', 10, checksum) for i, checksum in enumerate(checksums)]
+        
+        groups = DuplicateService().process_file_records(records)
+        
+        assert [group.checksum for group in groups] == ['a' * 64, 'b' * 64, 'c' * 64]
+        assert [group.file_count for group in groups] == [3, 1, 1]
+        assert groups[0].total_size_saved == 20
+
+    def test_process_file_records_matches_single_file_path(self):
+        """Test the batch path builds the same groups and skips small files."""
+        from dedupe.models.file_record import FileRecord
+        from dedupe.services.duplicate_service import DuplicateService
+        
+        make_record = FileRecord.record_factory(str(uuid.uuid4()), 'SHA256')
+        sizes = [('A' * 64, 50), ('b' * 64, 5), ('a' * 64, 50), ('b' * 64, 5)]
+        records = [make_record(f'{i}.log', size, checksum) for i, (checksum, size) in enumerate(sizes)]
+        
+        batch = DuplicateService(min_file_size=10)
+        single = DuplicateService(min_file_size=10)
+        groups = batch.process_file_records(records)
+        for checksum, size in sizes:
+            single.process_file_for_duplicates(checksum, 'SHA256', size)
+        
+        assert [(g.checksum, g.file_count) for g in groups] == [('a' * 64, 2)]
+        assert batch.get_duplicate_statistics() == single.get_duplicate_statistics()
+
+
+class TestDuplicateStatistics:
+    """Test duplicate statistics aggregation."""
+
+    def test_get_duplicate_statistics(self):
+        """Test counters over a mix of unique and duplicate groups."""
+        from dedupe.services.duplicate_service import DuplicateService
+        
+        service = DuplicateService()
+        for checksum, size in [('a' * 64, 10), ('a' * 64, 10), ('a' * 64, 10),
+                               ('b' * 64, 5), ('b' * 64, 5), ('c' * 64, 7)]:
+            service.process_file_for_duplicates(checksum, 'sha256', size)
+        
+        assert service.get_duplicate_statistics() == {
+            'total_groups': 3,
+            'duplicate_groups': 2,
+            'unique_groups': 1,
+            'total_files_processed': 6,
+            'total_size_saved_bytes': 25,
+            'average_duplicates_per_group': 2.5
+        }
+
+    def test_statistics_follow_remove_merge_and_clear(self):
+        """Test running totals stay in step with group removal, merging and clearing."""
+        from dedupe.models.duplicate_group import DuplicateGroup
+        from dedupe.services.duplicate_service import DuplicateService
+        
+        service = DuplicateService()
+        for checksum in ['a' * 64, 'a' * 64, 'b' * 64, 'b' * 64, 'b' * 64]:
+            service.process_file_for_duplicates(checksum, 'sha256', 10)
+        
+        group_a = service.find_duplicates_by_checksum('a' * 64)[0]
+        service.remove_group(group_a.id)
+        stats = service.get_duplicate_statistics()
+        assert stats['total_groups'] == 1
+        assert stats['total_files_processed'] == 3
+        assert stats['total_size_saved_bytes'] == 20
+        
+        group_b = service.find_duplicates_by_checksum('b' * 64)[0]
+        extra = DuplicateGroup(checksum='b' * 64, hash_algorithm='sha256', file_count=1)
+        service._duplicate_groups[extra.id] = extra
+        service._count_group(extra, 1)
+        assert service.merge_groups(group_b.id, extra.id)
+        stats = service.get_duplicate_statistics()
+        assert stats['total_files_processed'] == group_b.file_count == 4
+        assert stats['total_size_saved_bytes'] == group_b.total_size_saved
+        assert stats['average_duplicates_per_group'] == 4
+        
+        service.clear_all_groups()
+        assert service.get_duplicate_statistics()['total_files_processed'] == 0
+
+
+class TestFindDuplicatesByAlgorithm:
+    """Test algorithm-filtered duplicate queries."""
+
+    def test_find_duplicates_by_algorithm(self):
+        """Test only multi-file groups of the requested algorithm are returned."""
+        from dedupe.services.duplicate_service import DuplicateService
+        
+        service = DuplicateService()
+        for checksum, algorithm in [('a' * 64, 'sha256'), ('a' * 64, 'sha256'),
+                                    ('b' * 32, 'md5'), ('b' * 32, 'md5'),
+                                    ('c' * 64, 'sha256')]:
+            service.process_file_for_duplicates(checksum, algorithm, 10)
+        
+        assert [g.checksum for g in service.find_duplicates_by_algorithm(' SHA256 ')] == ['a' * 64]
+        assert [g.checksum for g in service.find_duplicates_by_algorithm('md5')] == ['b' * 32]
+        assert service.find_duplicates_by_algorithm('sha1') == []
+        
+        service.remove_group(service.find_duplicates_by_algorithm('md5')[0].id)
+        assert service.find_duplicates_by_algorithm('md5') == []
+
+
+class TestGroupFileSize:
+    """Test the per-group file size used for savings and candidate filtering."""
+
+    def test_file_size_drives_savings_and_candidates(self):
+        """Test savings, candidate filtering and merges use the stored file size."""
+        from dedupe.models.duplicate_group import DuplicateGroup
+        from dedupe.services.duplicate_service import DuplicateService
+        
+        service = DuplicateService()
+        for _ in range(3):
+            group = service.process_file_for_duplicates('a' * 64, 'sha256', 1000)
+        
+        assert group.file_size == 1000
+        assert group.total_size_saved == 2000
+        assert service.find_duplicate_candidates(min_file_size=1000, max_file_size=1000) == [group]
+        assert service.find_duplicate_candidates(min_file_size=1001) == []
+        
+        source = DuplicateGroup(checksum='a' * 64, hash_algorithm='sha256', file_count=2, file_size=1000)
+        service._duplicate_groups[source.id] = source
+        assert service.merge_groups(group.id, source.id)
+        assert group.file_count == 5
+        assert group.total_size_saved == 4000
+        assert service.find_duplicates_by_checksum('a' * 64) == [group]
+
+
+class TestFindAllDuplicates:
+    """Test the duplicate-group set behind find_all_duplicates."""
+
+    def test_only_multi_file_groups_are_tracked(self):
+        """Test unique files stay out of the duplicate set and removals leave it."""
+        from dedupe.services.duplicate_service import DuplicateService
+        
+        service = DuplicateService()
+        for checksum in ['a' * 64, 'b' * 64, 'c' * 64, 'b' * 64]:
+            service.process_file_for_duplicates(checksum, 'sha256', 10)
+        
+        duplicates = service.find_all_duplicates()
+        assert [g.checksum for g in duplicates] == ['b' * 64]
+        assert len(service._duplicate_group_ids) == 1
+        
+        assert list(service.iter_duplicates()) == duplicates
+        
+        service.remove_group(duplicates[0].id)
+        assert service.find_all_duplicates() == []
+        assert not service._duplicate_group_ids
+
+
+class TestInputNormalization:
+    """Test checksum and algorithm normalization."""
+
+    def test_mixed_case_inputs_share_a_group(self):
+        """Test padded or uppercase inputs map to the same canonical group."""
+        from dedupe.services.duplicate_service import DuplicateService
+        
+        service = DuplicateService()
+        checksum = 'ab' * 32
+        group = service.process_file_for_duplicates(checksum, 'sha256', 10)
+        same = service.process_file_for_duplicates(f'  {checksum.upper()} ', ' SHA256', 10)
+        
+        assert same is group
+        assert group.checksum is checksum
+        assert service.find_duplicates_by_checksum(checksum.upper()) == [group]
+        with pytest.raises(ValueError):
+            service.process_file_for_duplicates('   ', 'sha256', 10)
+
+
+class TestAlgorithmBuckets:
+    """Test groups are keyed by algorithm as well as checksum."""
+
+    def test_same_hex_from_different_algorithms_is_not_a_duplicate(self):
+        """Test equal checksums under different algorithms stay in separate groups."""
+        from dedupe.services.duplicate_service import DuplicateService
+        
+        service = DuplicateService()
+        checksum = 'ab' * 32
+        sha = service.process_file_for_duplicates(checksum, 'sha256', 10)
+        blake = service.process_file_for_duplicates(checksum, 'blake3', 10)
+        service.process_file_for_duplicates(checksum, 'blake3', 10)
+        
+        assert sha is not blake
+        assert sha.file_count == 1
+        assert service.find_duplicates_by_checksum(checksum) == [blake]
+        assert service.find_duplicates_by_checksum(checksum, 'sha256') == []
+        assert not service.merge_groups(blake.id, sha.id)
+
+
+class TestSizeThreshold:
+    """Test that files under the size threshold are left out of detection."""
+
+    def test_files_below_min_file_size_are_not_tracked(self):
+        """Test small files return None and leave no group behind."""
+        from dedupe.services.duplicate_service import DuplicateService
+        
+        service = DuplicateService(min_file_size=100)
+        
+        assert service.process_file_for_duplicates('a' * 64, 'sha256', 99) is None
+        assert service.process_file_for_duplicates('b' * 64, 'sha256', 100) is not None
+        assert service.get_duplicate_statistics()['total_files_processed'] == 1
@@ -439,4 +439,139 @@ class TestFileRecordModel:
         assert data['file_size'] == 1024
         assert data['checksum'] == "abc123"
         assert data['hash_algorithm'] == "sha256"
-        assert data['is_duplicate'] is True
\ No newline at end of file
+        assert data['is_duplicate'] is True
+
+    def test_file_record_uses_slots(self):
+        """Test that records have a fixed attribute set and no __dict__."""
+        import pickle
+        from dedupe.models.file_record import FileRecord
+        
+        record = FileRecord(
+            tarball_id=str(uuid.uuid4()),
+            filename="test.log",
+            file_size=1024,
+            checksum="abc123",
+            hash_algorithm="sha256"
+        )
+        
+        assert not hasattr(record, '__dict__')
+        with pytest.raises(AttributeError):
+            record.unknown_field = 1
+        
+        # Records are pickled to and from --jobs worker processes
+        copy = pickle.loads(pickle.dumps(record))
+        assert copy == record
+        assert copy.id == record.id
+
+    def test_file_record_canonical_hash_algorithm(self):
+        """Test that algorithm names are normalized to one shared string."""
+        from dedupe.models.file_record import FileRecord
+        
+        records = [
+            FileRecord(
+                tarball_id=str(uuid.uuid4()),
+                filename="test.log",
+                file_size=1,
+                checksum="abc123",
+                hash_algorithm=algorithm
+            )
+            for algorithm in ("sha256", " SHA256 ")
+        ]
+        
+        assert records[0].hash_algorithm == "sha256"
+        assert records[0].hash_algorithm is records[1].hash_algorithm
+
+    def test_file_record_trusted_from_dict(self):
+        """Test that trusted from_dict rebuilds an identical record."""
+        from dedupe.models.file_record import FileRecord
+        
+        record = FileRecord(
+            tarball_id=str(uuid.uuid4()),
+            filename="test.log",
+            file_size=1024,
+            checksum="abc123",
+            hash_algorithm="sha256",
+            file_timestamp=datetime(2025, 1, 1, 12, 0, 0)
+        )
+        
+        copy = FileRecord.from_dict(record.to_dict(), trusted=True)
+        
+        assert copy == record
+        for name in FileRecord.__slots__:
+            assert getattr(copy, name) == getattr(record, name)
+
+    def test_file_record_to_json_matches_to_dict(self):
+        """Test that to_json produces the same data as to_dict."""
+        import json
+        from dedupe.models.file_record import FileRecord
+        
+        record = FileRecord(
+            tarball_id=str(uuid.uuid4()),
+            filename="test.log",
+            file_size=1024,
+            checksum="abc123",
+            hash_algorithm="sha256",
+            file_timestamp=datetime(2025, 1, 1, 12, 0, 0)
+        )
+        
+        assert json.loads(record.to_json()) == record.to_dict()
+
+    def test_file_record_bulk_new(self):
+        """Test bulk creation assigns unique version 4 ids and one timestamp."""
+        from dedupe.models.file_record import FileRecord
+        
+        tarball_id = str(uuid.uuid4())
+        records = FileRecord.bulk_new([
+            {'tarball_id': tarball_id, 'filename': f'file{i}.log', 'file_size': i,
+             'checksum': f'{i:064x}', 'hash_algorithm': 'sha256'}
+            for i in range(50)
+        ])
+        
+        assert [record.filename for record in records] == [f'file{i}.log' for i in range(50)]
+        assert len({record.id for record in records}) == 50
+        assert all(uuid.UUID(record.id).version == 4 for record in records)
+        assert len({record.created_at for record in records}) == 1
+
+    def test_file_record_factory_matches_init(self):
+        """Test record_factory builds the same records as the constructor."""
+        from dedupe.models.file_record import FileRecord
+        
+        tarball_id = str(uuid.uuid4())
+        make_record = FileRecord.record_factory(tarball_id, "SHA256")
+        record = make_record(" dir/test.log ", 1024, "abc123", datetime(2025, 1, 1))
+        expected = FileRecord(
+            tarball_id=tarball_id,
+            filename="dir/test.log",
+            file_size=1024,
+            checksum="abc123",
+            hash_algorithm="sha256",
+            file_timestamp=datetime(2025, 1, 1),
+            id=record.id,
+            created_at=record.created_at,
+            updated_at=record.updated_at
+        )
+        
+        assert record.to_dict() == expected.to_dict()
+        
+        with pytest.raises(ValueError, match="filename cannot be empty"):
+            make_record("  ", 1, "abc123")
+        with pytest.raises(ValueError, match="file_size cannot be negative"):
+            make_record("test.log", -1, "abc123")
+        with pytest.raises(ValueError, match="hash_algorithm must be one of"):
+            FileRecord.record_factory(tarball_id, "crc32")
+
+    def test_file_record_checksum_must_be_hex(self):
+        """Test that checksums are validated as hex and stored in lowercase."""
+        from dedupe.models.file_record import FileRecord
+        
+        record = FileRecord(
+            tarball_id=str(uuid.uuid4()),
+            filename="test.log",
+            file_size=1024,
+            checksum="ABC123",
+            hash_algorithm="sha256"
+        )
+        assert record.checksum == "abc123"
+        
+        with pytest.raises(ValueError, match="checksum must be a hexadecimal string"):
+            record.update_checksum("not-a-hash", "sha256")
\ No newline at end of file
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""Unit tests for HashService."""
+
+import hashlib
+
+import pytest
+
+
+class TestCalculateFileChecksum:
+    """Test checksums of files on disk."""
+
+    @pytest.mark.parametrize('chunk_size', [None, 4096])
+    def test_calculate_file_checksum_matches_hashlib(self, tmp_path, chunk_size):
+        """Test the file_digest and chunked paths give hashlib's digest."""
+        from dedupe.services.hash_service import HashService
+        
+        data = bytes(range(256)) * 5000
+        path = tmp_path / 'data.bin'
+        path.write_bytes(data)
+        
+        service = HashService()
+        
+        assert service.calculate_file_checksum(str(path), 'SHA256', chunk_size) == hashlib.sha256(data).hexdigest()
+        assert service.calculate_file_checksum(str(path), 'md5', chunk_size) == hashlib.md5(data).hexdigest()
+
+    def test_calculate_file_checksum_rejects_unknown_algorithm(self, tmp_path):
+        """Test unsupported algorithms raise ValueError before reading."""
+        from dedupe.services.hash_service import HashService
+        
+        path = tmp_path / 'data.bin'
+        path.write_bytes(b'data')
+        
+        with pytest.raises(ValueError, match="Unsupported hash algorithm"):
+            HashService().calculate_file_checksum(str(path), 'crc32')
+
+
+class TestCalculateChecksum:
+    """Test checksums of open file objects."""
+
+    def test_hashes_from_current_position_to_end(self):
+        """Test the remaining bytes are hashed and the stream is left at EOF."""
+        import io
+        from dedupe.services.hash_service import HashService
+        
+        data = b'header' + bytes(range(256)) * 100
+        file_obj = io.BytesIO(data)
+        file_obj.seek(6)
+        
+        checksum = HashService().calculate_checksum(file_obj, 'sha256', chunk_size=1000)
+        
+        assert checksum == hashlib.sha256(data[6:]).hexdigest()
+        assert file_obj.tell() == len(data)
+
+
+class TestCalculateFileChecksums:
+    """Test parallel hashing of several files."""
+
+    def test_calculate_file_checksums_matches_hashlib(self, tmp_path):
+        """Test each path maps to its own digest, in input order."""
+        from dedupe.services.hash_service import HashService
+        
+        paths = []
+        for i in range(5):
+            path = tmp_path / f'file{i}.bin'
+            path.write_bytes(bytes([i]) * (1000 + i))
+            paths.append(str(path))
+        
+        checksums = HashService().calculate_file_checksums(paths, 'sha256', max_workers=3)
+        
+        assert list(checksums) == paths
+        for i, path in enumerate(paths):
+            assert checksums[path] == hashlib.sha256(bytes([i]) * (1000 + i)).hexdigest()
+
+    def test_calculate_file_checksums_propagates_missing_file(self, tmp_path):
+        """Test a missing file raises instead of being skipped."""
+        from dedupe.services.hash_service import HashService
+        
+        with pytest.raises(FileNotFoundError):
+            HashService().calculate_file_checksums([str(tmp_path / 'missing.bin')])
+
+
+class TestOptionalAlgorithms:
+    """Test the hashes enabled by the [fast] extra."""
+
+    def test_blake3_checksum(self):
+        """Test blake3 is supported and matches the library's digest."""
+        blake3 = pytest.importorskip('blake3')
+        from dedupe.services.hash_service import HashService
+        
+        service = HashService()
+        
+        assert service.is_algorithm_supported('blake3')
+        assert service.calculate_bytes_checksum(b'data', 'blake3') == blake3.blake3(b'data').hexdigest()
+
+    def test_models_accept_fast_algorithms(self):
+        """Test records can store checksums from the optional algorithms."""
+        from dedupe.models.duplicate_group import DuplicateGroup
+        
+        for algorithm, length in [('blake3', 64), ('xxh3_128', 32)]:
+            group = DuplicateGroup(checksum='a' * length, hash_algorithm=algorithm)
+            assert group.hash_algorithm == algorithm
+
+
+class TestCalculateBytesChecksum:
+    """Test checksums of in-memory payloads."""
+
+    @pytest.mark.parametrize('data', [b'', b'small', bytearray(b'mutable'), b'x' * 10000])
+    def test_calculate_bytes_checksum_matches_hashlib(self, data):
+        """Test cached and uncached payloads give hashlib's digest."""
+        from dedupe.services.hash_service import HashService
+        
+        service = HashService()
+        
+        for _ in range(2):
+            assert service.calculate_bytes_checksum(data, 'sha1') == hashlib.sha1(data).hexdigest()
+            assert service.calculate_bytes_checksum(data, 'SHA256') == hashlib.sha256(data).hexdigest()
+
+
+class TestCalculateDigest:
+    """Test raw digests of open file objects."""
+
+    def test_calculate_digest_is_raw_checksum(self):
+        """Test the digest is the byte form of calculate_checksum's result."""
+        import io
+        from dedupe.services.hash_service import HashService
+        
+        data = bytes(range(256)) * 100
+        service = HashService()
+        
+        digest = service.calculate_digest(io.BytesIO(data), 'sha256', chunk_size=1000)
+        
+        assert digest == hashlib.sha256(data).digest()
+        assert digest.hex() == service.calculate_checksum(io.BytesIO(data), 'sha256')
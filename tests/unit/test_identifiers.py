@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""Unit tests for identifier helpers."""
+
+import os
+import uuid
+
+import pytest
+
+
+class TestUuidGeneration:
+    """Test bulk and pooled UUID generation."""
+
+    def test_uuid4_strings_are_canonical_version_4(self):
+        """Test generated ids parse as RFC 4122 version 4 UUIDs."""
+        from dedupe.utils.identifiers import uuid4_strings
+        
+        ids = uuid4_strings(500)
+        
+        assert len(set(ids)) == 500
+        for value in ids:
+            parsed = uuid.UUID(value)
+            assert str(parsed) == value
+            assert parsed.version == 4
+            assert parsed.variant == uuid.RFC_4122
+
+    def test_new_uuid4_refills_pool(self):
+        """Test pooled ids stay unique across several pool refills."""
+        from dedupe.utils.identifiers import _ID_POOL_SIZE, new_uuid4
+        
+        ids = [new_uuid4() for _ in range(_ID_POOL_SIZE * 3 + 1)]
+        
+        assert len(set(ids)) == len(ids)
+        assert all(uuid.UUID(value).version == 4 for value in ids)
+
+    @pytest.mark.skipif(not hasattr(os, 'fork'), reason="requires os.fork")
+    def test_new_uuid4_pool_not_shared_with_forked_child(self):
+        """Test a forked child does not reuse ids pooled by the parent."""
+        from dedupe.utils.identifiers import new_uuid4
+        
+        new_uuid4()
+        read_fd, write_fd = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            os.write(write_fd, new_uuid4().encode())
+            os._exit(0)
+        
+        os.close(write_fd)
+        os.waitpid(pid, 0)
+        child_id = os.read(read_fd, 36).decode()
+        os.close(read_fd)
+        
+        assert child_id != new_uuid4()
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""Unit tests for JSON output helpers."""
+
+import json
+
+import pytest
+
+
+class TestJsonDumps:
+    """Test the CLI JSON serializer."""
+
+    @pytest.mark.parametrize('use_orjson', [True, False])
+    def test_dumps_round_trips(self, monkeypatch, use_orjson):
+        """Test that both backends produce the same parsed result."""
+        from dedupe.utils import json_output
+        
+        if use_orjson and json_output.orjson is None:
+            pytest.skip('orjson not installed')
+        if not use_orjson:
+            monkeypatch.setattr(json_output, 'orjson', None)
+        
+        data = {'checksum': 'a' * 64, 'file_count': 2, 'filename': 'café.log'}
+        
+        text = json_output.dumps(data)
+        assert isinstance(text, str)
+        assert json.loads(text) == data
+        
+        indented = json_output.dumps(data, indent=True)
+        assert '\n  "checksum"' in indented
+        assert json.loads(indented) == data
+
+    @pytest.mark.parametrize('use_orjson', [True, False])
+    def test_dumps_formats_datetimes_like_isoformat(self, monkeypatch, use_orjson):
+        """Test that datetimes serialize the same as datetime.isoformat()."""
+        from datetime import datetime, timezone
+        from dedupe.utils import json_output
+        
+        if use_orjson and json_output.orjson is None:
+            pytest.skip('orjson not installed')
+        if not use_orjson:
+            monkeypatch.setattr(json_output, 'orjson', None)
+        
+        aware = datetime(2025, 1, 2, 3, 4, 5, 123456, tzinfo=timezone.utc)
+        naive = datetime(2025, 1, 2, 3, 4, 5)
+        
+        assert json.loads(json_output.dumps([aware, naive])) == [aware.isoformat(), naive.isoformat()]
+
+    def test_dumps_raw_dicts_matches_to_dict(self):
+        """Test that exporting to_raw_dict() rows gives the to_dict() data."""
+        from dedupe.models.processing_log import ProcessingLog
+        from dedupe.models.tarball_record import TarballRecord
+        from dedupe.utils import json_output
+        
+        records = [
+            TarballRecord(filename='a.tar', hostname='host-a'),
+            ProcessingLog(operation_type='SCAN', log_level='INFO', message='done'),
+        ]
+        
+        text = json_output.dumps([record.to_raw_dict() for record in records])
+        
+        assert json.loads(text) == [record.to_dict() for record in records]
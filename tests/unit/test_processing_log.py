@@ -160,6 +160,14 @@ class TestProcessingLogModel:
                 log_level="",
                 message="Test message"
             )
+        
+        # log_level stays assignable, with the same validation
+        log.log_level = " warning "
+        assert log.log_level == "WARNING"
+        assert log.is_warning()
+        with pytest.raises(ValueError):
+            log.log_level = "INVALID_LEVEL"
+        assert log.log_level == "WARNING"
 
     def test_processing_log_message_validation(self):
         """Test message field validation."""
@@ -428,6 +436,68 @@ class TestProcessingLogModel:
         assert log.message == data['message']
         assert log.details == data['details']
 
+    def test_processing_log_from_dict_utc_timestamp(self):
+        """Test that a 'Z'-suffixed timestamp parses as UTC."""
+        from datetime import datetime, timezone
+        from dedupe.models.processing_log import ProcessingLog
+        
+        log = ProcessingLog.from_dict({
+            'operation_type': 'QUERY_FILES',
+            'log_level': 'INFO',
+            'message': 'Query executed successfully',
+            'timestamp': '2025-01-02T03:04:05Z'
+        })
+        assert log.timestamp == datetime(2025, 1, 2, 3, 4, 5, tzinfo=timezone.utc)
+
+    def test_processing_log_add_detail_leaves_caller_dict_unchanged(self):
+        """Test that add_detail copies shared details before writing."""
+        from dedupe.models.processing_log import ProcessingLog
+        
+        details = {"files": 100}
+        log = ProcessingLog(
+            operation_type="PROCESS_TARBALL",
+            log_level="INFO",
+            message="Processing completed",
+            details=details
+        )
+        
+        log.add_detail("errors", 0)
+        log.add_detail("warnings", 2)
+        
+        assert details == {"files": 100}
+        assert log.details == {"files": 100, "errors": 0, "warnings": 2}
+
+    def test_processing_log_level_enum(self):
+        """Test that the level is stored as a LogLevel and exposed by name."""
+        from dedupe.models.processing_log import LogLevel, ProcessingLog
+        
+        log = ProcessingLog(
+            operation_type="TEST",
+            log_level=" error ",
+            message="Error message"
+        )
+        
+        assert log.level is LogLevel.ERROR
+        assert log.log_level == "ERROR"
+        assert log.get_severity_level() == 4
+        assert log.is_error()
+        assert log.to_dict()['log_level'] == "ERROR"
+        assert ProcessingLog.from_dict(log.to_dict(), trusted=True).level is LogLevel.ERROR
+
+    def test_processing_log_format_message(self):
+        """Test that format_message matches the strftime-based format."""
+        from dedupe.models.processing_log import ProcessingLog
+        
+        for timestamp in (datetime(2025, 1, 2, 3, 4, 5), datetime(2025, 12, 31, 23, 59, 59, 999999)):
+            log = ProcessingLog(
+                operation_type="TEST",
+                log_level="INFO",
+                message="Hello",
+                timestamp=timestamp
+            )
+            expected = f"[{timestamp.strftime('%Y-%m-%d %H:%M:%S UTC')}] INFO: Hello"
+            assert log.format_message() == expected
+
     def test_processing_log_severity_ordering(self):
         """Test log level severity ordering."""
         # This will fail until model is implemented
@@ -447,4 +517,22 @@ class TestProcessingLogModel:
         
         # Should be able to compare severity
         assert debug_log.get_severity_level() < error_log.get_severity_level()
-        assert error_log.is_more_severe_than(debug_log)
\ No newline at end of file
+        assert error_log.is_more_severe_than(debug_log)
+
+    def test_processing_log_from_dict_shares_parsed_timestamps(self):
+        """Test replayed entries reuse the parsed timestamp but not the entry."""
+        from dedupe.models.processing_log import ProcessingLog
+        
+        data = {
+            'operation_type': 'SCAN',
+            'log_level': 'INFO',
+            'message': 'Scanned tarball',
+            'timestamp': '2025-01-01T12:00:00+00:00'
+        }
+        first = ProcessingLog.from_dict(data)
+        second = ProcessingLog.from_dict(data, trusted=True)
+        
+        assert first.timestamp == datetime.fromisoformat(data['timestamp'])
+        assert first.timestamp is second.timestamp
+        assert first is not second
+        assert first.id != second.id
\ No newline at end of file
@@ -293,4 +293,99 @@ class TestTarballRecordModel:
         assert data['filename'] == "test.tar.gz"
         assert data['hostname'] == "server01"
         assert data['file_size'] == 1024
-        assert data['status'] == "SUCCESS"
\ No newline at end of file
+        assert data['status'] == "SUCCESS"
+
+    def test_tarball_record_uses_slots(self):
+        """Test that records have a fixed attribute set and no __dict__."""
+        import pickle
+        from dedupe.models.tarball_record import TarballRecord
+        
+        record = TarballRecord(
+            filename="/path/to/test.tar.gz",
+            hostname="test-host",
+            file_size=1024,
+            status="SUCCESS"
+        )
+        
+        assert not hasattr(record, '__dict__')
+        with pytest.raises(AttributeError):
+            record.unknown_field = 1
+        
+        # Records are pickled to and from --jobs worker processes
+        copy = pickle.loads(pickle.dumps(record))
+        assert copy.to_dict() == record.to_dict()
+
+    def test_tarball_record_trusted_from_dict_and_to_json(self):
+        """Test the trusted load path and JSON export agree with to_dict."""
+        import json
+        from dedupe.models.tarball_record import TarballRecord
+        
+        record = TarballRecord(
+            filename="/path/to/test.tar.gz",
+            hostname="test-host",
+            file_size=1024,
+            status="SUCCESS",
+            processing_duration=5,
+            total_files_count=10
+        )
+        
+        data = record.to_dict()
+        loaded = TarballRecord.from_dict(data, trusted=True)
+        assert loaded.to_dict() == data
+        assert loaded.created_at == record.created_at
+        assert json.loads(record.to_json()) == data
+
+    def test_tarball_record_status_accepts_enum_or_value(self):
+        """Test status is stored as its string value however it is given."""
+        import pickle
+        from dedupe.models.tarball_record import TarballRecord, TarballStatus
+        
+        record = TarballRecord(
+            filename="/path/to/test.tar.gz",
+            hostname="test-host",
+            status=TarballStatus.COMPLETED
+        )
+        assert record.status == "COMPLETED"
+        assert record.is_completed()
+        
+        record.status = "FAILED"
+        assert record.is_failed()
+        assert pickle.loads(pickle.dumps(record)).is_failed()
+        
+        with pytest.raises(ValueError):
+            record.status = "UNKNOWN"
+        with pytest.raises(ValueError):
+            TarballRecord(filename="test.tar", hostname="test-host", status="UNKNOWN")
+
+    def test_tarball_record_accepts_shared_timestamp(self):
+        """Test that callers can supply the update timestamp."""
+        from datetime import timezone
+        from dedupe.models.tarball_record import TarballRecord
+        
+        now = datetime(2025, 1, 1, 12, 0, 0, tzinfo=timezone.utc)
+        record = TarballRecord(
+            filename="/path/to/test.tar.gz",
+            hostname="test-host",
+            created_at=now,
+            updated_at=now,
+            processed_at=now
+        )
+        assert record.created_at is now
+        
+        later = now + timedelta(seconds=5)
+        record.update_status("SUCCESS", now=later)
+        assert record.updated_at is later
+        
+        record.set_processing_duration(5, now=now)
+        assert record.updated_at is now
+
+    def test_tarball_record_interns_hostname(self):
+        """Test that records from the same host share one hostname string."""
+        from dedupe.models.tarball_record import TarballRecord
+        
+        first = TarballRecord(filename="a.tar", hostname="".join(["test-", "host"]))
+        second = TarballRecord(filename="b.tar", hostname=" test-host ")
+        loaded = TarballRecord.from_dict(second.to_dict(), trusted=True)
+        
+        assert first.hostname is second.hostname
+        assert loaded.hostname is first.hostname
\ No newline at end of file
@@ -0,0 +1,340 @@
+#!/usr/bin/env python3
+"""Unit tests for TarballService."""
+
+import hashlib
+import io
+import tarfile
+import uuid
+
+import pytest
+
+
+def _write_tarball(path, files, mode='w:gz'):
+    """Write a tarball holding the given {name: bytes} files and one directory."""
+    with tarfile.open(path, mode) as tar:
+        directory = tarfile.TarInfo('data')
+        directory.type = tarfile.DIRTYPE
+        tar.addfile(directory)
+        for name, data in files.items():
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            info.mtime = 1700000000
+            tar.addfile(info, io.BytesIO(data))
+    return str(path)
+
+
+@pytest.fixture
+def sample_files():
+    """Contents of a small tarball with one duplicated file."""
+    return {
+        'data/a.txt': b'alpha' * 100,
+        'data/b.txt': b'beta' * 100,
+        'data/copy_of_a.txt': b'alpha' * 100,
+    }
+
+
+class TestIterAnalyzedFiles:
+    """Test reading FileRecords out of a tarball."""
+
+    @pytest.mark.parametrize('hash_workers', [1, 3])
+    @pytest.mark.parametrize('mode', ['w', 'w:gz', 'w:bz2'])
+    def test_records_match_members(self, tmp_path, sample_files, mode, hash_workers):
+        """Test each regular file yields one record with its size and checksum."""
+        from dedupe.services.tarball_service import TarballService
+
+        path = _write_tarball(tmp_path / 'sample.tar', sample_files, mode)
+
+        tarball_id = str(uuid.uuid4())
+        service = TarballService(hash_workers=hash_workers)
+        records = list(service._iter_analyzed_files(path, tarball_id, 'sha256'))
+
+        assert [r.filename for r in records] == list(sample_files)
+        for record in records:
+            data = sample_files[record.filename]
+            assert record.file_size == len(data)
+            assert record.checksum == hashlib.sha256(data).hexdigest()
+            assert record.tarball_id == tarball_id
+
+    def test_members_with_same_mtime_share_a_timestamp(self, tmp_path, sample_files):
+        """Test file timestamps are UTC datetimes built once per distinct mtime."""
+        from datetime import datetime, timezone
+        from dedupe.services.tarball_service import TarballService
+
+        path = _write_tarball(tmp_path / 'sample.tar', sample_files, 'w')
+
+        records = list(TarballService()._iter_analyzed_files(path, str(uuid.uuid4()), 'sha256'))
+
+        assert records[0].file_timestamp == datetime.fromtimestamp(1700000000, tz=timezone.utc)
+        assert all(r.file_timestamp is records[0].file_timestamp for r in records)
+
+    def test_parallel_hashing_keeps_archive_order(self, tmp_path, monkeypatch):
+        """Test pooled and streamed (oversized) members come back in order."""
+        from dedupe.services import tarball_service
+        from dedupe.services.tarball_service import TarballService
+
+        monkeypatch.setattr(tarball_service, '_PARALLEL_HASH_MAX_SIZE', 1000)
+        files = {f'data/{i:02d}.bin': bytes([i]) * (200 + 100 * i) for i in range(20)}
+        path = _write_tarball(tmp_path / 'sample.tar.gz', files)
+
+        service = TarballService(hash_workers=2)
+        records = list(service._iter_analyzed_files(path, str(uuid.uuid4()), 'md5'))
+
+        assert [r.filename for r in records] == list(files)
+        assert [r.checksum for r in records] == [hashlib.md5(d).hexdigest() for d in files.values()]
+
+    def test_unsupported_algorithm_fails_the_tarball(self, tmp_path, sample_files):
+        """Test an unknown algorithm raises once and marks the record FAILED."""
+        from dedupe.services.tarball_service import TarballService
+
+        path = _write_tarball(tmp_path / 'sample.tar.gz', sample_files)
+        service = TarballService()
+        tarball_record = service.create_tarball_record(path, 'host1')
+
+        with pytest.raises(ValueError, match="Unsupported hash algorithm"):
+            list(service.iter_tarball_files(path, tarball_record, 'no_such_hash'))
+
+        assert tarball_record.status == 'FAILED'
+        assert 'no_such_hash' in tarball_record.error_message
+
+
+class TestOpenTarball:
+    """Test the buffered archive opener shared by the service methods."""
+
+    @pytest.mark.parametrize('mode', ['w', 'w:gz', 'w:bz2', 'w:xz'])
+    def test_compressions_are_detected(self, tmp_path, sample_files, mode):
+        """Test each compression is detected through the buffered file."""
+        from dedupe.services.tarball_service import TarballService
+
+        path = _write_tarball(tmp_path / 'sample.tar', sample_files, mode)
+        service = TarballService()
+
+        assert service.validate_tarball(path)
+        assert [f['name'] for f in service.list_files(path)] == ['data'] + list(sample_files)
+
+    def test_invalid_tarball_is_rejected(self, tmp_path):
+        """Test non-archives and missing files fail validation."""
+        from dedupe.services.tarball_service import TarballService
+
+        path = tmp_path / 'not_a_tarball.tar'
+        path.write_bytes(b'plain text' * 100)
+        service = TarballService()
+
+        assert not service.validate_tarball(str(path))
+        assert not service.validate_tarball(str(tmp_path / 'missing.tar'))
+
+    def test_header_scan_handles_empty_and_mapped_files(self, tmp_path, sample_files):
+        """Test header-only reads of empty, memory-mapped and truncated uncompressed tarballs."""
+        from dedupe.services.tarball_service import TarballService
+
+        empty = tmp_path / 'empty.tar'
+        empty.write_bytes(b'')
+        path = _write_tarball(tmp_path / 'sample.tar', sample_files, 'w')
+        large = _write_tarball(tmp_path / 'large.tar', {'data/big.bin': b'x' * 3_000_000}, 'w')
+        truncated = tmp_path / 'truncated.tar'
+        with open(large, 'rb') as source:
+            truncated.write_bytes(source.read(1_500_000))
+        service = TarballService()
+
+        assert not service.validate_tarball(str(empty))
+        info = service.get_tarball_info(path)
+        assert info['total_files'] == 3
+        assert info['total_uncompressed_size'] == sum(len(d) for d in sample_files.values())
+
+        # Running off the end of the map reads as a truncated archive
+        assert not service.validate_tarball(str(truncated))
+        with pytest.raises(tarfile.ReadError):
+            service.list_files(str(truncated))
+        with pytest.raises(tarfile.ReadError):
+            service.get_tarball_info(str(truncated))
+
+
+class TestTarballMetadata:
+    """Test record creation and summary information for a tarball."""
+
+    def test_create_tarball_record(self, tmp_path, sample_files):
+        """Test the record takes its name and size from the file."""
+        import os
+        from dedupe.services.tarball_service import TarballService
+
+        path = _write_tarball(tmp_path / 'sample.tar.gz', sample_files)
+
+        record = TarballService().create_tarball_record(path, ' host1 ')
+
+        assert record.filename == 'sample.tar.gz'
+        assert record.hostname == 'host1'
+        assert record.file_size == os.path.getsize(path)
+
+    def test_get_tarball_info(self, tmp_path, sample_files):
+        """Test member counts and sizes are totalled in one pass."""
+        import os
+        from dedupe.services.tarball_service import TarballService
+
+        path = _write_tarball(tmp_path / 'sample.tar.gz', sample_files)
+        total_size = sum(len(data) for data in sample_files.values())
+
+        info = TarballService().get_tarball_info(path)
+
+        assert info['total_files'] == 3
+        assert info['total_directories'] == 1
+        assert info['members'] == 4
+        assert info['total_uncompressed_size'] == total_size
+        assert info['compression_ratio'] == os.path.getsize(path) / total_size
+
+    def test_missing_tarball_raises(self, tmp_path):
+        """Test a missing file raises FileNotFoundError naming the path."""
+        from dedupe.services.tarball_service import TarballService
+
+        missing = str(tmp_path / 'missing.tar')
+        service = TarballService()
+
+        with pytest.raises(FileNotFoundError, match="Tarball file not found"):
+            service.create_tarball_record(missing, 'host1')
+        with pytest.raises(FileNotFoundError, match="Tarball file not found"):
+            service.get_tarball_info(missing)
+
+
+class TestExtractFileToTemp:
+    """Test extracting a single member to a temporary file."""
+
+    @pytest.mark.parametrize('mode', ['w', 'w:gz'])
+    def test_extracted_file_matches_member(self, tmp_path, mode):
+        """Test both the kernel-copy and streamed paths write the member's bytes."""
+        import os
+        from dedupe.services.tarball_service import TarballService
+
+        data = bytes(range(256)) * 10000
+        path = _write_tarball(tmp_path / 'sample.tar', {'data/a.bin': b'x', 'data/big.bin': data}, mode)
+
+        temp_path = TarballService().extract_file_to_temp(path, 'data/big.bin')
+        try:
+            with open(temp_path, 'rb') as extracted:
+                assert extracted.read() == data
+        finally:
+            os.unlink(temp_path)
+
+    def test_member_index_is_reused_until_tarball_changes(self, tmp_path, sample_files):
+        """Test repeat extractions reuse the index and a rewritten tarball rebuilds it."""
+        import os
+        from dedupe.services.tarball_service import TarballService
+
+        path = _write_tarball(tmp_path / 'sample.tar', sample_files, 'w')
+        service = TarballService()
+
+        index = service._get_member_index(path)
+        for name, data in sample_files.items():
+            temp_path = service.extract_file_to_temp(path, name)
+            with open(temp_path, 'rb') as extracted:
+                assert extracted.read() == data
+            os.unlink(temp_path)
+        assert service._get_member_index(path) is index
+
+        _write_tarball(path, {'data/new.txt': b'new contents'}, 'w')
+        temp_path = service.extract_file_to_temp(path, 'data/new.txt')
+        with open(temp_path, 'rb') as extracted:
+            assert extracted.read() == b'new contents'
+        os.unlink(temp_path)
+
+    @pytest.mark.parametrize('mode', ['w', 'w:gz'])
+    def test_extract_with_checksum(self, tmp_path, sample_files, mode):
+        """Test the checksum computed during extraction matches the contents."""
+        import os
+        from dedupe.services.tarball_service import TarballService
+
+        path = _write_tarball(tmp_path / 'sample.tar', sample_files, mode)
+
+        temp_path, checksum = TarballService().extract_file_to_temp_with_checksum(
+            path, 'data/b.txt', 'sha1'
+        )
+        try:
+            with open(temp_path, 'rb') as extracted:
+                assert extracted.read() == sample_files['data/b.txt']
+        finally:
+            os.unlink(temp_path)
+        assert checksum == hashlib.sha1(sample_files['data/b.txt']).hexdigest()
+
+    def test_missing_member_raises(self, tmp_path, sample_files):
+        """Test an unknown member name raises FileNotFoundError."""
+        from dedupe.services.tarball_service import TarballService
+
+        path = _write_tarball(tmp_path / 'sample.tar', sample_files, 'w')
+
+        with pytest.raises(FileNotFoundError):
+            TarballService().extract_file_to_temp(path, 'data/missing.txt')
+
+
+class TestProcessTarballs:
+    """Test processing several tarballs at once."""
+
+    @pytest.mark.parametrize('workers', [1, 2])
+    def test_process_tarballs_matches_process_tarball(self, tmp_path, sample_files, workers):
+        """Test each tarball gets a record and stored file records, in input order."""
+        from dedupe.services.tarball_service import TarballService
+
+        paths = [
+            _write_tarball(tmp_path / f'sample{i}.tar.gz', dict(list(sample_files.items())[:i + 1]))
+            for i in range(3)
+        ]
+        service = TarballService()
+
+        records = service.process_tarballs(paths, 'host1', 'md5', workers=workers)
+
+        assert [r.filename for r in records] == [f'sample{i}.tar.gz' for i in range(3)]
+        assert [r.total_files_count for r in records] == [1, 2, 3]
+        for record in records:
+            assert record.status == 'SUCCESS'
+            files = service.get_extracted_files(record.id)
+            assert [f.tarball_id for f in files] == [record.id] * record.total_files_count
+            assert all(f.hash_algorithm == 'md5' for f in files)
+
+    def test_pool_workers_use_the_callers_hash_settings(self, tmp_path, sample_files, monkeypatch):
+        """Test each pooled tarball is hashed with the caller's hash_service and hash_workers."""
+        from concurrent.futures import ThreadPoolExecutor
+        from dedupe.services import tarball_service
+        from dedupe.services.hash_service import HashService
+        from dedupe.services.tarball_service import TarballService
+
+        # Run the "processes" as threads so the workers' services can be seen
+        monkeypatch.setattr(tarball_service, 'ProcessPoolExecutor', ThreadPoolExecutor)
+        seen = []
+        hash_members_parallel = TarballService._hash_members_parallel
+
+        def spy(service, tar, hash_algorithm):
+            seen.append((service.hash_service, service.hash_workers))
+            return hash_members_parallel(service, tar, hash_algorithm)
+
+        monkeypatch.setattr(TarballService, '_hash_members_parallel', spy)
+        paths = [_write_tarball(tmp_path / f'sample{i}.tar.gz', sample_files) for i in range(2)]
+        hash_service = HashService()
+
+        records = TarballService(hash_service, hash_workers=3).process_tarballs(
+            paths, 'host1', 'md5', workers=2
+        )
+
+        assert [r.total_files_count for r in records] == [3, 3]
+        assert seen == [(hash_service, 3)] * 2
+
+
+class TestFastGzip:
+    """Test the optional accelerated gzip reader path."""
+
+    def test_gzip_wrapper_path(self, tmp_path, sample_files, monkeypatch):
+        """Test .tar.gz files read through a GzipFile wrapper give the same records."""
+        import gzip
+        from dedupe.services import tarball_service
+        from dedupe.services.tarball_service import TarballService
+
+        # isal.igzip and zlib_ng.gzip_ng share gzip.GzipFile's interface
+        monkeypatch.setattr(tarball_service, '_fast_gzip', gzip)
+        path = _write_tarball(tmp_path / 'sample.tar.gz', sample_files)
+        plain = _write_tarball(tmp_path / 'sample.tar', sample_files, 'w')
+        bad = tmp_path / 'bad.tar.gz'
+        bad.write_bytes(b'\x1f\x8b' + b'garbage' * 100)
+        service = TarballService()
+
+        records = list(service._iter_analyzed_files(path, str(uuid.uuid4()), 'sha256'))
+
+        assert [r.checksum for r in records] == [hashlib.sha256(d).hexdigest() for d in sample_files.values()]
+        assert service.validate_tarball(plain)
+        assert not service.validate_tarball(str(bad))
+        with pytest.raises(tarfile.ReadError):
+            service.get_tarball_info(str(bad))
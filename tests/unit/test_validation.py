@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""Unit tests for model field validation helpers."""
+
+import pytest
+
+
+class TestRequireText:
+    """Test the require_text validation helper."""
+
+    def test_require_text_strips_value(self):
+        """Test that valid values are returned stripped."""
+        from dedupe.utils.validation import require_text
+        
+        assert require_text("  app.log ", 'filename', 10) == "app.log"
+
+    @pytest.mark.parametrize('value', [None, '', '   '])
+    def test_require_text_rejects_empty(self, value):
+        """Test that missing and blank values are rejected."""
+        from dedupe.utils.validation import require_text
+        
+        with pytest.raises(ValueError, match="filename cannot be empty"):
+            require_text(value, 'filename', 10)
+
+    def test_require_text_rejects_long_values(self):
+        """Test the length limit applies to the stripped value."""
+        from dedupe.utils.validation import require_text
+        
+        assert require_text(" " + "a" * 10 + " ", 'filename', 10) == "a" * 10
+        with pytest.raises(ValueError, match=r"filename too long \(max 10 characters\)"):
+            require_text("a" * 11, 'filename', 10)
+
+
+class TestRequireHex:
+    """Test the require_hex validation helper."""
+
+    def test_require_hex_returns_lowercase_input_unchanged(self):
+        """Test that lowercase hex input is returned as the same object."""
+        from dedupe.utils.validation import require_hex
+        
+        checksum = "0123456789abcdef" * 4
+        assert require_hex(checksum, 'checksum', 64) is checksum
+
+    def test_require_hex_normalizes_case_and_whitespace(self):
+        """Test that uppercase and padded input is stripped and lowercased."""
+        from dedupe.utils.validation import require_hex
+        
+        assert require_hex(" ABC123 ", 'checksum', 64) == "abc123"
+
+    @pytest.mark.parametrize('value', ["abc12g", "abc 123", "0x1234", "ａｂｃ"])
+    def test_require_hex_rejects_non_hex(self, value):
+        """Test that non-hexadecimal characters are rejected."""
+        from dedupe.utils.validation import require_hex
+        
+        with pytest.raises(ValueError, match="checksum must be a hexadecimal string"):
+            require_hex(value, 'checksum', 64)
+
+    def test_require_hex_checks_length_and_emptiness(self):
+        """Test that the require_text checks still apply."""
+        from dedupe.utils.validation import require_hex
+        
+        with pytest.raises(ValueError, match="checksum cannot be empty"):
+            require_hex("  ", 'checksum', 64)
+        with pytest.raises(ValueError, match="checksum too long"):
+            require_hex("a" * 65, 'checksum', 64)